@@ -0,0 +1,14 @@
+{{- /*
+Checksums of inputs rendered by another chart, e.g. the VCS instances configmap.
+Pods roll when a checksum in global.checksums changes, the wizard computes them
+from the values of the chart rendering the input.
+Usage: include "resc.globalChecksums" (list $ "vcsInstances" "rabbitmq")
+*/ -}}
+{{- define "resc.globalChecksums" -}}
+{{- $checksums := (index . 0).Values.global.checksums | default dict }}
+{{- range $key := rest . }}
+{{- with index $checksums $key }}
+checksum/{{ kebabcase $key }}: {{ . | quote }}
+{{- end }}
+{{- end }}
+{{- end -}}
@@ -13,7 +13,10 @@ spec:
   template:
     metadata:
       annotations:
-        rollme: {{ randAlphaNum 5 | quote }}
+        checksum/config: {{ include "resc.webServiceConfigmapTemplate" . | sha256sum }}
+        {{- with include "resc.globalChecksums" (list . "webService") }}
+          {{- nindent 8 .}}
+        {{- end }}
         {{- with include "resc.rescWebserviceAnnotations" .}}
           {{- nindent 8 .}}
         {{- end }}
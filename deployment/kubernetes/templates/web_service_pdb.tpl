@@ -0,0 +1,20 @@
+{{- define "resc.webServicePodDisruptionBudgetTemplate" -}}
+{{- if and .Values.podDisruptionBudget.enabled (gt (int .Values.replicas) 1) }}
+apiVersion: policy/v1
+kind: PodDisruptionBudget
+metadata:
+  name: {{ .Values.global.appName }}-web-service{{ .Values.nameSuffix }}
+  namespace: {{ .Values.global.namespace }}
+  labels:
+    app: {{ .Values.global.appName }}
+spec:
+  minAvailable: {{ .Values.podDisruptionBudget.minAvailable }}
+  {{- with .Values.podDisruptionBudget.unhealthyPodEvictionPolicy }}
+  unhealthyPodEvictionPolicy: {{ . }}
+  {{- end }}
+  selector:
+    matchLabels:
+      app: {{ .Values.global.appName }}
+      tier: api{{ .Values.nameSuffix }}
+{{- end }}
+{{- end }}
@@ -0,0 +1,114 @@
+"""
+Benchmark of the helm values generation for a growing number of VCS instances.
+
+    python benchmarks/bench_values_generation.py --vcs-instances 1 1000 5000
+"""
+
+# Standard Library
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+# Third Party
+import yaml
+
+# First Party
+from resc_helm_wizard import common
+from resc_helm_wizard.helm_value import HelmValue
+from resc_helm_wizard.vcs_instance import VcsInstance
+
+TEMPLATE_FILE = "config/example-values.yaml"
+
+
+def build_helm_values(vcs_instance_count: int) -> HelmValue:
+    vcs_instances = [
+        VcsInstance(
+            provider_type="GITHUB_PUBLIC",
+            scheme="https",
+            host="github.com",
+            port="443",
+            username=f"user-{index}",
+            password=f"token-{index}",
+            organization="",
+            scope=[f"account-{index}"],
+        )
+        for index in range(vcs_instance_count)
+    ]
+    return HelmValue(
+        operating_system="linux",
+        db_password="LizardPass@123",
+        db_storage_path="/var/resc/resc-db-storage",
+        rabbitmq_storage_path="/var/resc/resc-rabbitmq-storage",
+        vcs_instances=vcs_instances,
+    )
+
+
+def measure(function, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start_time)
+    return min(durations) * 1000
+
+
+def run_benchmark(vcs_instance_counts: list, repeat: int):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["RESC_WIZARD_CACHE_DIR"] = cache_dir
+        output_file = os.path.join(cache_dir, "custom-values.yaml")
+        template_path = os.path.join(os.path.dirname(common.__file__), TEMPLATE_FILE)
+        with open(template_path, "rb") as file_in:
+            template = file_in.read()
+
+        print(f"libyaml available: {hasattr(yaml, 'CSafeLoader')}")
+        print(
+            f"parse template, pure python loader: "
+            f"{measure(lambda: yaml.load(template, Loader=yaml.SafeLoader), repeat):8.2f}ms"
+        )
+        common.read_yaml_file(TEMPLATE_FILE)
+        print(
+            f"parse template, cached snapshot:    "
+            f"{measure(lambda: common.read_yaml_file(TEMPLATE_FILE), repeat):8.2f}ms"
+        )
+
+        print(
+            f"{'VCS INSTANCES':>13}  {'PURE DUMPER':>12}  {'C DUMPER':>12}  {'GENERATION':>12}"
+        )
+        for vcs_instance_count in vcs_instance_counts:
+            helm_values = build_helm_values(vcs_instance_count)
+            values_dict = common.read_yaml_file(TEMPLATE_FILE)
+            values_dict["resc-vcs-instances"]["vcsInstances"] = (
+                common.prepare_vcs_instances_for_helm_values(helm_values=helm_values)
+            )
+            pure_dump = measure(
+                lambda: yaml.dump(values_dict, Dumper=yaml.SafeDumper), repeat
+            )
+            c_dump = measure(
+                lambda: yaml.dump(values_dict, Dumper=common.get_yaml_dumper()), repeat
+            )
+            generation = measure(
+                lambda: common.create_helm_values_yaml(
+                    helm_values=helm_values,
+                    input_values_yaml_file=TEMPLATE_FILE,
+                    output_values_yaml_file=output_file,
+                ),
+                repeat,
+            )
+            print(
+                f"{vcs_instance_count:>13}  {pure_dump:>10.2f}ms  {c_dump:>10.2f}ms  {generation:>10.2f}ms"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vcs-instances", type=int, nargs="+", default=[1, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    run_benchmark(vcs_instance_counts=args.vcs_instances, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Benchmark suite of the wizard. helm and kubectl are replaced by the fake executables
+in benchmarks/fakes and the rule file is served by a local HTTP server, so the full
+non-interactive flow and the deployment pipeline can be timed without a cluster.
+
+    python benchmarks/run_benchmarks.py                     # compare with the baselines
+    python benchmarks/run_benchmarks.py --update-baselines  # store new baselines
+"""
+
+# Standard Library
+import argparse
+import functools
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# Third Party
+import yaml
+
+# First Party
+from resc_helm_wizard import common, constants, run_wizard
+from resc_helm_wizard.helm_value import HelmValue
+from resc_helm_wizard.vcs_instance import VcsInstance
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+FAKES_DIR = os.path.join(BENCHMARK_DIR, "fakes")
+BASELINES_FILE = os.path.join(BENCHMARK_DIR, "baselines.json")
+SCOPE_COUNTS = [1, 100, 10000]
+GITHUB_TOKEN = "ghp_" + "a1B2" * 9
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def start_rule_file_server(directory: str) -> ThreadingHTTPServer:
+    with open(os.path.join(directory, "gitleaks.toml"), "w", encoding="utf-8") as file:
+        file.write('title = "gitleaks config"\n')
+        for index in range(200):
+            file.write(
+                f"\n[[rules]]\nid = \"rule-{index}\"\nregex = '''secret-{index}'''\n"
+            )
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(QuietHandler, directory=directory)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_helm_values(scope_count: int, storage_path: str) -> HelmValue:
+    vcs_instance = VcsInstance(
+        provider_type="GITHUB_PUBLIC",
+        scheme="https",
+        host="github.com",
+        port="443",
+        username="resc-benchmark",
+        password=GITHUB_TOKEN,
+        organization="",
+        scope=[f"account-{index}" for index in range(scope_count)],
+    )
+    return HelmValue(
+        operating_system="linux",
+        db_password="LizardPass@123",
+        db_storage_path=os.path.join(storage_path, "resc-db-storage"),
+        rabbitmq_storage_path=os.path.join(storage_path, "resc-rabbitmq-storage"),
+        vcs_instances=[vcs_instance],
+    )
+
+
+def write_answers_file(work_dir: str) -> str:
+    answers_file = os.path.join(work_dir, "answers.yaml")
+    answers = {
+        "operating_system": "Linux",
+        "local_storage_path": work_dir,
+        "db_password": "LizardPass@123",
+        "verify_ssl": False,
+        "run_deployment": True,
+        "upgrade_release": True,
+        "vcs_instances": [
+            {"type": "GitHub", "username": "resc-benchmark", "token": GITHUB_TOKEN}
+        ],
+    }
+    with open(answers_file, "w", encoding="utf-8") as file_out:
+        yaml.safe_dump(answers, file_out)
+    return answers_file
+
+
+def remove_release(state_dir: str):
+    release_file = os.path.join(state_dir, "release.json")
+    if os.path.isfile(release_file):
+        os.remove(release_file)
+
+
+def get_benchmark_cases(work_dir: str, state_dir: str) -> dict:
+    """
+    Get the benchmark cases, each case is a tuple of setup and measured function
+    """
+    answers_file = write_answers_file(work_dir)
+    cases = {}
+    for scope_count in SCOPE_COUNTS:
+        helm_values = build_helm_values(scope_count, work_dir)
+        cases[f"values_generation_{scope_count}_scopes"] = (
+            None,
+            functools.partial(
+                common.create_helm_values_yaml,
+                helm_values=helm_values,
+                input_values_yaml_file="config/example-values.yaml",
+            ),
+        )
+    cases["non_interactive_install"] = (
+        functools.partial(remove_release, state_dir),
+        functools.partial(run_wizard.main, ["--answers-file", answers_file]),
+    )
+    cases["non_interactive_unchanged"] = (
+        None,
+        functools.partial(run_wizard.main, ["--answers-file", answers_file]),
+    )
+    cases["deployment_pipeline_upgrade"] = (
+        functools.partial(os.environ.__setitem__, "RESC_WIZARD_FORCE_UPGRADE", "true"),
+        functools.partial(
+            common.run_deployment, verify_ssl=False, upgrade_release=True
+        ),
+    )
+    return cases
+
+
+def measure(setup, function, repeat: int) -> float:
+    durations = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start_time = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start_time)
+    os.environ.pop("RESC_WIZARD_FORCE_UPGRADE", None)
+    return statistics.median(durations) * 1000
+
+
+def run_benchmarks(repeat: int) -> dict:
+    """
+        Run all benchmark cases in a temporary working directory
+    :return: dict
+        Returns median duration in milliseconds per case
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        state_dir = os.path.join(work_dir, "helm-state")
+        rule_dir = os.path.join(work_dir, "rules")
+        os.makedirs(state_dir)
+        os.makedirs(rule_dir)
+        server = start_rule_file_server(rule_dir)
+        os.environ.update(
+            {
+                "PATH": FAKES_DIR + os.pathsep + os.environ["PATH"],
+                "FAKE_HELM_STATE_DIR": state_dir,
+                "RESC_WIZARD_CACHE_DIR": os.path.join(work_dir, "cache"),
+                "RESC_WIZARD_RULE_PACK_CACHE_TTL": "0",
+                "RESC_WIZARD_RULE_FILE_URLS": (
+                    f"http://127.0.0.1:{server.server_port}/gitleaks.toml"
+                ),
+            }
+        )
+        current_dir = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            for name, (setup, function) in get_benchmark_cases(
+                work_dir, state_dir
+            ).items():
+                results[name] = round(measure(setup, function, repeat), 2)
+        finally:
+            os.chdir(current_dir)
+            server.shutdown()
+    return results
+
+
+def compare_with_baselines(
+    results: dict, baselines: dict, tolerance: float, min_delta: float
+) -> bool:
+    """
+        Print the results next to the baselines
+    :return: bool
+        Returns true if no case is slower than its baseline times the tolerance
+    """
+    passed = True
+    print(f"{'CASE':<30}  {'MEDIAN':>10}  {'BASELINE':>10}  {'CHANGE':>8}")
+    for name, duration in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            print(f"{name:<30}  {duration:>8.2f}ms  {'-':>10}  {'-':>8}")
+            continue
+        regressed = duration > max(baseline * tolerance, baseline + min_delta)
+        passed = passed and not regressed
+        print(
+            f"{name:<30}  {duration:>8.2f}ms  {baseline:>8.2f}ms  "
+            f"{(duration / baseline - 1) * 100:>+7.1f}%{'  REGRESSION' if regressed else ''}"
+        )
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--helm-latency", type=float, default=0.0)
+    parser.add_argument("--kubectl-latency", type=float, default=0.0)
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=50.0,
+        help="milliseconds a case may be slower than its baseline regardless of the tolerance",
+    )
+    parser.add_argument("--baselines-file", default=BASELINES_FILE)
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args()
+
+    os.environ["FAKE_HELM_LATENCY"] = str(args.helm_latency)
+    os.environ["FAKE_KUBECTL_LATENCY"] = str(args.kubectl_latency)
+    # The fake cluster is ready at once, poll often so the readiness watch does not dominate
+    constants.READINESS_POLL_INTERVAL = 0.05
+    logging.disable(logging.CRITICAL)
+
+    results = run_benchmarks(repeat=args.repeat)
+    if args.update_baselines:
+        with open(args.baselines_file, "w", encoding="utf-8") as file_out:
+            json.dump(results, file_out, indent=2)
+            file_out.write("\n")
+        print(f"Baselines have been written to {args.baselines_file}")
+
+    baselines = {}
+    if os.path.isfile(args.baselines_file):
+        with open(args.baselines_file, "r", encoding="utf-8") as file_in:
+            baselines = json.load(file_in)
+    if not compare_with_baselines(results, baselines, args.tolerance, args.min_delta):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# Standard Library
+import json
+import logging
+import os
+import sys
+from typing import List
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.common import (
+    generate_pvc_path,
+    get_operating_system,
+    get_yaml_loader,
+)
+from resc_helm_wizard.helm_value import HelmValue
+from resc_helm_wizard.validator import password_validator
+from resc_helm_wizard.vcs_instance import VcsInstance
+from resc_helm_wizard.vcs_inventory import get_vcs_instances, read_vcs_inventory
+
+logging.basicConfig(level=logging.INFO)
+
+ANSWER_KEYS = {
+    "operating_system": str,
+    "local_storage_path": str,
+    "create_storage_dir": bool,
+    "db_password": str,
+    "vcs_instances": list,
+    "vcs_inventory_file": str,
+    "verify_ssl": bool,
+    "verify_credentials": bool,
+    "scan_window_hours": float,
+    "capacity_inventory_file": str,
+    "scanner_autoscaling": dict,
+    "scrape_schedule": dict,
+    "scanner_worker": dict,
+    "web_service": dict,
+    "database_tuning": dict,
+    "rabbitmq_profile": dict,
+    "run_deployment": bool,
+    "upgrade_release": bool,
+}
+
+
+def parse_bool(value) -> bool:
+    """
+        Parse a boolean answer
+    :param value:
+        boolean or string value like true/false, yes/no, 1/0
+    :return: bool
+        Returns parsed boolean value
+    :raises ValueError: if value can not be interpreted as a boolean
+    """
+    if isinstance(value, bool):
+        return value
+    if str(value).strip().lower() in ("true", "yes", "y", "1"):
+        return True
+    if str(value).strip().lower() in ("false", "no", "n", "0"):
+        return False
+    raise ValueError(f"{value} is not a valid boolean value")
+
+
+def read_answers_from_environment() -> dict:
+    """
+        Read answers from environment variables, e.g. RESC_WIZARD_DB_PASSWORD
+        RESC_WIZARD_VCS_INSTANCES must contain a JSON encoded list of VCS instances,
+        RESC_WIZARD_SCANNER_AUTOSCALING, RESC_WIZARD_SCRAPE_SCHEDULE,
+        RESC_WIZARD_SCANNER_WORKER, RESC_WIZARD_WEB_SERVICE, RESC_WIZARD_DATABASE_TUNING
+        and RESC_WIZARD_RABBITMQ_PROFILE a JSON encoded mapping
+    :return: dict
+        Returns answers found in the environment
+    """
+    answers = {}
+    for key, value_type in ANSWER_KEYS.items():
+        env_value = os.environ.get(f"{constants.ENV_PREFIX}{key.upper()}")
+        if env_value is None:
+            continue
+        if value_type is bool:
+            answers[key] = parse_bool(env_value)
+        elif value_type is float:
+            answers[key] = float(env_value)
+        elif value_type in (list, dict):
+            answers[key] = json.loads(env_value)
+        else:
+            answers[key] = env_value
+    return answers
+
+
+def load_answers(answers_file: str = None) -> dict:
+    """
+        Load answers from an answers file, environment variables take precedence over the file
+    :param answers_file:
+        path of the YAML or JSON answers file, optional
+    :return: dict
+        Returns answers dictionary
+    """
+    # Third Party
+    import yaml
+
+    answers = {}
+    if answers_file:
+        try:
+            with open(answers_file, "r", encoding="utf-8") as file_in:
+                answers = yaml.load(file_in, Loader=get_yaml_loader()) or {}
+        except FileNotFoundError:
+            logging.error(f"Aborting the program! {answers_file} file was not found")
+            sys.exit(1)
+        except yaml.YAMLError as error:
+            logging.error(f"Aborting the program! {answers_file} is not valid: {error}")
+            sys.exit(1)
+    try:
+        answers.update(read_answers_from_environment())
+    except ValueError as error:
+        logging.error(f"Aborting the program! Invalid environment variable: {error}")
+        sys.exit(1)
+    return answers
+
+
+def get_answer(answers: dict, key: str, default=None):
+    """
+        Get an answer, abort the program if a required answer is missing
+    :param answers:
+        answers dictionary
+    :param key:
+        key of the answer
+    :param default:
+        default value, answer is required when not provided
+    :return:
+        Returns the answer
+    """
+    value = answers.get(key, default)
+    if value is None:
+        logging.error(
+            f"Aborting the program! {key} was missing in the answers, "
+            f"provide it in the answers file or as {constants.ENV_PREFIX}{key.upper()}"
+        )
+        sys.exit(1)
+    try:
+        if ANSWER_KEYS.get(key) is bool:
+            value = parse_bool(value)
+        elif ANSWER_KEYS.get(key) is float:
+            value = float(value)
+    except ValueError as error:
+        logging.error(f"Aborting the program! Invalid value for {key}: {error}")
+        sys.exit(1)
+    return value
+
+
+def validate_answer(result, key: str):
+    """
+        Abort the program if a validator rejected an answer
+    :param result:
+        output of a validator from validator.py
+    :param key:
+        key of the validated answer
+    """
+    if result is not True:
+        logging.error(f"Aborting the program! Invalid value for {key}: {result}")
+        sys.exit(1)
+
+
+def get_vcs_instances_from_answers(answers: dict) -> List[VcsInstance]:
+    """
+        Build and validate VCS instances from answers, the instances of the
+        vcs_instances answer and of the VCS inventory file are validated in one pass
+    :param answers:
+        answers dictionary
+    :return: List[VcsInstance]
+        Returns list of VCS instances
+    """
+    inventory_file = answers.get("vcs_inventory_file")
+    vcs_answers = {
+        f"vcs_instances[{index}]": vcs_answer
+        for index, vcs_answer in enumerate(
+            get_answer(answers, "vcs_instances", default=[] if inventory_file else None)
+        )
+    }
+    if inventory_file:
+        vcs_answers.update(read_vcs_inventory(inventory_file))
+    if not vcs_answers:
+        logging.error("Aborting the program! No VCS instance was provided")
+        sys.exit(1)
+    return get_vcs_instances(vcs_answers)
+
+
+def get_helm_values_from_answers(answers: dict) -> HelmValue:
+    """
+        Build helm values from answers without prompting the user
+    :param answers:
+        answers dictionary
+    :return: HelmValue
+        Returns object of HelmValue
+    """
+    os_answer = str(get_answer(answers, "operating_system"))
+    if os_answer.lower() in ("windows", "microsoft windows"):
+        os_answer = "Microsoft Windows"
+    operating_system = get_operating_system(user_input=os_answer)
+
+    local_storage = get_answer(
+        answers, "local_storage_path", default=os.path.expanduser("~")
+    )
+    create_dir = get_answer(answers, "create_storage_dir", default=True)
+    db_storage_path = generate_pvc_path(
+        operating_system=operating_system,
+        path=local_storage,
+        tool_type="database",
+        create_dir=create_dir,
+    )
+    rabbitmq_storage_path = generate_pvc_path(
+        operating_system=operating_system,
+        path=local_storage,
+        tool_type="rabbitmq",
+        create_dir=create_dir,
+    )
+
+    db_password = get_answer(answers, "db_password")
+    validate_answer(password_validator(db_password), "db_password")
+
+    return HelmValue(
+        operating_system=operating_system,
+        db_password=db_password,
+        db_storage_path=db_storage_path,
+        rabbitmq_storage_path=rabbitmq_storage_path,
+        vcs_instances=get_vcs_instances_from_answers(answers),
+    )
@@ -0,0 +1,136 @@
+# Standard Library
+import logging
+import sys
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.capacity import CapacityPlan
+from resc_helm_wizard.validator import replica_count_validator
+
+logging.basicConfig(level=logging.INFO)
+
+
+class ScannerAutoscaling:
+    """
+    A class to represent the queue depth based autoscaling of the secret scanners.
+    Attributes
+    ----------
+    min_replicas : int
+        Minimum number of replicas of every scanner deployment, 0 allows scaling to zero with KEDA
+    max_replicas : int
+        Maximum number of replicas of every scanner deployment
+    provider : str
+        keda for a KEDA ScaledObject, hpa for a HorizontalPodAutoscaler on an external metric
+    messages_per_replica : int
+        Number of queued repositories per scanner replica
+    """
+
+    def __init__(
+        self,
+        min_replicas: int,
+        max_replicas: int,
+        provider: str = "keda",
+        messages_per_replica: int = 1,
+    ):
+        self.min_replicas: int = min_replicas
+        self.max_replicas: int = max_replicas
+        self.provider: str = provider
+        self.messages_per_replica: int = messages_per_replica
+
+    def get_values(self) -> dict:
+        """
+            Get the autoscaling helm values of the resc-vcs-scanner-secrets chart
+        :return: dict
+            Returns autoscaling values
+        """
+        return {
+            "enabled": True,
+            "provider": self.provider,
+            "minReplicas": self.min_replicas,
+            "maxReplicas": self.max_replicas,
+            "messagesPerReplica": self.messages_per_replica,
+        }
+
+
+def get_autoscaling_errors(autoscaling: ScannerAutoscaling) -> list:
+    """
+        Validate the autoscaling settings
+    :param autoscaling:
+        object of ScannerAutoscaling
+    :return: list
+        Returns list of validation errors, empty if the settings are valid
+    """
+    errors = []
+    for key, replicas in (
+        ("min_replicas", autoscaling.min_replicas),
+        ("max_replicas", autoscaling.max_replicas),
+        ("messages_per_replica", autoscaling.messages_per_replica),
+    ):
+        result = replica_count_validator(replicas)
+        if result is not True:
+            errors.append(f"{key}: {result}")
+    if errors:
+        return errors
+    if autoscaling.provider not in constants.AUTOSCALING_PROVIDERS:
+        errors.append(
+            f"provider: {autoscaling.provider} is not supported, "
+            f"supported providers are {', '.join(constants.AUTOSCALING_PROVIDERS)}"
+        )
+    if int(autoscaling.max_replicas) < max(int(autoscaling.min_replicas), 1):
+        errors.append(
+            f"max_replicas: {autoscaling.max_replicas} must be at least 1 and at least min_replicas"
+        )
+    if int(autoscaling.messages_per_replica) < 1:
+        errors.append("messages_per_replica: must be at least 1")
+    return errors
+
+
+def get_scanner_autoscaling(
+    settings: dict, capacity_plan: CapacityPlan = None
+) -> ScannerAutoscaling:
+    """
+        Build the autoscaling of the secret scanners, abort the program if the settings are invalid
+    :param settings:
+        min_replicas, max_replicas, provider and messages_per_replica, all optional
+    :param capacity_plan:
+        capacity plan whose scanner replicas are the default maximum, optional
+    :return: ScannerAutoscaling
+        Returns object of ScannerAutoscaling
+    """
+    if not isinstance(settings, dict):
+        logging.error(
+            "Aborting the program! Invalid value for scanner_autoscaling: "
+            "must be a mapping of min_replicas, max_replicas and provider"
+        )
+        sys.exit(1)
+    default_max_replicas = (
+        capacity_plan.scanner_replicas
+        if capacity_plan
+        else constants.AUTOSCALING_MAX_REPLICAS
+    )
+    autoscaling = ScannerAutoscaling(
+        min_replicas=settings.get("min_replicas", 0),
+        max_replicas=settings.get("max_replicas", default_max_replicas),
+        provider=str(settings.get("provider", "keda")).lower(),
+        messages_per_replica=settings.get("messages_per_replica", 1),
+    )
+    errors = get_autoscaling_errors(autoscaling)
+    for error in errors[:-1]:
+        logging.error(f"Invalid value for scanner_autoscaling.{error}")
+    if errors:
+        logging.error(
+            f"Aborting the program! Invalid value for scanner_autoscaling.{errors[-1]}"
+        )
+        sys.exit(1)
+    autoscaling.min_replicas = int(autoscaling.min_replicas)
+    autoscaling.max_replicas = int(autoscaling.max_replicas)
+    autoscaling.messages_per_replica = int(autoscaling.messages_per_replica)
+    if autoscaling.provider == "hpa" and autoscaling.min_replicas == 0:
+        logging.warning(
+            "A HorizontalPodAutoscaler can not scale to zero, the scanners keep at least 1 replica"
+        )
+    logging.info(
+        f"Secret scanners scale from {autoscaling.min_replicas} to {autoscaling.max_replicas} "
+        f"replicas on the queue depth with {autoscaling.provider}"
+    )
+    return autoscaling
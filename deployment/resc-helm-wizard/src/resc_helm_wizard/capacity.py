@@ -0,0 +1,370 @@
+# Standard Library
+import logging
+import math
+import sys
+from typing import List
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.common import get_yaml_loader
+
+logging.basicConfig(level=logging.INFO)
+
+MIB = 1024**2
+GIB = 1024**3
+
+
+class CapacityPlan:
+    """
+    A class to represent the estimated capacity of a RESC deployment.
+    Attributes
+    ----------
+    repositories : int
+        Number of repositories to scan
+    size_bytes : int
+        Total size of the repositories in bytes, estimated for repositories of unknown size
+    scan_window_hours : float
+        Time in which all repositories must be scanned
+    scanner_replicas : int
+        Number of secret scanner replicas
+    values : dict
+        Helm values with the estimated replicas, resources and volume sizes
+    explanation : List[str]
+        Explanation of the estimate, written on top of the values file
+    vcs_instance_totals : dict
+        Number of repositories, known size and number of repositories of unknown size
+        per VCS instance name, empty when the inventory has no VCS instances
+    """
+
+    def __init__(
+        self,
+        repositories: int,
+        size_bytes: int,
+        scan_window_hours: float,
+        scanner_replicas: int,
+        values: dict,
+        explanation: List[str],
+        vcs_instance_totals: dict = None,
+    ):
+        self.repositories: int = repositories
+        self.size_bytes: int = size_bytes
+        self.scan_window_hours: float = scan_window_hours
+        self.scanner_replicas: int = scanner_replicas
+        self.values: dict = values
+        self.explanation: List[str] = explanation
+        self.vcs_instance_totals: dict = vcs_instance_totals or {}
+
+
+def format_memory(size_bytes: float) -> str:
+    """
+        Format a memory size as kubernetes quantity, rounded up to 64Mi
+    :param size_bytes:
+        memory size in bytes
+    :return: str
+        Returns kubernetes quantity, e.g. 1536Mi
+    """
+    return f"{math.ceil(size_bytes / (64 * MIB)) * 64}Mi"
+
+
+def format_storage(size_bytes: float) -> str:
+    """
+        Format a volume size as kubernetes quantity, rounded up to whole Gi
+    :param size_bytes:
+        volume size in bytes
+    :return: str
+        Returns kubernetes quantity, e.g. 20Gi
+    """
+    return f"{math.ceil(size_bytes / GIB)}Gi"
+
+
+def format_cpu(cores: float) -> str:
+    """
+        Format a number of CPU cores as kubernetes quantity
+    :param cores:
+        number of CPU cores
+    :return: str
+        Returns kubernetes quantity in millicores, e.g. 1500m
+    """
+    return f"{math.ceil(cores * 10) * 100}m"
+
+
+def get_repository_totals(inventory: dict) -> tuple:
+    """
+        Get the number of repositories and their total size from a repository inventory,
+        generated with --repository-inventory, or from a mapping with repositories and size_bytes
+    :param inventory:
+        repository inventory
+    :return: tuple
+        Returns number of repositories, total known size in bytes and number of
+        repositories of unknown size
+    """
+    if "vcs_instances" not in inventory:
+        repositories = int(inventory.get("repositories", 0))
+        size_bytes = inventory.get("size_bytes")
+        if size_bytes is None:
+            return repositories, 0, repositories
+        return repositories, int(size_bytes), 0
+
+    repositories = known_size = unknown = 0
+    for vcs_inventory in inventory["vcs_instances"].values():
+        for scope in vcs_inventory.get("scopes", {}).values():
+            repositories += scope["repositories"]
+            if scope.get("size_bytes") is None:
+                unknown += scope["repositories"]
+            else:
+                known_size += scope["size_bytes"]
+    return repositories, known_size, unknown
+
+
+def get_vcs_instance_totals(inventory: dict) -> dict:
+    """
+        Get the number of repositories and their total size per VCS instance
+    :param inventory:
+        repository inventory generated with --repository-inventory
+    :return: dict
+        Returns totals by VCS instance name, empty if the inventory has no VCS instances
+    """
+    return {
+        name: get_repository_totals({"vcs_instances": {name: vcs_inventory}})
+        for name, vcs_inventory in inventory.get("vcs_instances", {}).items()
+    }
+
+
+def read_repository_inventory(inventory_file: str) -> dict:
+    """
+        Read a repository inventory from a YAML or JSON file
+    :param inventory_file:
+        path of the repository inventory file
+    :return: dict
+        Returns repository inventory
+    """
+    # Third Party
+    import yaml
+
+    try:
+        with open(inventory_file, "r", encoding="utf-8") as file_in:
+            inventory = yaml.load(file_in, Loader=get_yaml_loader()) or {}
+        # Validate the structure before the inventory is used
+        get_repository_totals(inventory)
+        get_vcs_instance_totals(inventory)
+        return inventory
+    except FileNotFoundError:
+        logging.error(f"Aborting the program! {inventory_file} file was not found")
+        sys.exit(1)
+    except (yaml.YAMLError, AttributeError, KeyError, TypeError, ValueError) as error:
+        logging.error(f"Aborting the program! {inventory_file} is not valid: {error}")
+        sys.exit(1)
+
+
+def get_scan_seconds(repositories: int, size_bytes: float) -> float:
+    """
+        Estimate the time a single scanner needs to scan all repositories
+    :param repositories:
+        number of repositories
+    :param size_bytes:
+        total size of the repositories in bytes
+    :return: float
+        Returns scan time in seconds
+    """
+    return (
+        repositories * constants.CAPACITY_SECONDS_PER_REPOSITORY
+        + size_bytes / constants.CAPACITY_SCAN_BYTES_PER_SECOND
+    )
+
+
+def get_service_sizes(repositories: int, size_bytes: float) -> dict:
+    """
+        Estimate the memory and volume sizes of the services for a number of repositories
+    :param repositories:
+        number of repositories
+    :param size_bytes:
+        total size of the repositories in bytes
+    :return: dict
+        Returns sizes in bytes per service
+    """
+    average_size = size_bytes / repositories if repositories else 0
+    return {
+        "average_size": average_size,
+        "scanner_memory": min(
+            constants.CAPACITY_SCANNER_BASE_MEMORY
+            + constants.CAPACITY_SCANNER_MEMORY_FACTOR * average_size,
+            constants.CAPACITY_SCANNER_MAX_MEMORY,
+        ),
+        "rabbitmq_memory": 512 * MIB + repositories * 4 * 1024,
+        "rabbitmq_pvc": max(
+            constants.CAPACITY_MIN_PVC_SIZE, GIB + repositories * 64 * 1024
+        ),
+        "redis_memory": min(1280 * MIB + repositories * 2 * 1024, 4 * GIB),
+        "database_memory": min(2 * GIB + repositories * MIB, 16 * GIB),
+        "database_pvc": max(
+            constants.CAPACITY_MIN_PVC_SIZE, 2 * GIB + repositories * 2 * MIB
+        ),
+    }
+
+
+def get_capacity_values(replicas: int, sizes: dict) -> dict:
+    """
+        Get the helm values of the scanner replicas, resources and volume sizes
+    :param replicas:
+        number of secret scanner replicas
+    :param sizes:
+        sizes in bytes per service
+    :return: dict
+        Returns helm values
+    """
+    return {
+        "resc-vcs-scanner-secrets": {
+            "replicas": replicas,
+            "resources": {
+                "requests": {
+                    "cpu": "1",
+                    "memory": format_memory(sizes["scanner_memory"]),
+                },
+                "limits": {
+                    "cpu": "2",
+                    "memory": format_memory(sizes["scanner_memory"] * 1.5),
+                },
+            },
+        },
+        "resc-rabbitmq": {
+            "rabbitMQ": {
+                "resources": {
+                    "requests": {
+                        "cpu": format_cpu(min(0.4 + replicas * 0.05, 2)),
+                        "memory": format_memory(sizes["rabbitmq_memory"]),
+                    },
+                    "limits": {
+                        "cpu": format_cpu(min(0.5 + replicas * 0.1, 4)),
+                        "memory": format_memory(sizes["rabbitmq_memory"] * 1.25),
+                    },
+                },
+                "pvc_size": format_storage(sizes["rabbitmq_pvc"]),
+            }
+        },
+        "resc-redis": {
+            "redis": {
+                "resources": {
+                    "requests": {
+                        "cpu": "400m",
+                        "memory": format_memory(sizes["redis_memory"]),
+                    },
+                    "limits": {
+                        "cpu": "500m",
+                        "memory": format_memory(sizes["redis_memory"] * 1.25),
+                    },
+                }
+            }
+        },
+        "resc-database": {
+            "database": {
+                "resources": {
+                    "requests": {
+                        "cpu": format_cpu(min(0.5 + replicas * 0.1, 4)),
+                        "memory": format_memory(sizes["database_memory"]),
+                    },
+                    "limits": {
+                        "cpu": format_cpu(min(2 + replicas * 0.2, 8)),
+                        "memory": format_memory(sizes["database_memory"] * 1.25),
+                    },
+                },
+                "pvc_size": format_storage(sizes["database_pvc"]),
+            }
+        },
+    }
+
+
+def get_capacity_explanation(capacity_plan: CapacityPlan, sizes: dict) -> List[str]:
+    """
+        Explain how the capacity plan was estimated
+    :param capacity_plan:
+        object of CapacityPlan without explanation
+    :param sizes:
+        sizes in bytes per service
+    :return: List[str]
+        Returns explanation lines
+    """
+    repositories = capacity_plan.repositories
+    size_gib = capacity_plan.size_bytes / GIB
+    scan_hours = get_scan_seconds(repositories, capacity_plan.size_bytes) / 3600
+    replicas = capacity_plan.scanner_replicas
+    capped = (
+        f", capped at {constants.CAPACITY_MAX_SCANNER_REPLICAS}"
+        if replicas == constants.CAPACITY_MAX_SCANNER_REPLICAS
+        else ""
+    )
+    return [
+        f"Capacity plan for {repositories} repositories of {size_gib:.1f} GiB "
+        f"scanned within {capacity_plan.scan_window_hours:g}h",
+        f"  Scan time: {repositories} x {constants.CAPACITY_SECONDS_PER_REPOSITORY}s per "
+        f"repository + {size_gib:.1f} GiB at "
+        f"{constants.CAPACITY_SCAN_BYTES_PER_SECOND // MIB} MiB/s = "
+        f"{scan_hours:.1f} scanner hours",
+        f"  resc-vcs-scanner-secrets: {replicas} replicas for {scan_hours:.1f}h "
+        f"in a {capacity_plan.scan_window_hours:g}h window{capped}, "
+        f"{format_memory(sizes['scanner_memory'])} memory per replica for repositories "
+        f"of {sizes['average_size'] / MIB:.0f} MiB on average",
+        f"  resc-rabbitmq: {format_memory(sizes['rabbitmq_memory'])} memory and "
+        f"{format_storage(sizes['rabbitmq_pvc'])} volume for {repositories} queued "
+        f"repositories",
+        f"  resc-redis: {format_memory(sizes['redis_memory'])} memory, at least the 1gb "
+        f"maxmemory of the cache",
+        f"  resc-database: {format_memory(sizes['database_memory'])} memory and "
+        f"{format_storage(sizes['database_pvc'])} volume for the findings and scans of "
+        f"{repositories} repositories",
+        "  The estimate covers a full base scan, incremental scans need less capacity",
+    ]
+
+
+def plan_capacity(
+    repositories: int,
+    size_bytes: int,
+    scan_window_hours: float,
+    unknown_size_repositories: int = 0,
+) -> CapacityPlan:
+    """
+        Estimate the scanner replicas and resources and the RabbitMQ, Redis and database
+        sizing needed to scan all repositories within the scan window
+    :param repositories:
+        number of repositories
+    :param size_bytes:
+        total size of the repositories with a known size in bytes
+    :param scan_window_hours:
+        time in which all repositories must be scanned
+    :param unknown_size_repositories:
+        number of repositories of unknown size, counted with a default size
+    :return: CapacityPlan
+        Returns capacity plan
+    """
+    size_bytes += unknown_size_repositories * constants.CAPACITY_DEFAULT_REPOSITORY_SIZE
+    scan_seconds = get_scan_seconds(repositories, size_bytes)
+    replicas = min(
+        max(math.ceil(scan_seconds / (scan_window_hours * 3600)), 1),
+        constants.CAPACITY_MAX_SCANNER_REPLICAS,
+    )
+    sizes = get_service_sizes(repositories, size_bytes)
+    capacity_plan = CapacityPlan(
+        repositories=repositories,
+        size_bytes=size_bytes,
+        scan_window_hours=scan_window_hours,
+        scanner_replicas=replicas,
+        values=get_capacity_values(replicas, sizes),
+        explanation=[],
+    )
+    capacity_plan.explanation = get_capacity_explanation(capacity_plan, sizes)
+    if unknown_size_repositories:
+        capacity_plan.explanation.insert(
+            1,
+            f"  {unknown_size_repositories} repositories of unknown size are counted as "
+            f"{constants.CAPACITY_DEFAULT_REPOSITORY_SIZE // MIB} MiB",
+        )
+    return capacity_plan
+
+
+def log_capacity_plan(capacity_plan: CapacityPlan):
+    """
+        Log the explanation of a capacity plan
+    :param capacity_plan:
+        object of CapacityPlan
+    """
+    explanation = "\n".join(capacity_plan.explanation)
+    logging.info(f"Capacity plan:\n{explanation}")
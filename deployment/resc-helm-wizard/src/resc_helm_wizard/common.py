@@ -1,30 +1,46 @@
 # Standard Library
+import contextvars
+import copy
+import functools
+import hashlib
 import logging
+import marshal
 import os
+import re
+import shutil
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from urllib.parse import urlparse
 
-# Third Party
-import pkg_resources
-import requests
-import yaml
-
 # First Party
-from resc_helm_wizard import constants, questions
+from resc_helm_wizard import constants, questions, rule_pack
+from resc_helm_wizard.database_tuning import set_database_tuning_values
 from resc_helm_wizard.helm_utilities import (
     add_helm_repository,
     check_helm_release_exists,
-    install_or_upgrade_helm_release,
+    get_deployment_fingerprint,
+    is_existing_release,
+    is_release_up_to_date,
+    set_pvc_size,
     update_helm_repository,
     validate_helm_deployment_status,
 )
 from resc_helm_wizard.helm_value import HelmValue
 from resc_helm_wizard.kubernetes_utilities import create_namespace_if_not_exists
+from resc_helm_wizard.rabbitmq_profile import set_rabbitmq_profile_values
+from resc_helm_wizard.readiness import deploy_with_readiness_watch
+from resc_helm_wizard.restarts import get_global_checksums, report_restarts
+from resc_helm_wizard.scanner_worker import set_scanner_worker_values
+from resc_helm_wizard.timing import timed_phase
 from resc_helm_wizard.vcs_instance import VcsInstance
 
 logging.basicConfig(level=logging.INFO)
 
+_TEMPLATE_SNAPSHOTS = {}
+
 
 def get_operating_system(user_input: str) -> str:
     """
@@ -150,6 +166,52 @@ def generate_pvc_path(
     return pvc_path
 
 
+def get_credential_variable_prefix(name: str) -> str:
+    """
+        Get the prefix of the username and token variables of a VCS instance
+    :param name:
+        name of VCS instance
+    :return: str
+        Returns upper case prefix containing only alphanumeric characters and underscores
+    """
+    return re.sub(r"[^A-Z0-9]+", "_", name.upper()).strip("_")
+
+
+def get_vcs_instance_names(vcs_instances: List[VcsInstance]) -> List[str]:
+    """
+        Get a unique name for every VCS instance. The provider type is used as name when
+        a provider type occurs once, so existing deployments keep their instance names.
+        Otherwise the host is appended and a sequence number when the host is not unique.
+    :param vcs_instances:
+        list of VCS instances
+    :return: List[str]
+        Returns list of names in the order of the VCS instances
+    """
+    provider_type_counts = Counter(vcs.provider_type for vcs in vcs_instances)
+    used_prefixes = {
+        get_credential_variable_prefix(vcs.name) for vcs in vcs_instances if vcs.name
+    }
+    names = []
+    for vcs in vcs_instances:
+        if vcs.name:
+            names.append(vcs.name)
+            continue
+        if provider_type_counts[vcs.provider_type] == 1:
+            base_name = vcs.provider_type
+        else:
+            base_name = get_credential_variable_prefix(
+                f"{vcs.provider_type}_{vcs.host}"
+            )
+        name = base_name
+        sequence = 2
+        while get_credential_variable_prefix(name) in used_prefixes:
+            name = f"{base_name}_{sequence}"
+            sequence += 1
+        used_prefixes.add(get_credential_variable_prefix(name))
+        names.append(name)
+    return names
+
+
 def prepare_vcs_instances_for_helm_values(helm_values: HelmValue) -> List[VcsInstance]:
     """
         Prepares vcs instances list for helm
@@ -159,36 +221,33 @@ def prepare_vcs_instances_for_helm_values(helm_values: HelmValue) -> List[VcsIns
         Returns list of VCS instances
     """
     vcs_instances: List[VcsInstance] = []
-    for vcs in helm_values.vcs_instances:
-        if vcs.provider_type == "GITHUB_PUBLIC":
-            user_name = "GITHUB_PUBLIC_USERNAME"
-            token = "GITHUB_PUBLIC_TOKEN"
-        if vcs.provider_type == "AZURE_DEVOPS":
-            user_name = "AZURE_DEVOPS_USERNAME"
-            token = "AZURE_DEVOPS_TOKEN"
-        if vcs.provider_type == "BITBUCKET":
-            user_name = "BITBUCKET_USERNAME"
-            token = "BITBUCKET_TOKEN"
+    names = get_vcs_instance_names(helm_values.vcs_instances)
+    for vcs, name in zip(helm_values.vcs_instances, names):
+        prefix = get_credential_variable_prefix(name)
         vcs_instance_obj = {
-            "name": vcs.provider_type,
+            "name": name,
             "scope": vcs.scope,
             "exceptions": [],
             "providerType": vcs.provider_type,
             "hostname": vcs.host,
             "port": vcs.port,
             "scheme": vcs.scheme,
-            "username": user_name,
+            "username": f"{prefix}_USERNAME",
             "usernameValue": vcs.username,
             "organization": vcs.organization,
-            "token": token,
+            "token": f"{prefix}_TOKEN",
             "tokenValue": vcs.password,
         }
         vcs_instances.append(vcs_instance_obj)
     return vcs_instances
 
 
+@timed_phase("values_generation", failed_outcomes=(False,))
 def create_helm_values_yaml(
-    helm_values: HelmValue, input_values_yaml_file: str
+    helm_values: HelmValue,
+    input_values_yaml_file: str,
+    output_values_yaml_file: str = constants.VALUES_FILE,
+    kube_context: str = None,
 ) -> bool:
     """
         Generates values yaml file for helm deployment of resc
@@ -196,13 +255,16 @@ def create_helm_values_yaml(
         object of HelmValue
     :param input_values_yaml_file:
         input values.yaml_file path
+    :param output_values_yaml_file:
+        output values yaml file path
+    :param kube_context:
+        name of the kube context of the release, current context is used when not provided
     :return: bool
         Returns True if file created else returns false
     :raises FileNotFoundError: if example-values.yaml file was not found
     :raises KeyError: if any expected key was not found in the values dictionary
     """
     output_file_generated = False
-    output_values_yaml_file = constants.VALUES_FILE
     helm_deployment_help_link = (
         "https://github.com/abnamro/repository-scanner/"
         "blob/main/deployment/kubernetes/README.md"
@@ -237,9 +299,27 @@ def create_helm_values_yaml(
         values_dict["resc-vcs-instances"]["vcsInstances"] = (
             prepare_vcs_instances_for_helm_values(helm_values=helm_values)
         )
+        if helm_values.scanner_autoscaling:
+            values_dict.setdefault("resc-vcs-scanner-secrets", {})["autoscaling"] = (
+                helm_values.scanner_autoscaling.get_values()
+            )
+        if helm_values.scrape_schedules:
+            values_dict.setdefault("resc-vcs-scraper-projects", {})["schedules"] = [
+                schedule.get_values() for schedule in helm_values.scrape_schedules
+            ]
+            values_dict["resc-vcs-instances"]["instanceConfigFiles"] = True
+        header = set_sizing_values(values_dict, helm_values, kube_context)
+        # Pods roll when a configmap or secret of another chart changes
+        values_dict.setdefault("global", {})["checksums"] = get_global_checksums(
+            values_dict
+        )
+
+        # Third Party
+        import yaml
 
         with open(output_values_yaml_file, "w", encoding="utf-8") as file_out:
-            yaml.dump(values_dict, file_out)
+            file_out.write(header)
+            yaml.dump(values_dict, file_out, Dumper=get_yaml_dumper())
         output_values_yaml_file_path = os.path.abspath(output_values_yaml_file)
         if os.path.exists(output_values_yaml_file_path):
             logging.info(
@@ -264,17 +344,227 @@ def create_helm_values_yaml(
     return output_file_generated
 
 
+def set_sizing_values(
+    values_dict: dict, helm_values: HelmValue, kube_context: str = None
+) -> str:
+    """
+        Size the charts from the capacity plan, web service, RabbitMQ profile,
+        scanner worker and database tuning answers
+    :param values_dict:
+        values dictionary, updated in place
+    :param helm_values:
+        object of HelmValue
+    :param kube_context:
+        name of the kube context of the release, current context is used when not provided
+    :return: str
+        Returns the header explaining the capacity plan, empty without a capacity plan
+    """
+    # Volumes of an existing release are not resized, the release is looked up once
+    release_exists = functools.cache(
+        functools.partial(is_existing_release, kube_context=kube_context)
+    )
+    header = ""
+    if helm_values.capacity_plan:
+        merge_capacity_plan_values(
+            values_dict, helm_values.capacity_plan.values, release_exists=release_exists
+        )
+        header = "".join(
+            f"# {line}\n" for line in helm_values.capacity_plan.explanation
+        )
+    if helm_values.web_service:
+        for chart in constants.WEB_SERVICE_CHARTS:
+            merge_values(
+                values_dict.setdefault(chart, {}),
+                helm_values.web_service.get_values(),
+            )
+    worker_settings = helm_values.scanner_worker
+    if helm_values.rabbitmq_profile:
+        profile = set_rabbitmq_profile_values(
+            values_dict.setdefault("resc-rabbitmq", {}).setdefault("rabbitMQ", {}),
+            helm_values.rabbitmq_profile,
+            release_exists=release_exists,
+        )
+        # An explicit consumer prefetch of the profile unless the worker settings set one
+        if "prefetch" in helm_values.rabbitmq_profile:
+            worker_settings = {
+                "prefetch_multiplier": profile.prefetch,
+                **(worker_settings or {}),
+            }
+    # The worker is sized from the final resources of the scanner pods, only on request
+    # so the chart keeps its worker defaults
+    if worker_settings:
+        set_scanner_worker_values(
+            values_dict.setdefault("resc-vcs-scanner-secrets", {}),
+            worker_settings,
+        )
+    # The engine is tuned for the final resources of the database pod, only on request
+    # as the memory limit of the engine restarts the database
+    if helm_values.database_tuning:
+        set_database_tuning_values(
+            values_dict.setdefault("resc-database", {}).setdefault("database", {}),
+            helm_values.database_tuning,
+            release_exists=release_exists,
+        )
+    return header
+
+
+def merge_capacity_plan_values(
+    values_dict: dict, capacity_values: dict, release_exists=None
+):
+    """
+        Merge the values of a capacity plan, the volumes of an existing release keep
+        their size
+    :param values_dict:
+        values dictionary, updated in place
+    :param capacity_values:
+        helm values of the capacity plan
+    :param release_exists:
+        function returning true if the helm release exists, optional
+    """
+    capacity_values = copy.deepcopy(capacity_values)
+    for chart, component, default_size in (
+        ("resc-rabbitmq", "rabbitMQ", constants.RABBITMQ_PVC_SIZE),
+        ("resc-database", "database", constants.DATABASE_PVC_SIZE),
+    ):
+        pvc_size = (
+            capacity_values.get(chart, {}).get(component, {}).pop("pvc_size", None)
+        )
+        if pvc_size:
+            set_pvc_size(
+                values_dict.setdefault(chart, {}).setdefault(component, {}),
+                pvc_size,
+                component=chart,
+                default_size=default_size,
+                release_exists=release_exists,
+            )
+    merge_values(values_dict, capacity_values)
+
+
+def merge_values(values_dict: dict, overrides: dict):
+    """
+        Merge helm values into a values dictionary
+    :param values_dict:
+        values dictionary, updated in place
+    :param overrides:
+        values which take precedence
+    """
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(values_dict.get(key), dict):
+            merge_values(values_dict[key], value)
+        else:
+            values_dict[key] = value
+
+
+def get_yaml_loader():
+    """
+        Get the safe yaml loader, the libyaml based loader is used when available
+    :return:
+        Returns yaml loader class
+    """
+    # Third Party
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def get_yaml_dumper():
+    """
+        Get the safe yaml dumper, the libyaml based dumper is used when available
+    :return:
+        Returns yaml dumper class
+    """
+    # Third Party
+    import yaml
+
+    return getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def get_template_snapshot_path(digest: str) -> str:
+    """
+        Get the path of the pre-parsed snapshot of a yaml template
+    :param digest:
+        SHA-256 of the template content
+    :return: str
+        Returns path of the snapshot file
+    """
+    return os.path.join(rule_pack.get_cache_dir(), "templates", f"{digest}.marshal")
+
+
+def read_template_snapshot(digest: str):
+    """
+        Read the pre-parsed snapshot of a yaml template from the cache directory
+    :param digest:
+        SHA-256 of the template content
+    :return: bytes
+        Returns marshalled template or None if no valid snapshot was found
+    """
+    try:
+        with open(get_template_snapshot_path(digest), "rb") as file_in:
+            snapshot = file_in.read()
+        marshal.loads(snapshot)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return snapshot
+
+
+def write_template_snapshot(digest: str, snapshot: bytes):
+    """
+        Write the pre-parsed snapshot of a yaml template to the cache directory
+    :param digest:
+        SHA-256 of the template content
+    :param snapshot:
+        marshalled template
+    """
+    snapshot_path = get_template_snapshot_path(digest)
+    try:
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        with open(f"{snapshot_path}.tmp", "wb") as file_out:
+            file_out.write(snapshot)
+        os.replace(f"{snapshot_path}.tmp", snapshot_path)
+    except OSError as error:
+        logging.debug(f"Unable to cache the parsed template: {error}")
+
+
+def load_yaml_template(content: bytes):
+    """
+        Parse a yaml template, the parsed template is cached in memory and on disk
+        keyed by the SHA-256 of its content, so an unchanged template is parsed only once
+    :param content:
+        content of the yaml template
+    :return:
+        Returns a fresh copy of the parsed template which can be modified by the caller
+    """
+    # Third Party
+    import yaml
+
+    digest = hashlib.sha256(content).hexdigest()
+    snapshot = _TEMPLATE_SNAPSHOTS.get(digest) or read_template_snapshot(digest)
+    if snapshot is None:
+        data = yaml.load(content, Loader=get_yaml_loader())
+        try:
+            snapshot = marshal.dumps(data)
+        except ValueError:
+            return data
+        write_template_snapshot(digest, snapshot)
+    _TEMPLATE_SNAPSHOTS[digest] = snapshot
+    return marshal.loads(snapshot)
+
+
 def read_yaml_file(file_path):
     """
         Read content of yaml file
     :param file_path:
-        path of yaml file
+        path of yaml file, relative to the resc_helm_wizard package
     :return: stream
         Returns yaml content
     """
-    with pkg_resources.resource_stream(__name__, file_path) as file_in:
-        data = yaml.safe_load(file_in)
-    return data
+    # Standard Library
+    import importlib.resources
+
+    resource = importlib.resources.files(__package__).joinpath(file_path)
+    with resource.open("rb") as file_in:
+        content = file_in.read()
+    return load_yaml_template(content)
 
 
 def get_scheme_host_port_from_url(url: str):
@@ -293,6 +583,34 @@ def get_scheme_host_port_from_url(url: str):
     return output.scheme, output.hostname, port
 
 
+def build_vcs_instance(
+    vcs_type: str, vcs_instance_info: dict, scope: List[str]
+) -> VcsInstance:
+    """
+        Build a VCS instance from the provided details
+    :param vcs_type:
+        type of VCS instance, one of GitHub, Azure Devops or Bitbucket
+    :param vcs_instance_info:
+        dictionary containing url, organization, username, token and optionally name of the VCS instance
+    :param scope:
+        list of accounts to scan, only applicable for GitHub
+    :return: VcsInstance
+        Returns VCS instance object
+    """
+    scheme, host, port = get_scheme_host_port_from_url(vcs_instance_info["url"])
+    return VcsInstance(
+        provider_type=constants.VCS_PROVIDER_TYPES[vcs_type],
+        scheme=scheme,
+        host=host,
+        port=port,
+        username=vcs_instance_info["username"],
+        password=vcs_instance_info["token"],
+        organization=vcs_instance_info["organization"],
+        scope=scope,
+        name=vcs_instance_info.get("name"),
+    )
+
+
 def get_vcs_instance_question_answers() -> List[VcsInstance]:
     """
         Get VCS instance related question answers
@@ -309,7 +627,7 @@ def get_vcs_instance_question_answers() -> List[VcsInstance]:
 
     for vcs in vcs_instance_answers:
         vcs_instance_info = questions.ask_vcs_instance_details(vcs_type=vcs)
-        scheme, host, port = get_scheme_host_port_from_url(vcs_instance_info["url"])
+        scope = []
         if vcs == "GitHub":
             default_github_accounts = (
                 f"{vcs_instance_info['username']}, kubernetes, docker"
@@ -317,63 +635,41 @@ def get_vcs_instance_question_answers() -> List[VcsInstance]:
             github_accounts = questions.ask_which_github_accounts_to_scan(
                 default_github_accounts=default_github_accounts
             )
-            github_account_list = [
-                account.strip() for account in github_accounts.split(",")
-            ]
-            vcs_instance = VcsInstance(
-                provider_type="GITHUB_PUBLIC",
-                scheme=scheme,
-                host=host,
-                port=port,
-                username=vcs_instance_info["username"],
-                password=vcs_instance_info["token"],
-                organization=vcs_instance_info["organization"],
-                scope=github_account_list,
-            )
-        if vcs == "Azure Devops":
-            vcs_instance = VcsInstance(
-                provider_type="AZURE_DEVOPS",
-                scheme=scheme,
-                host=host,
-                port=port,
-                username=vcs_instance_info["username"],
-                password=vcs_instance_info["token"],
-                organization=vcs_instance_info["organization"],
-                scope=[],
-            )
-        if vcs == "Bitbucket":
-            vcs_instance = VcsInstance(
-                provider_type="BITBUCKET",
-                scheme=scheme,
-                host=host,
-                port=port,
-                username=vcs_instance_info["username"],
-                password=vcs_instance_info["token"],
-                organization=vcs_instance_info["organization"],
-                scope=[],
-            )
+            scope = [account.strip() for account in github_accounts.split(",")]
+        vcs_instance = build_vcs_instance(
+            vcs_type=vcs, vcs_instance_info=vcs_instance_info, scope=scope
+        )
         vcs_instances.append(vcs_instance)
     return vcs_instances
 
 
-def download_rule_toml_file(url: str, file: str) -> bool:
+@timed_phase("rule_file_download", failed_outcomes=(False,))
+def download_rule_toml_file(
+    urls: List[str], file: str, verify_ssl: bool = None
+) -> bool:
     """
-        Download rule toml file
-    :param url:
-        url of the file to download
+        Download rule toml file from the fastest of the given mirrors
+    :param urls:
+        ordered list of urls or local file paths of the file to download
     :param file:
         path of the downloaded file
+    :param verify_ssl:
+        verify SSL certificates for HTTPS requests, user is asked when not provided
     :return: bool
         Returns true if rule downloaded successfully else returns false
     """
     downloaded = False
-    verify_ssl = questions.ask_ssl_verification(
-        msg="Do you want to verify SSL certificates for HTTPS requests?"
+    if verify_ssl is None:
+        verify_ssl = questions.ask_ssl_verification(
+            msg="Do you want to verify SSL certificates for HTTPS requests?"
+        )
+    rule_pack_path = rule_pack.fetch_rule_pack_from_mirrors(
+        urls=urls, verify_ssl=verify_ssl
     )
-    response = requests.get(url, timeout=100, verify=verify_ssl)
-    with open(file, "wb") as output:
-        output.write(response.content)
-    if os.path.exists(file) and os.path.getsize(file) > 0:
+    if rule_pack_path:
+        shutil.copyfile(rule_pack_path, f"{file}.tmp")
+        os.replace(f"{file}.tmp", file)
+    if rule_pack_path and os.path.exists(file) and os.path.getsize(file) > 0:
         downloaded = True
         logging.debug(f"{file} successfully downloaded")
     else:
@@ -395,44 +691,121 @@ def run_deployment_as_per_user_confirmation():
         logging.info("Skipping deployment...")
 
 
-def run_deployment():
+def refresh_helm_repository():
     """
-        Runs a helm deployment
-    :return: bool
-        Returns true if deployment successful else returns false
+    Adds and updates the RESC helm repository
     """
-    deployment_status = False
-
-    rule_file_downloaded = download_rule_toml_file(
-        url=constants.RULE_FILE_URL, file=constants.RULE_FILE
-    )
-
     add_helm_repository()
     update_helm_repository()
 
-    if rule_file_downloaded:
-        namespace_created = create_namespace_if_not_exists(
-            namespace_name=constants.NAMESPACE
-        )
 
-    if namespace_created:
-        # Check if release already exists
-        helm_release_exists = check_helm_release_exists()
-        if helm_release_exists:
-            run_upgrade_confirm_msg = (
-                f"Release {constants.RELEASE_NAME} is already installed in "
-                f"{constants.NAMESPACE} namespace. Do you want to upgrade the release?"
-            )
-            run_upgrade_confirm = questions.ask_user_confirmation(
-                msg=run_upgrade_confirm_msg
+def run_timed(function, **kwargs) -> tuple:
+    """
+        Run a function and measure its duration
+    :param function:
+        function to run
+    :param kwargs:
+        keyword arguments of the function
+    :return: tuple
+        Returns the result of the function and its duration in seconds
+    """
+    start_time = time.monotonic()
+    result = function(**kwargs)
+    return result, time.monotonic() - start_time
+
+
+@timed_phase("preflight")
+def run_preflight_checks(verify_ssl: bool) -> dict:
+    """
+        Runs the rule file download, helm repository refresh, namespace check and
+        release lookup in parallel and waits for all of them to finish
+    :param verify_ssl:
+        verify SSL certificates while downloading the rule file
+    :return: dict
+        Returns rule_file_downloaded, namespace_created and helm_release_exists
+    """
+    preflight_steps = {
+        "rule_file_downloaded": (
+            download_rule_toml_file,
+            {
+                "urls": rule_pack.get_rule_file_urls(),
+                "file": constants.RULE_FILE,
+                "verify_ssl": verify_ssl,
+            },
+        ),
+        "helm_repository_refreshed": (refresh_helm_repository, {}),
+        "namespace_created": (
+            create_namespace_if_not_exists,
+            {"namespace_name": constants.NAMESPACE},
+        ),
+        "helm_release_exists": (check_helm_release_exists, {}),
+    }
+
+    start_time = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(preflight_steps)) as executor:
+        # The copied context keeps preflight as the enclosing phase of the steps
+        futures = {
+            name: executor.submit(
+                contextvars.copy_context().run, run_timed, function, **kwargs
             )
+            for name, (function, kwargs) in preflight_steps.items()
+        }
+        outcomes = {name: future.result() for name, future in futures.items()}
+    wall_clock_time = time.monotonic() - start_time
+
+    serial_time = sum(duration for _, duration in outcomes.values())
+    logging.info(
+        f"Preflight checks finished in {wall_clock_time:.1f}s, running them serially would take "
+        f"{serial_time:.1f}s (saved {max(serial_time - wall_clock_time, 0):.1f}s)"
+    )
+    return {name: result for name, (result, _) in outcomes.items()}
+
+
+@timed_phase("deployment", failed_outcomes=("failed",))
+def run_deployment(verify_ssl: bool = None, upgrade_release: bool = None) -> str:
+    """
+        Runs a helm deployment
+    :param verify_ssl:
+        verify SSL certificates while downloading the rule file, user is asked when not provided
+    :param upgrade_release:
+        upgrade the release if it already exists, user is asked when not provided
+    :return: str
+        Returns outcome of the deployment: installed, upgraded, unchanged, skipped or failed
+    """
+    deployment_status = "failed"
+
+    if verify_ssl is None:
+        verify_ssl = questions.ask_ssl_verification(
+            msg="Do you want to verify SSL certificates for HTTPS requests?"
+        )
+    preflight = run_preflight_checks(verify_ssl=verify_ssl)
+
+    if preflight["rule_file_downloaded"] and preflight["namespace_created"]:
+        fingerprint = get_deployment_fingerprint()
+        if preflight["helm_release_exists"]:
+            if is_release_up_to_date(fingerprint=fingerprint):
+                return "unchanged"
+            report_restarts()
+            run_upgrade_confirm = upgrade_release
+            if run_upgrade_confirm is None:
+                run_upgrade_confirm_msg = (
+                    f"Release {constants.RELEASE_NAME} is already installed in "
+                    f"{constants.NAMESPACE} namespace. Do you want to upgrade the release?"
+                )
+                run_upgrade_confirm = questions.ask_user_confirmation(
+                    msg=run_upgrade_confirm_msg
+                )
             if run_upgrade_confirm is True:
-                deployment_status = install_or_upgrade_helm_release(action="upgrade")
-                validate_helm_deployment_status()
+                if deploy_with_readiness_watch(
+                    action="upgrade", fingerprint=fingerprint
+                ):
+                    validate_helm_deployment_status()
+                    deployment_status = "upgraded"
             else:
                 logging.info("Skipping deployment...")
+                deployment_status = "skipped"
 
-        else:
-            deployment_status = install_or_upgrade_helm_release(action="install")
+        elif deploy_with_readiness_watch(action="install", fingerprint=fingerprint):
             validate_helm_deployment_status()
+            deployment_status = "installed"
     return deployment_status
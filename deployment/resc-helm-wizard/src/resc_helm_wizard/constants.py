@@ -1,7 +1,8 @@
+ENV_PREFIX = "RESC_WIZARD_"
 RULE_FILE = "RESC-RULE.toml"
-RULE_FILE_URL = (
+RULE_FILE_URLS = [
     "https://raw.githubusercontent.com/zricethezav/gitleaks/master/config/gitleaks.toml"
-)
+]
 NAMESPACE = "resc"
 RESC_HELM_REPO_URL = "https://abnamro.github.io/repository-scanner"
 HELM_REPO_NAME = "resc-helm-repo"
@@ -11,3 +12,88 @@ VALUES_FILE = "custom-values.yaml"
 DEFAULT_GITHUB_URL = "https://github.com"
 DEFAULT_AZURE_DEVOPS_URL = "https://dev.azure.com"
 HELM_DEPLOY_TIMEOUT = "20m0s"
+DEPLOYMENT_FINGERPRINT_PREFIX = "resc-wizard-fingerprint="
+VCS_PROVIDER_TYPES = {
+    "GitHub": "GITHUB_PUBLIC",
+    "Azure Devops": "AZURE_DEVOPS",
+    "Bitbucket": "BITBUCKET",
+}
+FLEET_MAX_WORKERS = 4
+FLEET_LOG_DIR = "fleet-logs"
+RULE_PACK_CACHE_TTL = 3600
+RULE_PACK_DOWNLOAD_TIMEOUT = 100
+RULE_PACK_DOWNLOAD_RETRIES = 4
+RULE_PACK_RETRY_BACKOFF = 1.0
+RULE_PACK_CHUNK_SIZE = 64 * 1024
+RULE_PACK_MAX_MIRRORS = 4
+RULE_PACK_HEDGE_DELAY = 2.0
+READINESS_TIMEOUT = 20 * 60
+READINESS_POLL_INTERVAL = 2.0
+READINESS_CRASH_LOOP_RESTARTS = 3
+READINESS_COMPONENTS = {
+    "database": ["ms-database", "resc-db-init", "resc-db-tuning"],
+    "rabbitmq": ["rabbitmq", "resc-mq-init"],
+    "redis": ["redis"],
+    "scanner": ["resc-vcs-scanner-secrets"],
+    "scrapers": ["vcs-scraper-repositories"],
+    "web service": ["api"],
+    "frontend": ["frontend"],
+    "rules": ["resc-rules-init"],
+}
+PROFILE_FILE = "resc-helm-wizard.prof"
+PROFILE_TOP = 20
+VCS_API_TIMEOUT = 10
+VCS_API_RETRIES = 2
+VCS_API_MAX_RETRY_DELAY = 30
+VCS_API_MAX_WORKERS = 16
+VCS_API_MAX_REQUESTS_PER_HOST = 4
+VCS_API_MIN_REQUEST_INTERVAL = 0.05
+CREDENTIAL_CACHE_TTL = 3600
+INVENTORY_PAGE_SIZE = 100
+INVENTORY_FILE = "repository-inventory.json"
+CAPACITY_SECONDS_PER_REPOSITORY = 20
+CAPACITY_SCAN_BYTES_PER_SECOND = 5 * 1024**2
+CAPACITY_DEFAULT_REPOSITORY_SIZE = 50 * 1024**2
+CAPACITY_MAX_SCANNER_REPLICAS = 50
+CAPACITY_SCANNER_BASE_MEMORY = 512 * 1024**2
+CAPACITY_SCANNER_MEMORY_FACTOR = 3
+CAPACITY_SCANNER_MAX_MEMORY = 8 * 1024**3
+CAPACITY_MIN_PVC_SIZE = 10 * 1024**3
+AUTOSCALING_PROVIDERS = ["keda", "hpa"]
+AUTOSCALING_MAX_REPLICAS = 10
+SCRAPE_SCHEDULE = "0 6 * * 6"
+SCRAPE_WINDOW_HOURS = 12
+SCRAPE_SLOT_MINUTES = 15
+SCANNER_WORKER_POOLS = ["prefork", "threads", "solo"]
+SCANNER_WORKER_BASE_MEMORY = 256 * 1024**2
+SCANNER_WORKER_TASK_MEMORY = 1024**3
+SCANNER_WORKER_MAX_CONCURRENCY = 8
+SCANNER_WORKER_MAX_TASKS_PER_CHILD = 100
+CHECKSUM_VALUES = {
+    "vcsInstances": ["resc-vcs-instances"],
+    "rabbitmq": ["resc-rabbitmq", "rabbitMQ", "config"],
+    "webService": ["resc-web-service", "resc", "config"],
+}
+RESTART_WORKLOAD_KINDS = ["Deployment", "StatefulSet", "DaemonSet"]
+WEB_SERVICE_REQUESTS_PER_WORKER = 25
+WEB_SERVICE_CPU_PER_WORKER = 0.5
+WEB_SERVICE_BASE_MEMORY = 256 * 1024**2
+WEB_SERVICE_MEMORY_PER_WORKER = 256 * 1024**2
+WEB_SERVICE_MAX_WORKERS = 4
+WEB_SERVICE_MIN_REPLICAS = 2
+WEB_SERVICE_CPU_SHARE = 0.25
+WEB_SERVICE_CHARTS = ["resc-web-service", "resc-web-service-no-auth"]
+DATABASE_CPU = "2"
+DATABASE_MEMORY = "2G"
+DATABASE_PVC_SIZE = "10Gi"
+DATABASE_MEMORY_SHARE = 0.8
+DATABASE_MAX_CORES = 8
+DATABASE_BASE_STORAGE = 2 * 1024**3
+DATABASE_BYTES_PER_FINDING = 4 * 1024
+RABBITMQ_MEMORY = "900M"
+RABBITMQ_PVC_SIZE = "10Gi"
+RABBITMQ_QUEUE_MODES = ["lazy", "default"]
+RABBITMQ_LAZY_QUEUE_DEPTH = 10000
+RABBITMQ_MEMORY_WATERMARK = 0.6
+RABBITMQ_BASE_STORAGE = 1024**3
+RABBITMQ_BYTES_PER_MESSAGE = 64 * 1024
@@ -0,0 +1,257 @@
+# Standard Library
+import hashlib
+import json
+import logging
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.common import get_vcs_instance_names
+from resc_helm_wizard.rule_pack import get_cache_dir
+from resc_helm_wizard.timing import timed_phase, write_file_atomically
+from resc_helm_wizard.vcs_api import get_api_url, request_vcs_api
+from resc_helm_wizard.vcs_instance import VcsInstance
+
+logging.basicConfig(level=logging.INFO)
+
+
+class CredentialCheck:
+    """
+    A class to represent the outcome of the credential verification of a VCS instance.
+    Attributes
+    ----------
+    name : str
+        Name of the VCS instance
+    host : str
+        Host of the VCS instance
+    status : str
+        Outcome of the verification: valid, cached, invalid or unreachable
+    latency : float
+        Duration of the API request in seconds, None when the cache was used
+    message : str
+        Reason of a failed verification
+    """
+
+    def __init__(
+        self,
+        name: str,
+        host: str,
+        status: str,
+        latency: float = None,
+        message: str = None,
+    ):
+        self.name: str = name
+        self.host: str = host
+        self.status: str = status
+        self.latency: float = latency
+        self.message: str = message
+
+
+def get_credential_cache_ttl() -> int:
+    """
+        Get the number of seconds a successful verification is reused,
+        can be overridden with RESC_WIZARD_CREDENTIAL_CACHE_TTL
+    :return: int
+        Returns cache ttl in seconds
+    """
+    return int(
+        os.environ.get(
+            f"{constants.ENV_PREFIX}CREDENTIAL_CACHE_TTL",
+            constants.CREDENTIAL_CACHE_TTL,
+        )
+    )
+
+
+def get_credential_cache_file() -> str:
+    """
+        Get the path of the credential verification cache
+    :return: str
+        Returns path of the cache file
+    """
+    return os.path.join(get_cache_dir(), "credentials.json")
+
+
+def get_credential_cache_key(vcs_instance: VcsInstance) -> str:
+    """
+        Get the cache key of the credentials of a VCS instance, the token is only stored as hash
+    :param vcs_instance:
+        object of VcsInstance
+    :return: str
+        Returns SHA-256 hex digest of the api url, username and token
+    """
+    key = "\n".join(
+        [get_api_url(vcs_instance), vcs_instance.username, vcs_instance.password]
+    )
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def load_credential_cache() -> dict:
+    """
+        Load the time of the last successful verification per cache key
+    :return: dict
+        Returns credential cache
+    """
+    try:
+        with open(get_credential_cache_file(), "r", encoding="utf-8") as file_in:
+            return json.load(file_in)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_credential_cache(cache: dict):
+    """
+        Save the credential cache, expired entries are dropped
+    :param cache:
+        time of the last successful verification per cache key
+    """
+    now = time.time()
+    cache = {
+        key: verified_at
+        for key, verified_at in cache.items()
+        if now - verified_at < get_credential_cache_ttl()
+    }
+    os.makedirs(get_cache_dir(), exist_ok=True)
+    write_file_atomically(get_credential_cache_file(), json.dumps(cache, indent=2))
+
+
+def get_verification_url(vcs_instance: VcsInstance) -> tuple:
+    """
+        Get the API endpoint which requires valid credentials of a VCS instance
+    :param vcs_instance:
+        object of VcsInstance
+    :return: tuple
+        Returns url and query parameters
+    """
+    api_url = get_api_url(vcs_instance)
+    if vcs_instance.provider_type == "GITHUB_PUBLIC":
+        return f"{api_url}/user", None
+    if vcs_instance.provider_type == "AZURE_DEVOPS":
+        return f"{api_url}/projects", {"$top": 1, "api-version": "7.0"}
+    return f"{api_url}/projects", {"limit": 1}
+
+
+def verify_vcs_instance(
+    vcs_instance: VcsInstance, name: str, verify_ssl: bool = True
+) -> CredentialCheck:
+    """
+        Verify the credentials of a VCS instance with an authenticated API request
+    :param vcs_instance:
+        object of VcsInstance
+    :param name:
+        name of the VCS instance
+    :param verify_ssl:
+        verify the SSL certificate of the VCS instance
+    :return: CredentialCheck
+        Returns outcome of the verification
+    """
+    # Third Party
+    import requests
+
+    url, params = get_verification_url(vcs_instance)
+    start_time = time.monotonic()
+    try:
+        response = request_vcs_api(
+            vcs_instance, url, verify_ssl=verify_ssl, params=params
+        )
+    except requests.RequestException as error:
+        return CredentialCheck(
+            name,
+            vcs_instance.host,
+            "unreachable",
+            time.monotonic() - start_time,
+            str(error),
+        )
+    latency = time.monotonic() - start_time
+    if response.status_code == 200:
+        return CredentialCheck(name, vcs_instance.host, "valid", latency)
+    if response.status_code in (401, 403):
+        message = f"credentials were rejected with HTTP {response.status_code}"
+        return CredentialCheck(name, vcs_instance.host, "invalid", latency, message)
+    if response.status_code == 404 and vcs_instance.provider_type == "AZURE_DEVOPS":
+        message = f"organization {vcs_instance.organization} was not found"
+        return CredentialCheck(name, vcs_instance.host, "invalid", latency, message)
+    message = f"{url} returned HTTP {response.status_code}"
+    return CredentialCheck(name, vcs_instance.host, "unreachable", latency, message)
+
+
+def log_latency_per_host(checks: List[CredentialCheck]):
+    """
+        Log a summary table of the verifications and API latency per host
+    :param checks:
+        list of CredentialCheck objects
+    """
+    hosts = {}
+    for check in checks:
+        hosts.setdefault(check.host, []).append(check)
+    lines = [
+        f"{'HOST':<40}  {'INSTANCES':>9}  {'FAILED':>6}  {'MEDIAN':>8}  {'MAX':>8}"
+    ]
+    for host, host_checks in hosts.items():
+        latencies = [
+            check.latency for check in host_checks if check.latency is not None
+        ]
+        failed = sum(
+            check.status in ("invalid", "unreachable") for check in host_checks
+        )
+        median = (
+            f"{statistics.median(latencies) * 1000:.0f}ms" if latencies else "cached"
+        )
+        maximum = f"{max(latencies) * 1000:.0f}ms" if latencies else "-"
+        lines.append(
+            f"{host:<40}  {len(host_checks):>9}  {failed:>6}  {median:>8}  {maximum:>8}"
+        )
+    summary = "\n".join(lines)
+    logging.info(f"VCS credential verification:\n{summary}")
+
+
+@timed_phase("credential_verification", failed_outcomes=(False,))
+def verify_vcs_credentials(
+    vcs_instances: List[VcsInstance], verify_ssl: bool = True
+) -> bool:
+    """
+        Verify the credentials of all VCS instances concurrently against their APIs,
+        successful verifications are cached for RESC_WIZARD_CREDENTIAL_CACHE_TTL seconds
+    :param vcs_instances:
+        list of VCS instances
+    :param verify_ssl:
+        verify the SSL certificates of the VCS instances
+    :return: bool
+        Returns true if the credentials of all VCS instances are valid else returns false
+    """
+    cache = load_credential_cache()
+    now = time.time()
+    checks = {}
+    futures = {}
+    with ThreadPoolExecutor(max_workers=constants.VCS_API_MAX_WORKERS) as executor:
+        for vcs_instance, name in zip(
+            vcs_instances, get_vcs_instance_names(vcs_instances)
+        ):
+            cache_key = get_credential_cache_key(vcs_instance)
+            if now - cache.get(cache_key, 0) < get_credential_cache_ttl():
+                checks[name] = CredentialCheck(name, vcs_instance.host, "cached")
+                continue
+            checks[name] = None
+            futures[cache_key] = executor.submit(
+                verify_vcs_instance, vcs_instance, name, verify_ssl
+            )
+        for cache_key, future in futures.items():
+            check = future.result()
+            checks[check.name] = check
+            if check.status == "valid":
+                cache[cache_key] = time.time()
+
+    if futures:
+        save_credential_cache(cache)
+    log_latency_per_host(list(checks.values()))
+    failed_checks = [
+        check for check in checks.values() if check.status in ("invalid", "unreachable")
+    ]
+    for check in failed_checks:
+        logging.error(
+            f"Credentials of VCS instance {check.name} could not be verified: {check.message}"
+        )
+    return not failed_checks
@@ -0,0 +1,164 @@
+# Standard Library
+import logging
+import math
+import re
+import sys
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.helm_utilities import set_pvc_size
+from resc_helm_wizard.scanner_worker import parse_cpu, parse_memory
+
+logging.basicConfig(level=logging.INFO)
+
+MIB = 1024**2
+GIB = 1024**3
+
+
+class DatabaseTuning:
+    """
+    A class to represent the engine tuning of the in-cluster database.
+    Attributes
+    ----------
+    memory_limit_mb : int
+        Memory the engine may use, MSSQL_MEMORY_LIMIT_MB
+    max_degree_of_parallelism : int
+        Number of cores a single query may use
+    tempdb_files : int
+        Number of tempdb data files
+    pvc_size : str
+        Size of the database volume, e.g. 20Gi
+    """
+
+    def __init__(
+        self,
+        memory_limit_mb: int,
+        max_degree_of_parallelism: int,
+        tempdb_files: int,
+        pvc_size: str,
+    ):
+        self.memory_limit_mb: int = memory_limit_mb
+        self.max_degree_of_parallelism: int = max_degree_of_parallelism
+        self.tempdb_files: int = tempdb_files
+        self.pvc_size: str = pvc_size
+
+    def get_values(self) -> dict:
+        """
+            Get the database helm values of the resc-database chart
+        :return: dict
+            Returns tuning and pvc_size values
+        """
+        return {
+            "tuning": {
+                "memoryLimitMb": self.memory_limit_mb,
+                "maxDegreeOfParallelism": self.max_degree_of_parallelism,
+                "tempdbFiles": self.tempdb_files,
+            },
+            "pvc_size": self.pvc_size,
+        }
+
+
+def plan_database_tuning(
+    resources: dict, pvc_size: str = None, expected_findings: int = 0
+) -> DatabaseTuning:
+    """
+        Tune the database engine from the resources of the database pod, the engine
+        leaves memory to the OS of the container and uses a tempdb file per core.
+        The volume holds the findings twice, for the tables and their indexes.
+    :param resources:
+        resource requests and limits of the database pod
+    :param pvc_size:
+        size of the database volume, e.g. 10Gi, the volume is never shrunk
+    :param expected_findings:
+        expected number of findings in the database
+    :return: DatabaseTuning
+        Returns object of DatabaseTuning
+    :raises ValueError: if resources or pvc_size are not valid quantities
+    """
+    limits = resources.get("limits") or {}
+    requests = resources.get("requests") or {}
+    cpu = parse_cpu(limits.get("cpu") or requests.get("cpu") or constants.DATABASE_CPU)
+    memory = parse_memory(
+        limits.get("memory") or requests.get("memory") or constants.DATABASE_MEMORY
+    )
+    cores = max(min(math.floor(cpu), constants.DATABASE_MAX_CORES), 1)
+    volume = (
+        constants.DATABASE_BASE_STORAGE
+        + expected_findings * constants.DATABASE_BYTES_PER_FINDING * 2
+    )
+    volume = max(volume, parse_memory(pvc_size or constants.DATABASE_PVC_SIZE))
+    return DatabaseTuning(
+        memory_limit_mb=math.floor(memory * constants.DATABASE_MEMORY_SHARE / MIB),
+        max_degree_of_parallelism=cores,
+        tempdb_files=cores,
+        pvc_size=f"{math.ceil(volume / GIB)}Gi",
+    )
+
+
+def get_database_tuning_settings(settings: dict) -> dict:
+    """
+        Validate the tuning settings, abort the program if the settings are invalid
+    :param settings:
+        expected_findings, optional
+    :return: dict
+        Returns settings with whole numbers
+    """
+    if not isinstance(settings, dict) or set(settings) - {"expected_findings"}:
+        logging.error(
+            "Aborting the program! Invalid value for database_tuning: "
+            "must be a mapping of expected_findings"
+        )
+        sys.exit(1)
+    expected_findings = settings.get("expected_findings")
+    if expected_findings is not None and not re.fullmatch(
+        r"\d{1,12}", str(expected_findings)
+    ):
+        logging.error(
+            f"Aborting the program! Invalid value for database_tuning: "
+            f"expected_findings: {expected_findings} is not a whole number"
+        )
+        sys.exit(1)
+    return {key: int(value) for key, value in settings.items()}
+
+
+def set_database_tuning_values(
+    database_values: dict, settings: dict = None, release_exists=None
+):
+    """
+        Tune the database engine from the final resources of the database pod
+    :param database_values:
+        database helm values of the resc-database chart, updated in place
+    :param settings:
+        expected_findings, optional
+    :param release_exists:
+        function returning true if the helm release exists, the volume of an
+        existing release is not resized, optional
+    """
+    expected_findings = get_database_tuning_settings(settings or {}).get(
+        "expected_findings", 0
+    )
+    try:
+        tuning = plan_database_tuning(
+            database_values.get("resources") or {},
+            pvc_size=database_values.get("pvc_size"),
+            expected_findings=expected_findings,
+        )
+    except ValueError as error:
+        logging.error(
+            f"Aborting the program! Invalid resources of resc-database: {error}"
+        )
+        sys.exit(1)
+    values = tuning.get_values()
+    database_values.setdefault("tuning", {}).update(values["tuning"])
+    set_pvc_size(
+        database_values,
+        tuning.pvc_size,
+        component="resc-database",
+        default_size=constants.DATABASE_PVC_SIZE,
+        release_exists=release_exists,
+    )
+    logging.info(
+        f"resc-database: {tuning.memory_limit_mb} MB engine memory, max degree of "
+        f"parallelism {tuning.max_degree_of_parallelism}, {tuning.tempdb_files} tempdb "
+        f"files and a {database_values['pvc_size']} volume"
+    )
@@ -0,0 +1,331 @@
+# Standard Library
+import contextvars
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+# First Party
+from resc_helm_wizard import answers, constants, rule_pack
+from resc_helm_wizard.common import (
+    create_helm_values_yaml,
+    download_rule_toml_file,
+    get_yaml_loader,
+)
+from resc_helm_wizard.helm_utilities import (
+    add_helm_repository,
+    check_helm_release_exists,
+    get_deployment_fingerprint,
+    is_release_up_to_date,
+    update_helm_repository,
+    validate_helm_deployment_status,
+)
+from resc_helm_wizard.kubernetes_utilities import create_namespace_if_not_exists
+from resc_helm_wizard.readiness import deploy_with_readiness_watch
+from resc_helm_wizard.restarts import report_restarts
+from resc_helm_wizard.sizing import apply_sizing_answers
+
+logging.basicConfig(level=logging.INFO)
+
+# Kube context of the cluster deployed by the current thread, helper threads inherit it
+CLUSTER_CONTEXT = contextvars.ContextVar("cluster_context", default=None)
+
+
+class ClusterResult:
+    """
+    A class to represent the outcome of a deployment to a single cluster.
+    Attributes
+    ----------
+    kube_context : str
+        Name of the kube context
+    status : str
+        Outcome of the deployment: installed, upgraded, unchanged, skipped or failed
+    duration : float
+        Duration of the deployment in seconds
+    log_file : str
+        Path of the cluster log file
+    """
+
+    def __init__(self, kube_context: str, status: str, duration: float, log_file: str):
+        self.kube_context: str = kube_context
+        self.status: str = status
+        self.duration: float = duration
+        self.log_file: str = log_file
+
+
+class ClusterFilter(logging.Filter):
+    """
+    Logging filter which only passes records emitted while deploying a single cluster.
+    """
+
+    def __init__(self, kube_context: str):
+        super().__init__()
+        self.kube_context: str = kube_context
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return CLUSTER_CONTEXT.get() == self.kube_context
+
+
+def get_cluster_file_names(kube_contexts: List[str]) -> List[str]:
+    """
+        Get unique file names for kube contexts, e.g. arn:aws:eks:region:account:cluster/prod
+    :param kube_contexts:
+        names of the kube contexts
+    :return: List[str]
+        Returns kube contexts with every character not allowed in a file name replaced,
+        kube contexts with the same file name get a numbered suffix
+    """
+    file_names = []
+    for kube_context in kube_contexts:
+        base_name = re.sub(r"[^\w.-]", "_", kube_context)
+        file_name = base_name
+        suffix = 2
+        while file_name in file_names:
+            file_name = f"{base_name}-{suffix}"
+            suffix += 1
+        file_names.append(file_name)
+    return file_names
+
+
+def load_fleet_file(fleet_file: str) -> dict:
+    """
+        Load the fleet file containing the list of clusters to deploy
+    :param fleet_file:
+        path of the YAML or JSON fleet file
+    :return: dict
+        Returns fleet configuration
+    """
+    # Third Party
+    import yaml
+
+    try:
+        with open(fleet_file, "r", encoding="utf-8") as file_in:
+            fleet = yaml.load(file_in, Loader=get_yaml_loader()) or {}
+    except FileNotFoundError:
+        logging.error(f"Aborting the program! {fleet_file} file was not found")
+        sys.exit(1)
+
+    clusters = fleet.get("clusters")
+    if not clusters:
+        logging.error(f"Aborting the program! No clusters were found in {fleet_file}")
+        sys.exit(1)
+    for cluster in clusters:
+        if not cluster.get("kube_context"):
+            logging.error("Aborting the program! kube_context is missing for a cluster")
+            sys.exit(1)
+        if not cluster.get("values_file") and not cluster.get("answers_file"):
+            logging.error(
+                f"Aborting the program! values_file or answers_file is missing "
+                f"for cluster {cluster['kube_context']}"
+            )
+            sys.exit(1)
+    return fleet
+
+
+def prepare_cluster_values_file(cluster: dict, file_name: str) -> str:
+    """
+        Get the values file of a cluster, generate it from the answers file when needed,
+        sized like the non-interactive wizard
+    :param cluster:
+        cluster configuration from the fleet file
+    :param file_name:
+        unique file name of the cluster
+    :return: str
+        Returns path of the values yaml file
+    """
+    if cluster.get("values_file"):
+        return cluster["values_file"]
+
+    values_file = f"custom-values-{file_name}.yaml"
+    answers_dict = answers.load_answers(answers_file=cluster["answers_file"])
+    helm_values = answers.get_helm_values_from_answers(answers_dict)
+    apply_sizing_answers(
+        answers_dict=answers_dict,
+        helm_values=helm_values,
+        kube_context=cluster["kube_context"],
+    )
+    create_helm_values_yaml(
+        helm_values=helm_values,
+        input_values_yaml_file="config/example-values.yaml",
+        output_values_yaml_file=values_file,
+        kube_context=cluster["kube_context"],
+    )
+    return values_file
+
+
+def deploy_cluster(kube_context: str, values_file: str, upgrade_release: bool) -> str:
+    """
+        Run the namespace, install or upgrade and validation steps for a single cluster
+    :param kube_context:
+        name of the kube context
+    :param values_file:
+        path of the values yaml file
+    :param upgrade_release:
+        upgrade the release if it already exists
+    :return: str
+        Returns outcome of the deployment: installed, upgraded, unchanged, skipped or failed
+    """
+    if not create_namespace_if_not_exists(
+        namespace_name=constants.NAMESPACE, kube_context=kube_context
+    ):
+        return "failed"
+
+    action = "install"
+    fingerprint = get_deployment_fingerprint(values_file=values_file)
+    if check_helm_release_exists(kube_context=kube_context):
+        if is_release_up_to_date(fingerprint=fingerprint, kube_context=kube_context):
+            return "unchanged"
+        if not upgrade_release:
+            logging.info(
+                f"Release {constants.RELEASE_NAME} already exists, skipping..."
+            )
+            return "skipped"
+        report_restarts(kube_context=kube_context, values_file=values_file)
+        action = "upgrade"
+
+    if not deploy_with_readiness_watch(
+        action=action,
+        kube_context=kube_context,
+        values_file=values_file,
+        fingerprint=fingerprint,
+    ):
+        return "failed"
+    validate_helm_deployment_status(kube_context=kube_context)
+    return "upgraded" if action == "upgrade" else "installed"
+
+
+def run_cluster_deployment(
+    cluster: dict, values_file: str, log_dir: str, upgrade_release: bool, file_name: str
+) -> ClusterResult:
+    """
+        Deploy a single cluster, logging to a dedicated log file
+    :param cluster:
+        cluster configuration from the fleet file
+    :param values_file:
+        path of the values yaml file
+    :param log_dir:
+        directory of the cluster log files
+    :param upgrade_release:
+        upgrade the release if it already exists
+    :param file_name:
+        unique file name of the cluster
+    :return: ClusterResult
+        Returns outcome of the cluster deployment
+    """
+    kube_context = cluster["kube_context"]
+    log_file = os.path.join(log_dir, f"{file_name}.log")
+    context_token = CLUSTER_CONTEXT.set(kube_context)
+    log_handler = None
+    start_time = time.monotonic()
+    try:
+        log_handler = logging.FileHandler(log_file, mode="w", encoding="utf-8")
+        log_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(message)s")
+        )
+        log_handler.addFilter(ClusterFilter(kube_context))
+        logging.getLogger().addHandler(log_handler)
+        logging.info(f"Starting deployment to {kube_context} using {values_file}")
+        status = deploy_cluster(
+            kube_context=kube_context,
+            values_file=values_file,
+            upgrade_release=upgrade_release,
+        )
+    # A failing cluster must not stop the deployment of the other clusters
+    except (Exception, SystemExit) as error:  # pylint: disable=broad-exception-caught
+        logging.error(f"Deployment to {kube_context} failed: {error}")
+        status = "failed"
+    finally:
+        if log_handler:
+            logging.getLogger().removeHandler(log_handler)
+            log_handler.close()
+        CLUSTER_CONTEXT.reset(context_token)
+    return ClusterResult(
+        kube_context=kube_context,
+        status=status,
+        duration=time.monotonic() - start_time,
+        log_file=log_file,
+    )
+
+
+def log_fleet_summary(results: List[ClusterResult], duration: float):
+    """
+        Log a summary table of the fleet deployment
+    :param results:
+        list of cluster results
+    :param duration:
+        total duration of the fleet deployment in seconds
+    """
+    width = max([len(result.kube_context) for result in results] + [len("CLUSTER")])
+    lines = [f"{'CLUSTER':<{width}}  {'STATUS':<9}  {'DURATION':>9}  LOG"]
+    for result in results:
+        lines.append(
+            f"{result.kube_context:<{width}}  {result.status:<9}  "
+            f"{result.duration:>8.1f}s  {result.log_file}"
+        )
+    failed = len([result for result in results if result.status == "failed"])
+    lines.append(
+        f"{len(results)} clusters deployed in {duration:.1f}s, {failed} failed"
+    )
+    summary = "\n".join(lines)
+    logging.info(f"Fleet deployment summary:\n{summary}")
+
+
+def run_fleet_deployment(fleet_file: str) -> bool:
+    """
+        Deploy RESC to many clusters concurrently with a bounded worker pool,
+        the rule file download and helm repository refresh are shared by all clusters
+    :param fleet_file:
+        path of the YAML or JSON fleet file
+    :return: bool
+        Returns true if all cluster deployments succeeded else returns false
+    """
+    start_time = time.monotonic()
+    fleet = load_fleet_file(fleet_file)
+    clusters = fleet["clusters"]
+    max_workers = int(fleet.get("max_workers", constants.FLEET_MAX_WORKERS))
+    log_dir = fleet.get("log_dir", constants.FLEET_LOG_DIR)
+    upgrade_release = answers.parse_bool(fleet.get("upgrade_release", True))
+    os.makedirs(log_dir, exist_ok=True)
+
+    file_names = get_cluster_file_names(
+        [cluster["kube_context"] for cluster in clusters]
+    )
+    values_files = [
+        prepare_cluster_values_file(cluster, file_name)
+        for cluster, file_name in zip(clusters, file_names)
+    ]
+
+    if not download_rule_toml_file(
+        urls=rule_pack.get_rule_file_urls(),
+        file=constants.RULE_FILE,
+        verify_ssl=answers.parse_bool(fleet.get("verify_ssl", True)),
+    ):
+        logging.error("Aborting the program! Unable to download the rule file")
+        sys.exit(1)
+    add_helm_repository()
+    update_helm_repository()
+
+    logging.info(
+        f"Deploying {len(clusters)} clusters with {max_workers} parallel workers..."
+    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(
+            executor.map(
+                lambda cluster, values_file, file_name: run_cluster_deployment(
+                    cluster=cluster,
+                    values_file=values_file,
+                    log_dir=log_dir,
+                    upgrade_release=upgrade_release,
+                    file_name=file_name,
+                ),
+                clusters,
+                values_files,
+                file_names,
+            )
+        )
+
+    log_fleet_summary(results=results, duration=time.monotonic() - start_time)
+    return all(result.status != "failed" for result in results)
@@ -1,20 +1,52 @@
 # Standard Library
+import hashlib
 import json
 import logging
+import os
 import subprocess
 import sys
+import threading
 
 # First Party
 from resc_helm_wizard import constants
+from resc_helm_wizard.timing import timed_phase
 
 logging.basicConfig(level=logging.INFO)
 
 
-def install_or_upgrade_helm_release(action: str) -> bool:
+def get_kube_context_args(kube_context: str = None) -> list:
+    """
+        Get helm arguments to target a kube context
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :return: list
+        Returns list of helm arguments
+    """
+    if kube_context:
+        return ["--kube-context", kube_context]
+    return []
+
+
+@timed_phase("helm_install_or_upgrade", failed_outcomes=(False,))
+def install_or_upgrade_helm_release(
+    action: str,
+    kube_context: str = None,
+    values_file: str = constants.VALUES_FILE,
+    fingerprint: str = None,
+    cancel_event: threading.Event = None,
+) -> bool:
     """
         Install or upgrade a helm release
     :param action:
         action to perform like install or upgrade
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :param values_file:
+        path of the helm values yaml file
+    :param fingerprint:
+        deployment fingerprint stored in the release description, optional
+    :param cancel_event:
+        event which terminates helm when set, optional
     :return: bool
         Returns true if install or upgrade succeeded else returns false
     """
@@ -29,27 +61,45 @@ def install_or_upgrade_helm_release(action: str) -> bool:
         constants.RELEASE_NAME,
         constants.CHART_NAME,
         "-f",
-        constants.VALUES_FILE,
+        values_file,
         "--set-file",
         "global.secretScanRulePackConfig=" + constants.RULE_FILE,
-    ]
-    try:
-        output = subprocess.check_output(helm_command)
-        logging.info(output.decode("utf-8"))
-        return True
-    except subprocess.CalledProcessError:
+    ] + get_kube_context_args(kube_context)
+    if fingerprint:
+        helm_command += [
+            "--description",
+            f"{constants.DEPLOYMENT_FINGERPRINT_PREFIX}{fingerprint}",
+        ]
+    with subprocess.Popen(helm_command, stdout=subprocess.PIPE) as process:
+        while True:
+            try:
+                output, _ = process.communicate(timeout=1)
+                break
+            except subprocess.TimeoutExpired:
+                if cancel_event is not None and cancel_event.is_set():
+                    logging.error(f"Cancelling the {action} of {constants.CHART_NAME}")
+                    process.terminate()
+                    process.communicate()
+                    return False
+    if process.returncode != 0:
         logging.error(f"An error occurred during {constants.CHART_NAME} deployment")
         return False
+    logging.info(output.decode("utf-8"))
+    return True
 
 
-def check_helm_release_exists() -> bool:
+@timed_phase("helm_release_lookup")
+def check_helm_release_exists(kube_context: str = None) -> bool:
     """
         Checks if helm release exists or not
+    :param kube_context:
+        name of the kube context, current context is used when not provided
     :return: bool
         Returns true if helm release exists else returns false
     """
     output = subprocess.run(
-        ["helm", "list", "-f", constants.RELEASE_NAME, "-n", constants.NAMESPACE],
+        ["helm", "list", "-f", constants.RELEASE_NAME, "-n", constants.NAMESPACE]
+        + get_kube_context_args(kube_context),
         capture_output=True,
         text=True,
         check=True,
@@ -57,6 +107,54 @@ def check_helm_release_exists() -> bool:
     return bool(constants.RELEASE_NAME in output.stdout.strip())
 
 
+def is_existing_release(kube_context: str = None) -> bool:
+    """
+        Checks if the helm release exists, without failing when helm or the cluster
+        can not be reached
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :return: bool
+        Returns true if helm release exists else returns false
+    """
+    try:
+        return check_helm_release_exists(kube_context=kube_context)
+    except (subprocess.CalledProcessError, OSError):
+        return False
+
+
+def set_pvc_size(
+    values: dict,
+    pvc_size: str,
+    component: str,
+    default_size: str,
+    release_exists=None,
+):
+    """
+        Set the volume size of a chart, the persistent volumes of RESC are statically
+        provisioned and can not be resized by helm, so an existing release keeps its size
+    :param values:
+        helm values holding the pvc_size, updated in place
+    :param pvc_size:
+        planned volume size, e.g. 20Gi
+    :param component:
+        name of the chart, e.g. resc-database
+    :param default_size:
+        volume size of the chart when the values do not set one
+    :param release_exists:
+        function returning true if the helm release exists, optional
+    """
+    current_size = values.get("pvc_size") or default_size
+    if pvc_size != current_size and release_exists is not None and release_exists():
+        logging.warning(
+            f"{component}: release {constants.RELEASE_NAME} already exists, keeping its "
+            f"{current_size} volume instead of {pvc_size}. Helm can not resize the "
+            f"statically provisioned persistent volume, resize it by hand and set "
+            f"pvc_size to {pvc_size}"
+        )
+        pvc_size = current_size
+    values["pvc_size"] = pvc_size
+
+
 def get_version_from_downloaded_chart() -> str:
     """
         Get version of the downloaded chart
@@ -74,6 +172,154 @@ def get_version_from_downloaded_chart() -> str:
     return None
 
 
+@timed_phase("deployment_fingerprint")
+def get_deployment_fingerprint(
+    values_file: str = constants.VALUES_FILE, rule_file: str = constants.RULE_FILE
+) -> str:
+    """
+        Compute the fingerprint of a deployment over the values file, the rule file
+        and the version of the downloaded chart
+    :param values_file:
+        path of the helm values yaml file
+    :param rule_file:
+        path of the rule toml file
+    :return: str
+        Returns SHA-256 fingerprint or None if the chart version is unknown
+    """
+    try:
+        chart_version = get_version_from_downloaded_chart()
+    except (subprocess.CalledProcessError, ValueError):
+        chart_version = None
+    if not chart_version:
+        return None
+
+    fingerprint = hashlib.sha256()
+    fingerprint.update(f"chart:{chart_version}\n".encode("utf-8"))
+    for file_path in (values_file, rule_file):
+        with open(file_path, "rb") as file_in:
+            content = file_in.read()
+        fingerprint.update(f"{os.path.basename(file_path)}:{len(content)}\n".encode())
+        fingerprint.update(content)
+    return fingerprint.hexdigest()
+
+
+def get_deployed_fingerprint(kube_context: str = None) -> str:
+    """
+        Get the fingerprint stored in the description of the deployed helm release
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :return: str
+        Returns fingerprint or None if the release is not deployed by the wizard
+    """
+    try:
+        result = subprocess.run(
+            ["helm", "status", constants.RELEASE_NAME, "-n", constants.NAMESPACE]
+            + ["-o", "json"]
+            + get_kube_context_args(kube_context),
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        release_info = json.loads(result.stdout).get("info", {})
+    except (subprocess.CalledProcessError, ValueError):
+        return None
+
+    description = release_info.get("description", "")
+    if release_info.get("status") != "deployed" or not description.startswith(
+        constants.DEPLOYMENT_FINGERPRINT_PREFIX
+    ):
+        return None
+    return description.removeprefix(constants.DEPLOYMENT_FINGERPRINT_PREFIX)
+
+
+def is_release_up_to_date(fingerprint: str, kube_context: str = None) -> bool:
+    """
+        Check if the deployed helm release matches the fingerprint, so the upgrade
+        can be skipped. The check is disabled with RESC_WIZARD_FORCE_UPGRADE
+    :param fingerprint:
+        fingerprint of the deployment
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :return: bool
+        Returns true if the release is up to date else returns false
+    """
+    force_upgrade = os.environ.get(f"{constants.ENV_PREFIX}FORCE_UPGRADE", "false")
+    if not fingerprint or force_upgrade.strip().lower() in ("true", "yes", "y", "1"):
+        return False
+    if get_deployed_fingerprint(kube_context=kube_context) != fingerprint:
+        return False
+    logging.info(
+        f"Release {constants.RELEASE_NAME} is up to date "
+        f"(fingerprint {fingerprint[:12]}), skipping the upgrade"
+    )
+    return True
+
+
+def get_release_manifest(kube_context: str = None) -> str:
+    """
+        Get the manifest of the deployed helm release
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :return: str
+        Returns manifest or None if the release manifest could not be retrieved
+    """
+    try:
+        result = subprocess.run(
+            [
+                "helm",
+                "get",
+                "manifest",
+                constants.RELEASE_NAME,
+                "-n",
+                constants.NAMESPACE,
+            ]
+            + get_kube_context_args(kube_context),
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except subprocess.CalledProcessError:
+        return None
+    return result.stdout
+
+
+def render_release_manifest(
+    kube_context: str = None, values_file: str = constants.VALUES_FILE
+) -> str:
+    """
+        Render the manifest of the helm release with the downloaded chart, without deploying it
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :param values_file:
+        path of the helm values yaml file
+    :return: str
+        Returns manifest or None if the chart could not be rendered
+    """
+    try:
+        result = subprocess.run(
+            [
+                "helm",
+                "template",
+                constants.RELEASE_NAME,
+                constants.CHART_NAME,
+                "-n",
+                constants.NAMESPACE,
+                "-f",
+                values_file,
+                "--set-file",
+                "global.secretScanRulePackConfig=" + constants.RULE_FILE,
+            ]
+            + get_kube_context_args(kube_context),
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except subprocess.CalledProcessError:
+        return None
+    return result.stdout
+
+
+@timed_phase("helm_repo_add")
 def add_helm_repository():
     """
     Adds a helm repository
@@ -94,6 +340,7 @@ def add_helm_repository():
         sys.exit(1)
 
 
+@timed_phase("helm_repo_update")
 def update_helm_repository():
     """
     Updates a helm repository
@@ -106,13 +353,17 @@ def update_helm_repository():
         sys.exit(1)
 
 
-def validate_helm_deployment_status():
+@timed_phase("status_validation")
+def validate_helm_deployment_status(kube_context: str = None):
     """
-    Validate the status of the helm deployment
+        Validate the status of the helm deployment
+    :param kube_context:
+        name of the kube context, current context is used when not provided
     """
     try:
         result = subprocess.run(
-            ["helm", "status", constants.RELEASE_NAME, "-n", constants.NAMESPACE],
+            ["helm", "status", constants.RELEASE_NAME, "-n", constants.NAMESPACE]
+            + get_kube_context_args(kube_context),
             capture_output=True,
             check=True,
             text=True,
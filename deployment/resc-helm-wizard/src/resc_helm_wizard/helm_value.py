@@ -20,6 +20,20 @@ class HelmValue:
         Rabbitmq storage path
     vcs_instances : list
         List of VCS instances
+    capacity_plan : CapacityPlan
+        Estimated replicas, resources and volume sizes, optional
+    scanner_autoscaling : ScannerAutoscaling
+        Queue depth based autoscaling of the secret scanners, optional
+    scrape_schedules : list
+        List of ScrapeSchedule objects, staggered projects scraper schedules per VCS instance
+    scanner_worker : dict
+        Celery worker settings of the secret scanners overriding the sized worker, optional
+    web_service : WebServiceSize
+        Replicas, workers and resources of the web service, optional
+    database_tuning : dict
+        Expected finding volume the database engine is tuned for, optional
+    rabbitmq_profile : dict
+        Expected queue depth the RabbitMQ throughput profile is planned for, optional
     """
 
     def __init__(
@@ -29,9 +43,23 @@ class HelmValue:
         db_storage_path: str,
         rabbitmq_storage_path: str,
         vcs_instances: List[VcsInstance],
+        capacity_plan=None,
+        scanner_autoscaling=None,
+        scrape_schedules: list = None,
+        scanner_worker: dict = None,
+        web_service=None,
+        database_tuning: dict = None,
+        rabbitmq_profile: dict = None,
     ):
         self.operating_system: str = operating_system
         self.db_password: str = db_password
         self.db_storage_path: str = db_storage_path
         self.rabbitmq_storage_path: str = rabbitmq_storage_path
         self.vcs_instances: list = vcs_instances
+        self.capacity_plan = capacity_plan
+        self.scanner_autoscaling = scanner_autoscaling
+        self.scrape_schedules: list = scrape_schedules or []
+        self.scanner_worker: dict = scanner_worker
+        self.web_service = web_service
+        self.database_tuning: dict = database_tuning
+        self.rabbitmq_profile: dict = rabbitmq_profile
@@ -1,22 +1,46 @@
 # Standard Library
+import json
 import logging
 import subprocess
 
+# First Party
+from resc_helm_wizard.scanner_worker import parse_cpu
+from resc_helm_wizard.timing import timed_phase
+
 logging.basicConfig(level=logging.INFO)
 
 
-def create_namespace_if_not_exists(namespace_name: str) -> bool:
+def get_kube_context_args(kube_context: str = None) -> list:
+    """
+        Get kubectl arguments to target a kube context
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :return: list
+        Returns list of kubectl arguments
+    """
+    if kube_context:
+        return ["--context", kube_context]
+    return []
+
+
+@timed_phase("namespace_creation")
+def create_namespace_if_not_exists(
+    namespace_name: str, kube_context: str = None
+) -> bool:
     """
         Create a namespace if not exists
     :param namespace_name:
         name of the namespace you want to create
+    :param kube_context:
+        name of the kube context, current context is used when not provided
     :return: bool
         Returns true if namespace created else returns false
     """
     created = False
     # Check if the namespace already exists
     check_namespace = subprocess.run(
-        ["kubectl", "get", "namespace", namespace_name],
+        ["kubectl", "get", "namespace", namespace_name]
+        + get_kube_context_args(kube_context),
         capture_output=True,
         text=True,
         check=False,
@@ -24,7 +48,9 @@ def create_namespace_if_not_exists(namespace_name: str) -> bool:
     if "NotFound" in check_namespace.stderr:
         # Namespace doesn't exist, create it
         create_namespace = subprocess.run(
-            ["kubectl", "create", "namespace", namespace_name], check=True
+            ["kubectl", "create", "namespace", namespace_name]
+            + get_kube_context_args(kube_context),
+            check=True,
         )
         if create_namespace.returncode == 0:
             created = True
@@ -41,3 +67,29 @@ def create_namespace_if_not_exists(namespace_name: str) -> bool:
             f"Namespace {namespace_name} already exists. Preparing for deployment..."
         )
     return created
+
+
+def get_allocatable_cpu(kube_context: str = None) -> float:
+    """
+        Get the allocatable CPU of the schedulable nodes of the cluster
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :return: float
+        Returns number of CPU cores or None if the nodes could not be read
+    """
+    try:
+        result = subprocess.run(
+            ["kubectl", "get", "nodes", "-o", "json"]
+            + get_kube_context_args(kube_context),
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        nodes = json.loads(result.stdout).get("items", [])
+        return sum(
+            parse_cpu(node["status"]["allocatable"]["cpu"])
+            for node in nodes
+            if not node.get("spec", {}).get("unschedulable")
+        )
+    except (OSError, subprocess.CalledProcessError, KeyError, ValueError):
+        return None
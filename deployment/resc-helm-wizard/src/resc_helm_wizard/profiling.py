@@ -0,0 +1,153 @@
+# Standard Library
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+
+# First Party
+from resc_helm_wizard import constants
+
+logging.basicConfig(level=logging.INFO)
+
+# Built-in functions in which the wizard blocks, matched against the pstats function names
+WAIT_FUNCTIONS = {
+    "subprocesses": ["posix.waitpid", "'poll' of 'select.poll'", "posix.read"],
+    "network": ["_socket.socket", "_ssl._SSLSocket", "_socket.getaddrinfo"],
+    "sleep": ["time.sleep"],
+    "threads": ["'acquire' of '_thread.lock'"],
+    "user input": ["'poll' of 'select.epoll'", "select.select"],
+}
+
+
+class ThreadProfilers:
+    """
+    Profiles the threads started while the wizard is profiled, cProfile only
+    profiles the thread in which it was enabled on Python versions before 3.12.
+    From 3.12 cProfile uses sys.monitoring, which profiles all threads.
+    """
+
+    def __init__(self):
+        self.profilers = []
+        self.lock = threading.Lock()
+
+    def start_thread_profiler(self, *_):
+        """
+        Enable a profiler for the calling thread, used as threading profile hook
+        """
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # The profiler of the main thread already profiles all threads, remove the
+            # hook so it is not called again for every profile event of the thread
+            sys.setprofile(None)
+            return
+        with self.lock:
+            self.profilers.append(profiler)
+
+    def get_profilers(self) -> list:
+        """
+            Get the profilers of the threads
+        :return: list
+            Returns list of cProfile.Profile objects
+        """
+        with self.lock:
+            return list(self.profilers)
+
+
+def get_wait_times(stats: pstats.Stats) -> dict:
+    """
+        Get the time spent in blocking built-in functions per category
+    :param stats:
+        profile statistics
+    :return: dict
+        Returns seconds spent waiting per category
+    """
+    wait_times = {category: 0.0 for category in WAIT_FUNCTIONS}
+    for (_, _, function_name), (_, _, own_time, _, _) in stats.stats.items():
+        for category, patterns in WAIT_FUNCTIONS.items():
+            if any(pattern in function_name for pattern in patterns):
+                wait_times[category] += own_time
+                break
+    return wait_times
+
+
+def get_profile_summary(
+    stats: pstats.Stats, wall_time: float, cpu_time: float, top: int
+) -> str:
+    """
+        Get a short summary of the profile
+    :param stats:
+        profile statistics
+    :param wall_time:
+        wall clock duration of the profiled run in seconds
+    :param cpu_time:
+        CPU time of the process during the profiled run in seconds
+    :param top:
+        number of functions to list
+    :return: str
+        Returns summary with the wait times and the top functions by own time
+    """
+    lines = [
+        f"Wall time {wall_time:.2f}s, Python CPU time {cpu_time:.2f}s, "
+        f"waiting {max(wall_time - cpu_time, 0):.2f}s",
+    ]
+    for category, wait_time in get_wait_times(stats).items():
+        if wait_time:
+            lines.append(f"  waiting on {category}: {wait_time:.2f}s")
+
+    output = io.StringIO()
+    stats.stream = output
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+    lines.append(f"Top {top} functions by own time:")
+    lines.append(output.getvalue().split("\n\n", 1)[-1].rstrip())
+    return "\n".join(lines)
+
+
+def run_profiled(
+    function,
+    profile_file: str = constants.PROFILE_FILE,
+    top: int = constants.PROFILE_TOP,
+    **kwargs,
+):
+    """
+        Run a function under cProfile, including the threads it starts, write the
+        statistics to a pstats file and log a summary which separates the time spent
+        waiting on subprocesses, HTTP and the user from Python CPU time
+    :param function:
+        function to profile
+    :param profile_file:
+        path of the pstats file, can be inspected with python -m pstats
+    :param top:
+        number of functions listed in the summary
+    :param kwargs:
+        keyword arguments of the function
+    :return:
+        Returns the result of the function
+    """
+    thread_profilers = ThreadProfilers()
+    profiler = cProfile.Profile()
+    start_time = time.monotonic()
+    start_cpu_time = time.process_time()
+    profile_threads = sys.version_info < (3, 12)
+    if profile_threads:
+        threading.setprofile(thread_profilers.start_thread_profiler)
+    profiler.enable()
+    try:
+        return function(**kwargs)
+    finally:
+        profiler.disable()
+        if profile_threads:
+            threading.setprofile(None)
+        wall_time = time.monotonic() - start_time
+        cpu_time = time.process_time() - start_cpu_time
+
+        stats = pstats.Stats(profiler)
+        for thread_profiler in thread_profilers.get_profilers():
+            stats.add(thread_profiler)
+        stats.dump_stats(profile_file)
+        summary = get_profile_summary(stats, wall_time, cpu_time, top)
+        logging.info(f"Profile has been written to {profile_file}\n{summary}")
@@ -1,9 +1,6 @@
 # Standard Library
 import os
 
-# Third Party
-import questionary
-
 # First Party
 from resc_helm_wizard import constants
 from resc_helm_wizard.validator import (
@@ -13,6 +10,7 @@ from resc_helm_wizard.validator import (
     github_token_validator,
     github_username_validator,
     password_validator,
+    replica_count_validator,
     vcs_url_validator,
 )
 
@@ -23,6 +21,9 @@ def ask_operating_system() -> str:
     :return: str
         Returns user selected operating system
     """
+    # Third Party
+    import questionary
+
     answer = questionary.select(
         message="Which operating system are you running on the target environment",
         choices=["Microsoft Windows", "macOS", "Linux"],
@@ -36,6 +37,9 @@ def ask_local_storage_path() -> str:
     :return: str
         Returns user provided local storage path
     """
+    # Third Party
+    import questionary
+
     default_local_storage = os.path.expanduser("~")
     answer = questionary.path(
         message="Where would you like to create the local storage for RESC. default is ",
@@ -51,6 +55,9 @@ def ask_password_for_database() -> str:
     :return: str
         Returns user provided password for database
     """
+    # Third Party
+    import questionary
+
     answer = questionary.password(
         "Please enter the password you want to set for database",
         validate=password_validator,
@@ -58,15 +65,20 @@ def ask_password_for_database() -> str:
     return answer
 
 
-def ask_user_confirmation(msg: str) -> bool:
+def ask_user_confirmation(msg: str, default: bool = True) -> bool:
     """
         Asks user to provide confirmation
     :param msg:
         confirmation message
+    :param default:
+        answer when the user just presses enter
     :return: bool
         Returns True or False based on user's confirmation
     """
-    answer = questionary.confirm(msg).unsafe_ask()
+    # Third Party
+    import questionary
+
+    answer = questionary.confirm(msg, default=default).unsafe_ask()
     return answer
 
 
@@ -76,6 +88,9 @@ def ask_user_to_select_vcs_instance() -> [str]:
     :return: [str]
         Returns array of user selected vcs instances
     """
+    # Third Party
+    import questionary
+
     answer = questionary.checkbox(
         "Select VCS instance for which you want to run the scan",
         choices=[
@@ -94,6 +109,9 @@ def ask_vcs_instance_details(vcs_type: str) -> dict:
     :return: dict
         Returns vcs instance info
     """
+    # Third Party
+    import questionary
+
     username = "NA"
     organization = ""
 
@@ -149,6 +167,9 @@ def ask_which_github_accounts_to_scan(default_github_accounts: str) -> [str]:
     :return: [str]
         Returns array of GitHub account names
     """
+    # Third Party
+    import questionary
+
     github_accounts = questionary.text(
         "Enter a comma separated list of GitHub accounts you want to scan",
         default=default_github_accounts,
@@ -165,5 +186,30 @@ def ask_ssl_verification(msg: str) -> bool:
     :return: bool
         Returns True or False based on user's confirmation
     """
+    # Third Party
+    import questionary
+
     answer = questionary.confirm(msg, default=True).unsafe_ask()
     return answer
+
+
+def ask_scanner_autoscaling() -> dict:
+    """
+        Asks user for the replica bounds of the secret scanners scaled on the queue depth
+    :return: dict
+        Returns min_replicas and max_replicas
+    """
+    # Third Party
+    import questionary
+
+    min_replicas = questionary.text(
+        "Minimum number of secret scanner replicas, 0 stops the scanners when the queue is empty",
+        default="0",
+        validate=replica_count_validator,
+    ).unsafe_ask()
+    max_replicas = questionary.text(
+        "Maximum number of secret scanner replicas",
+        default=str(constants.AUTOSCALING_MAX_REPLICAS),
+        validate=replica_count_validator,
+    ).unsafe_ask()
+    return {"min_replicas": int(min_replicas), "max_replicas": int(max_replicas)}
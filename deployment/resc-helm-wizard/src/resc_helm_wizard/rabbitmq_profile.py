@@ -0,0 +1,215 @@
+# Standard Library
+import logging
+import math
+import re
+import sys
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.helm_utilities import set_pvc_size
+from resc_helm_wizard.scanner_worker import parse_memory
+
+logging.basicConfig(level=logging.INFO)
+
+MIB = 1024**2
+GIB = 1024**3
+PROFILE_SETTINGS = ["queue_depth", "queue_mode", "prefetch"]
+
+
+class RabbitMQProfile:
+    """
+    A class to represent the throughput profile of RabbitMQ.
+    Attributes
+    ----------
+    queue_depth : int
+        Expected number of queued repositories
+    queue_mode : str
+        Mode of the classic queues, lazy or default
+    memory_high_watermark_mb : int
+        Memory above which publishers are blocked
+    disk_free_limit_mb : int
+        Free disk space below which publishers are blocked
+    prefetch : int
+        Number of repositories reserved from the queue per scanner process
+    pvc_size : str
+        Size of the RabbitMQ volume, e.g. 20Gi
+    """
+
+    def __init__(
+        self,
+        queue_depth: int,
+        queue_mode: str,
+        memory_high_watermark_mb: int,
+        disk_free_limit_mb: int,
+        prefetch: int,
+        pvc_size: str,
+    ):
+        self.queue_depth: int = queue_depth
+        self.queue_mode: str = queue_mode
+        self.memory_high_watermark_mb: int = memory_high_watermark_mb
+        self.disk_free_limit_mb: int = disk_free_limit_mb
+        self.prefetch: int = prefetch
+        self.pvc_size: str = pvc_size
+
+    def get_values(self) -> dict:
+        """
+            Get the rabbitMQ helm values of the resc-rabbitmq chart
+        :return: dict
+            Returns throughput and pvc_size values
+        """
+        return {
+            "throughput": {
+                "queueMode": self.queue_mode,
+                "memoryHighWatermarkMb": self.memory_high_watermark_mb,
+                "diskFreeLimitMb": self.disk_free_limit_mb,
+            },
+            "pvc_size": self.pvc_size,
+        }
+
+
+def plan_rabbitmq_profile(
+    resources: dict, queue_depth: int, pvc_size: str = None, settings: dict = None
+) -> RabbitMQProfile:
+    """
+        Plan the RabbitMQ throughput profile for a queue depth. Lazy queues keep a large
+        backlog on disk instead of in memory, so the memory alarm does not block the
+        scrapers. The disk free limit equals the memory limit, which fits a flush of
+        all messages in memory, and the volume holds the backlog on top of it.
+    :param resources:
+        resource requests and limits of the RabbitMQ pod
+    :param queue_depth:
+        expected number of queued repositories
+    :param pvc_size:
+        size of the RabbitMQ volume, e.g. 10Gi, the volume is never shrunk
+    :param settings:
+        queue_mode and prefetch, overriding the planned values, optional
+    :return: RabbitMQProfile
+        Returns object of RabbitMQProfile
+    :raises ValueError: if resources or pvc_size are not valid quantities
+    """
+    settings = settings or {}
+    limits = resources.get("limits") or {}
+    memory = parse_memory(
+        limits.get("memory")
+        or (resources.get("requests") or {}).get("memory")
+        or constants.RABBITMQ_MEMORY
+    )
+    queue_mode = settings.get("queue_mode") or (
+        "lazy" if queue_depth >= constants.RABBITMQ_LAZY_QUEUE_DEPTH else "default"
+    )
+    disk_free_limit_mb = math.ceil(memory / MIB)
+    volume = (
+        constants.RABBITMQ_BASE_STORAGE
+        + queue_depth * constants.RABBITMQ_BYTES_PER_MESSAGE
+        + disk_free_limit_mb * MIB
+    )
+    volume = max(volume, parse_memory(pvc_size or constants.RABBITMQ_PVC_SIZE))
+    return RabbitMQProfile(
+        queue_depth=queue_depth,
+        queue_mode=queue_mode,
+        memory_high_watermark_mb=math.floor(
+            memory * constants.RABBITMQ_MEMORY_WATERMARK / MIB
+        ),
+        disk_free_limit_mb=disk_free_limit_mb,
+        # Scans take minutes, a reserved repository would wait for a busy process
+        prefetch=settings.get("prefetch", 1),
+        pvc_size=f"{math.ceil(volume / GIB)}Gi",
+    )
+
+
+def get_rabbitmq_profile_errors(settings: dict) -> list:
+    """
+        Validate the profile settings
+    :param settings:
+        queue_depth, required, queue_mode and prefetch, optional
+    :return: list
+        Returns list of validation errors, empty if the settings are valid
+    """
+    if not isinstance(settings, dict) or "queue_depth" not in settings:
+        return [
+            "must be a mapping of queue_depth and optionally queue_mode and prefetch"
+        ]
+    errors = [
+        f"{key} is not supported" for key in settings if key not in PROFILE_SETTINGS
+    ]
+    for key, minimum in (("queue_depth", 0), ("prefetch", 1)):
+        value = settings.get(key)
+        if value is not None and (
+            not re.fullmatch(r"\d{1,9}", str(value)) or int(value) < minimum
+        ):
+            errors.append(f"{key}: {value} is not a whole number of at least {minimum}")
+    queue_mode = settings.get("queue_mode")
+    if queue_mode is not None and queue_mode not in constants.RABBITMQ_QUEUE_MODES:
+        errors.append(
+            f"queue_mode: {queue_mode} is not supported, supported queue modes are "
+            f"{', '.join(constants.RABBITMQ_QUEUE_MODES)}"
+        )
+    return errors
+
+
+def get_rabbitmq_profile_settings(settings: dict) -> dict:
+    """
+        Validate the profile settings, abort the program if the settings are invalid
+    :param settings:
+        queue_depth, required, queue_mode and prefetch, optional
+    :return: dict
+        Returns settings with whole numbers
+    """
+    errors = get_rabbitmq_profile_errors(settings)
+    for error in errors[:-1]:
+        logging.error(f"Invalid value for rabbitmq_profile: {error}")
+    if errors:
+        logging.error(
+            f"Aborting the program! Invalid value for rabbitmq_profile: {errors[-1]}"
+        )
+        sys.exit(1)
+    return {
+        key: value if key == "queue_mode" else int(value)
+        for key, value in settings.items()
+    }
+
+
+def set_rabbitmq_profile_values(
+    rabbitmq_values: dict, settings: dict, release_exists=None
+) -> RabbitMQProfile:
+    """
+        Plan the throughput profile from the final resources of the RabbitMQ pod
+    :param rabbitmq_values:
+        rabbitMQ helm values of the resc-rabbitmq chart, updated in place
+    :param settings:
+        queue_depth, required, queue_mode and prefetch, optional
+    :param release_exists:
+        function returning true if the helm release exists, the volume of an
+        existing release is not resized, optional
+    :return: RabbitMQProfile
+        Returns object of RabbitMQProfile
+    """
+    settings = get_rabbitmq_profile_settings(settings)
+    try:
+        profile = plan_rabbitmq_profile(
+            rabbitmq_values.get("resources") or {},
+            queue_depth=settings["queue_depth"],
+            pvc_size=rabbitmq_values.get("pvc_size"),
+            settings=settings,
+        )
+    except ValueError as error:
+        logging.error(
+            f"Aborting the program! Invalid resources of resc-rabbitmq: {error}"
+        )
+        sys.exit(1)
+    values = profile.get_values()
+    rabbitmq_values.setdefault("throughput", {}).update(values["throughput"])
+    set_pvc_size(
+        rabbitmq_values,
+        profile.pvc_size,
+        component="resc-rabbitmq",
+        default_size=constants.RABBITMQ_PVC_SIZE,
+        release_exists=release_exists,
+    )
+    logging.info(
+        f"resc-rabbitmq: {profile.queue_mode} queues for {profile.queue_depth} queued "
+        f"repositories, publishers blocked above {profile.memory_high_watermark_mb} MB "
+        f"memory or below {profile.disk_free_limit_mb} MB free disk on a "
+        f"{rabbitmq_values['pvc_size']} volume"
+    )
+    return profile
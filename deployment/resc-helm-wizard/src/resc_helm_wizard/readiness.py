@@ -0,0 +1,408 @@
+# Standard Library
+import contextvars
+import json
+import logging
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.helm_utilities import install_or_upgrade_helm_release
+from resc_helm_wizard.kubernetes_utilities import get_kube_context_args
+from resc_helm_wizard.timing import timed_phase
+
+logging.basicConfig(level=logging.INFO)
+
+FAILING_CONTAINER_REASONS = [
+    "CrashLoopBackOff",
+    "ImagePullBackOff",
+    "InvalidImageName",
+    "CreateContainerConfigError",
+]
+
+
+class ComponentStatus:
+    """
+    A class to represent the readiness of a RESC component.
+    Attributes
+    ----------
+    component : str
+        Name of the component, e.g. database or web service
+    status : str
+        Readiness of the component: ready, pending or failed
+    time_to_ready : float
+        Seconds from the start of the deployment until the component was ready
+    """
+
+    def __init__(self, component: str, status: str, time_to_ready: float = None):
+        self.component: str = component
+        self.status: str = status
+        self.time_to_ready: float = time_to_ready
+
+
+def get_component(key: str) -> str:
+    """
+        Get the RESC component of a workload or pod
+    :param key:
+        tier label of a deployment or statefulset, or name of a job
+    :return: str
+        Returns name of the component or None if the key is not part of RESC
+    """
+    for component, prefixes in constants.READINESS_COMPONENTS.items():
+        if any(key.startswith(prefix) for prefix in prefixes):
+            return component
+    return None
+
+
+def get_workload_component(workload: dict) -> str:
+    """
+        Get the RESC component of a deployment, statefulset or job
+    :param workload:
+        kubernetes workload object
+    :return: str
+        Returns name of the component or None if the workload is not part of RESC
+    """
+    if workload["kind"] == "Job":
+        return get_component(workload["metadata"]["name"])
+    labels = workload["spec"]["template"]["metadata"].get("labels", {})
+    return get_component(labels.get("tier", ""))
+
+
+def get_pod_component(pod: dict) -> str:
+    """
+        Get the RESC component of a pod
+    :param pod:
+        kubernetes pod object
+    :return: str
+        Returns name of the component or None if the pod is not part of RESC
+    """
+    labels = pod["metadata"].get("labels", {})
+    return get_component(labels.get("job-name") or labels.get("tier", ""))
+
+
+def is_workload_ready(
+    workload: dict, existing_objects: dict = None, helm_done: bool = True
+) -> bool:
+    """
+        Check if a workload is ready, a job is ready when it succeeded. A deployment or
+        statefulset is ready when its controller observed the latest generation and
+        all replicas run the updated pod template.
+    :param workload:
+        kubernetes workload object
+    :param existing_objects:
+        generation by uid of the objects which existed before the deployment, optional
+    :param helm_done:
+        true if helm finished applying the release
+    :return: bool
+        Returns true if the workload is ready else returns false
+    """
+    metadata = workload["metadata"]
+    status = workload.get("status", {})
+    uid = metadata.get("uid")
+    if (
+        not helm_done
+        and uid in (existing_objects or {})
+        and existing_objects[uid] == metadata.get("generation")
+    ):
+        # The workload of the previous release, helm may still update it
+        return False
+    if workload["kind"] == "Job":
+        return status.get("succeeded", 0) >= 1
+    if status.get("observedGeneration", 0) < metadata.get("generation", 0):
+        return False
+    replicas = workload["spec"].get("replicas", 1)
+    ready = status.get("readyReplicas", 0) >= replicas and (
+        status.get("updatedReplicas", 0) >= replicas
+    )
+    if workload["kind"] == "StatefulSet":
+        return ready and status.get("currentRevision") == status.get("updateRevision")
+    # Pods of the previous replica set are still running during a rollout
+    return ready and status.get("replicas", 0) <= replicas
+
+
+def get_workload_failure(workload: dict) -> str:
+    """
+        Get the reason why a job failed
+    :param workload:
+        kubernetes workload object
+    :return: str
+        Returns failure reason or None if the workload did not fail
+    """
+    for condition in workload.get("status", {}).get("conditions", []):
+        if condition.get("type") == "Failed" and condition.get("status") == "True":
+            return (
+                f"job {workload['metadata']['name']} failed: "
+                f"{condition.get('reason', 'unknown reason')}"
+            )
+    return None
+
+
+def get_pod_failure(pod: dict) -> str:
+    """
+        Get the reason why a pod will not become ready without intervention
+    :param pod:
+        kubernetes pod object
+    :return: str
+        Returns failure reason or None if the pod may still become ready
+    """
+    name = pod["metadata"]["name"]
+    status = pod.get("status", {})
+    for condition in status.get("conditions", []):
+        if condition.get("type") == "PodScheduled" and (
+            condition.get("reason") == "Unschedulable"
+        ):
+            return f"pod {name} is unschedulable: {condition.get('message', '')}"
+
+    container_statuses = status.get("initContainerStatuses", []) + status.get(
+        "containerStatuses", []
+    )
+    for container_status in container_statuses:
+        reason = container_status.get("state", {}).get("waiting", {}).get("reason")
+        if reason not in FAILING_CONTAINER_REASONS:
+            continue
+        if (
+            reason == "CrashLoopBackOff"
+            and container_status.get("restartCount", 0)
+            < constants.READINESS_CRASH_LOOP_RESTARTS
+        ):
+            continue
+        return f"container {container_status['name']} of pod {name} is in {reason}"
+    return None
+
+
+def get_namespace_objects(kinds: str, kube_context: str = None) -> List[dict]:
+    """
+        List kubernetes objects in the RESC namespace
+    :param kinds:
+        comma separated kinds, e.g. deployments,statefulsets,jobs
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :return: List[dict]
+        Returns list of objects or None if the objects could not be listed
+    """
+    try:
+        result = subprocess.run(
+            ["kubectl", "get", kinds, "-n", constants.NAMESPACE, "-o", "json"]
+            + get_kube_context_args(kube_context),
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        return json.loads(result.stdout).get("items", [])
+    except (subprocess.CalledProcessError, ValueError) as error:
+        logging.warning(f"Unable to list {kinds}: {error}")
+        return None
+
+
+def get_existing_objects(kube_context: str = None) -> dict:
+    """
+        Get the workloads and pods which exist before the deployment starts
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :return: dict
+        Returns generation by uid of the existing objects, empty if the objects could
+        not be listed
+    """
+    objects = get_namespace_objects("deployments,statefulsets,jobs,pods", kube_context)
+    return {
+        item["metadata"]["uid"]: item["metadata"].get("generation")
+        for item in objects or []
+        if item["metadata"].get("uid")
+    }
+
+
+def find_failure(
+    workloads: List[dict], pods: List[dict], existing_objects: dict = None
+) -> tuple:
+    """
+        Find a RESC component which will not become ready without intervention, jobs
+        and pods of an earlier release are ignored
+    :param workloads:
+        list of deployments, statefulsets and jobs
+    :param pods:
+        list of pods
+    :param existing_objects:
+        generation by uid of the objects which existed before the deployment, optional
+    :return: tuple
+        Returns failed component and failure reason, both None if nothing failed
+    """
+    existing_objects = existing_objects or {}
+    workloads = [
+        item
+        for item in workloads
+        if item["metadata"].get("uid") not in existing_objects
+    ]
+    pods = [
+        item for item in pods if item["metadata"].get("uid") not in existing_objects
+    ]
+    for workload in workloads:
+        component = get_workload_component(workload)
+        failure = get_workload_failure(workload)
+        if component and failure:
+            return component, failure
+    for pod in pods:
+        component = get_pod_component(pod)
+        if not component or pod["metadata"].get("deletionTimestamp"):
+            continue
+        failure = get_pod_failure(pod)
+        if failure:
+            return component, failure
+    return None, None
+
+
+def update_component_statuses(
+    workloads: List[dict],
+    statuses: dict,
+    start_time: float,
+    existing_objects: dict = None,
+    helm_done: bool = True,
+) -> bool:
+    """
+        Update the readiness of the RESC components with the current workloads
+    :param workloads:
+        list of deployments, statefulsets and jobs
+    :param statuses:
+        readiness per component, updated in place
+    :param start_time:
+        monotonic start time of the deployment
+    :param existing_objects:
+        generation by uid of the objects which existed before the deployment, optional
+    :param helm_done:
+        true if helm finished applying the release
+    :return: bool
+        Returns true if all components are ready else returns false
+    """
+    ready = {}
+    for workload in workloads:
+        component = get_workload_component(workload)
+        if component:
+            ready[component] = ready.get(component, True) and is_workload_ready(
+                workload, existing_objects, helm_done
+            )
+
+    for component, component_ready in ready.items():
+        status = statuses.setdefault(component, ComponentStatus(component, "pending"))
+        if component_ready and status.status != "ready":
+            status.status = "ready"
+            status.time_to_ready = time.monotonic() - start_time
+            logging.info(
+                f"Component {component} is ready in {status.time_to_ready:.1f}s"
+            )
+    return bool(statuses) and all(
+        status.status == "ready" for status in statuses.values()
+    )
+
+
+def log_readiness_summary(statuses: dict):
+    """
+        Log a summary table of the readiness per component
+    :param statuses:
+        readiness per component
+    """
+    lines = [f"{'COMPONENT':<12}  {'STATUS':<8}  {'TIME TO READY':>13}"]
+    for status in statuses.values():
+        time_to_ready = (
+            f"{status.time_to_ready:.1f}s" if status.time_to_ready is not None else "-"
+        )
+        lines.append(f"{status.component:<12}  {status.status:<8}  {time_to_ready:>13}")
+    summary = "\n".join(lines)
+    logging.info(f"Component readiness:\n{summary}")
+
+
+@timed_phase("readiness_watch", failed_outcomes=(False,))
+def watch_component_readiness(
+    kube_context: str = None,
+    helm_future: Future = None,
+    timeout: float = constants.READINESS_TIMEOUT,
+    existing_objects: dict = None,
+) -> bool:
+    """
+        Watch the RESC components until all of them are ready, fails fast when a
+        pod is in CrashLoopBackOff, ImagePullBackOff or can not be scheduled
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :param helm_future:
+        future of the running helm install or upgrade, optional
+    :param timeout:
+        maximum number of seconds to wait for the components
+    :param existing_objects:
+        generation by uid of the objects which existed before the deployment, their
+        failures belong to an earlier release, optional
+    :return: bool
+        Returns true if all components are ready else returns false
+    """
+    start_time = time.monotonic()
+    statuses = {}
+    while True:
+        helm_done = helm_future is None or helm_future.done()
+        workloads = get_namespace_objects("deployments,statefulsets,jobs", kube_context)
+        pods = get_namespace_objects("pods", kube_context)
+        if workloads is not None and pods is not None:
+            component, failure = find_failure(workloads, pods, existing_objects)
+            if failure:
+                statuses.setdefault(component, ComponentStatus(component, "pending"))
+                statuses[component].status = "failed"
+                logging.error(f"Component {component} failed, {failure}")
+                log_readiness_summary(statuses)
+                return False
+            all_ready = update_component_statuses(
+                workloads, statuses, start_time, existing_objects, helm_done
+            )
+            if all_ready and helm_done:
+                log_readiness_summary(statuses)
+                return helm_future is None or helm_future.result()
+
+        if helm_future is not None and helm_future.done() and not helm_future.result():
+            log_readiness_summary(statuses)
+            return False
+        if time.monotonic() - start_time > timeout:
+            logging.error(f"Components were not ready within {timeout:.0f}s")
+            log_readiness_summary(statuses)
+            return False
+        time.sleep(constants.READINESS_POLL_INTERVAL)
+
+
+def deploy_with_readiness_watch(
+    action: str,
+    kube_context: str = None,
+    values_file: str = constants.VALUES_FILE,
+    fingerprint: str = None,
+) -> bool:
+    """
+        Install or upgrade the helm release while watching the readiness of the RESC
+        components, helm is cancelled as soon as a component fails
+    :param action:
+        action to perform like install or upgrade
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :param values_file:
+        path of the helm values yaml file
+    :param fingerprint:
+        deployment fingerprint stored in the release description, optional
+    :return: bool
+        Returns true if the release was deployed and all components are ready
+    """
+    cancel_event = threading.Event()
+    existing_objects = get_existing_objects(kube_context)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # The context keeps the log records of helm attributed to the deployed cluster
+        helm_future = executor.submit(
+            contextvars.copy_context().run,
+            install_or_upgrade_helm_release,
+            action=action,
+            kube_context=kube_context,
+            values_file=values_file,
+            fingerprint=fingerprint,
+            cancel_event=cancel_event,
+        )
+        ready = watch_component_readiness(
+            kube_context=kube_context,
+            helm_future=helm_future,
+            existing_objects=existing_objects,
+        )
+        if not ready:
+            cancel_event.set()
+    return ready
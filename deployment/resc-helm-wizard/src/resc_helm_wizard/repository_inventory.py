@@ -0,0 +1,443 @@
+# Standard Library
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.common import get_vcs_instance_names
+from resc_helm_wizard.credentials import get_credential_cache_key
+from resc_helm_wizard.rule_pack import get_cache_dir
+from resc_helm_wizard.timing import timed_phase, write_file_atomically
+from resc_helm_wizard.vcs_api import get_api_url, request_vcs_api
+from resc_helm_wizard.vcs_instance import VcsInstance
+
+logging.basicConfig(level=logging.INFO)
+
+
+class PageRequest:
+    """
+    A class to represent the request of a single page of a VCS API listing.
+    Attributes
+    ----------
+    vcs_name : str
+        Name of the VCS instance
+    vcs_instance : VcsInstance
+        VCS instance which is crawled
+    kind : str
+        Kind of listing: github_repos, azure_repos, bitbucket_projects or bitbucket_repos
+    scope : str
+        GitHub account, Azure DevOps organization or Bitbucket project of the listing
+    url : str
+        Url of the listing
+    params : dict
+        Query parameters of the page
+    """
+
+    def __init__(
+        self,
+        vcs_name: str,
+        vcs_instance: VcsInstance,
+        kind: str,
+        scope: str,
+        url: str,
+        params: dict,
+    ):
+        self.vcs_name: str = vcs_name
+        self.vcs_instance: VcsInstance = vcs_instance
+        self.kind: str = kind
+        self.scope: str = scope
+        self.url: str = url
+        self.params: dict = params
+
+
+def get_page_cache_file(page_request: PageRequest) -> str:
+    """
+        Get the path of the cached response of a page, the credentials are part of the
+        key because the visible repositories depend on the token
+    :param page_request:
+        object of PageRequest
+    :return: str
+        Returns path of the cache file
+    """
+    key = "\n".join(
+        [
+            get_credential_cache_key(page_request.vcs_instance),
+            page_request.url,
+            json.dumps(page_request.params, sort_keys=True),
+        ]
+    )
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return os.path.join(get_cache_dir(), "inventory", f"{digest}.json")
+
+
+def load_cached_page(cache_file: str) -> dict:
+    """
+        Load a cached page
+    :param cache_file:
+        path of the cache file
+    :return: dict
+        Returns cached page with etag, last_modified, link and body, or None
+    """
+    try:
+        with open(cache_file, "r", encoding="utf-8") as file_in:
+            return json.load(file_in)
+    except (OSError, ValueError):
+        return None
+
+
+def fetch_page(page_request: PageRequest, verify_ssl: bool = True) -> tuple:
+    """
+        Fetch a page of a listing, a cached page is revalidated with its ETag or
+        Last-Modified and only downloaded again when it has changed
+    :param page_request:
+        object of PageRequest
+    :param verify_ssl:
+        verify the SSL certificate of the VCS instance
+    :return: tuple
+        Returns the page with body and link header, and true if the cached page was used
+    :raises requests.RequestException: if the page could not be fetched
+    """
+    cache_file = get_page_cache_file(page_request)
+    cached_page = load_cached_page(cache_file)
+    headers = {}
+    if cached_page and cached_page.get("etag"):
+        headers["If-None-Match"] = cached_page["etag"]
+    if cached_page and cached_page.get("last_modified"):
+        headers["If-Modified-Since"] = cached_page["last_modified"]
+
+    response = request_vcs_api(
+        page_request.vcs_instance,
+        page_request.url,
+        verify_ssl=verify_ssl,
+        params=page_request.params,
+        headers=headers,
+    )
+    if response.status_code == 304 and cached_page:
+        return cached_page, True
+    response.raise_for_status()
+
+    page = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "link": response.headers.get("Link"),
+        "body": response.json(),
+    }
+    if page["etag"] or page["last_modified"]:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        write_file_atomically(cache_file, json.dumps(page, separators=(",", ":")))
+    return page, False
+
+
+def get_initial_page_requests(vcs_name: str, vcs_instance: VcsInstance) -> list:
+    """
+        Get the first page requests of the listings of a VCS instance
+    :param vcs_name:
+        name of the VCS instance
+    :param vcs_instance:
+        object of VcsInstance
+    :return: list
+        Returns list of PageRequest objects, one per GitHub account, the Azure DevOps
+        organization or the Bitbucket projects
+    """
+    api_url = get_api_url(vcs_instance)
+    if vcs_instance.provider_type == "GITHUB_PUBLIC":
+        return [
+            PageRequest(
+                vcs_name,
+                vcs_instance,
+                "github_repos",
+                account,
+                f"{api_url}/users/{account}/repos",
+                {"per_page": constants.INVENTORY_PAGE_SIZE, "page": 1},
+            )
+            for account in vcs_instance.scope
+        ]
+    if vcs_instance.provider_type == "AZURE_DEVOPS":
+        return [
+            PageRequest(
+                vcs_name,
+                vcs_instance,
+                "azure_repos",
+                vcs_instance.organization,
+                f"{api_url}/git/repositories",
+                {"api-version": "7.0"},
+            )
+        ]
+    return [
+        PageRequest(
+            vcs_name,
+            vcs_instance,
+            "bitbucket_projects",
+            None,
+            f"{api_url}/projects",
+            {"limit": constants.INVENTORY_PAGE_SIZE, "start": 0},
+        )
+    ]
+
+
+def get_last_page_number(link_header: str) -> int:
+    """
+        Get the number of the last page from a GitHub Link header
+    :param link_header:
+        value of the Link header
+    :return: int
+        Returns number of the last page, 1 if there is no next page
+    """
+    match = re.search(r'[?&]page=(\d+)[^>]*>;\s*rel="last"', link_header or "")
+    return int(match.group(1)) if match else 1
+
+
+def add_repositories(inventory: dict, page_request: PageRequest, repositories: list):
+    """
+        Add the repositories of a page to the counts, sizes and last push of its scope
+    :param inventory:
+        repository inventory per VCS instance, updated in place
+    :param page_request:
+        object of PageRequest
+    :param repositories:
+        repositories of the page
+    """
+    scopes = inventory[page_request.vcs_name]["scopes"]
+    scope = scopes.setdefault(
+        page_request.scope, {"repositories": 0, "size_bytes": None, "last_push": None}
+    )
+    for repository in repositories:
+        scope["repositories"] += 1
+        if page_request.kind == "github_repos":
+            size_bytes = repository.get("size", 0) * 1024
+            last_push = repository.get("pushed_at")
+        elif page_request.kind == "azure_repos":
+            size_bytes = repository.get("size")
+            last_push = repository.get("project", {}).get("lastUpdateTime")
+        else:
+            size_bytes, last_push = None, None
+        if size_bytes is not None:
+            scope["size_bytes"] = (scope["size_bytes"] or 0) + size_bytes
+        if last_push and (scope["last_push"] is None or last_push > scope["last_push"]):
+            scope["last_push"] = last_push
+
+
+def handle_page(inventory: dict, page_request: PageRequest, page: dict) -> list:
+    """
+        Add a fetched page to the inventory and get the page requests it leads to
+    :param inventory:
+        repository inventory per VCS instance, updated in place
+    :param page_request:
+        object of PageRequest
+    :param page:
+        fetched page with body and link header
+    :return: list
+        Returns list of PageRequest objects of the following pages
+    """
+    body = page["body"]
+    next_requests = []
+    if page_request.kind == "github_repos":
+        add_repositories(inventory, page_request, body)
+        # All pages are known from the first page, so they are fetched concurrently
+        if page_request.params["page"] == 1:
+            for page_number in range(2, get_last_page_number(page["link"]) + 1):
+                next_requests.append(
+                    PageRequest(
+                        page_request.vcs_name,
+                        page_request.vcs_instance,
+                        page_request.kind,
+                        page_request.scope,
+                        page_request.url,
+                        {**page_request.params, "page": page_number},
+                    )
+                )
+    elif page_request.kind == "azure_repos":
+        add_repositories(inventory, page_request, body.get("value", []))
+    else:
+        if page_request.kind == "bitbucket_projects":
+            for project in body.get("values", []):
+                next_requests.append(
+                    PageRequest(
+                        page_request.vcs_name,
+                        page_request.vcs_instance,
+                        "bitbucket_repos",
+                        project["key"],
+                        f"{page_request.url}/{project['key']}/repos",
+                        {"limit": constants.INVENTORY_PAGE_SIZE, "start": 0},
+                    )
+                )
+        else:
+            add_repositories(inventory, page_request, body.get("values", []))
+        if not body.get("isLastPage", True):
+            next_requests.append(
+                PageRequest(
+                    page_request.vcs_name,
+                    page_request.vcs_instance,
+                    page_request.kind,
+                    page_request.scope,
+                    page_request.url,
+                    {**page_request.params, "start": body.get("nextPageStart")},
+                )
+            )
+    return next_requests
+
+
+def summarize_vcs_instance(vcs_inventory: dict):
+    """
+        Add the totals of all scopes to the inventory of a VCS instance
+    :param vcs_inventory:
+        inventory of a VCS instance, updated in place
+    """
+    scopes = vcs_inventory["scopes"].values()
+    sizes = [scope["size_bytes"] for scope in scopes if scope["size_bytes"] is not None]
+    last_pushes = [scope["last_push"] for scope in scopes if scope["last_push"]]
+    vcs_inventory["repositories"] = sum(scope["repositories"] for scope in scopes)
+    vcs_inventory["size_bytes"] = sum(sizes) if sizes else None
+    vcs_inventory["last_push"] = max(last_pushes) if last_pushes else None
+
+
+def log_inventory_summary(inventory: dict, pages: int, not_modified: int):
+    """
+        Log a summary table of the repository inventory
+    :param inventory:
+        repository inventory per VCS instance
+    :param pages:
+        number of fetched pages
+    :param not_modified:
+        number of pages which were served from the cache after revalidation
+    """
+    lines = [
+        f"{'VCS INSTANCE':<30}  {'SCOPES':>6}  {'REPOSITORIES':>12}  "
+        f"{'SIZE (MB)':>10}  LAST PUSH"
+    ]
+    for name, vcs_inventory in inventory.items():
+        size = vcs_inventory["size_bytes"]
+        size = f"{size / 1024 / 1024:.0f}" if size is not None else "-"
+        lines.append(
+            f"{name:<30}  {len(vcs_inventory['scopes']):>6}  "
+            f"{vcs_inventory['repositories']:>12}  {size:>10}  "
+            f"{vcs_inventory['last_push'] or '-'}"
+        )
+    summary = "\n".join(lines)
+    logging.info(
+        f"Repository inventory, {pages} pages fetched of which {not_modified} "
+        f"were not modified:\n{summary}"
+    )
+
+
+def create_inventory(vcs_instances: List[VcsInstance]) -> tuple:
+    """
+        Create an empty repository inventory and the first page requests of all VCS instances
+    :param vcs_instances:
+        list of VCS instances
+    :return: tuple
+        Returns repository inventory per VCS instance and list of PageRequest objects
+    """
+    inventory = {}
+    page_requests = []
+    for vcs_instance, name in zip(vcs_instances, get_vcs_instance_names(vcs_instances)):
+        inventory[name] = {
+            "provider_type": vcs_instance.provider_type,
+            "host": vcs_instance.host,
+            "scopes": {},
+        }
+        page_requests.extend(get_initial_page_requests(name, vcs_instance))
+    return inventory, page_requests
+
+
+def process_page(
+    future, page_request: PageRequest, inventory: dict, stats: dict
+) -> list:
+    """
+        Process the result of a page request
+    :param future:
+        completed future of fetch_page
+    :param page_request:
+        object of PageRequest
+    :param inventory:
+        repository inventory per VCS instance, updated in place
+    :param stats:
+        number of pages, pages which were not modified and errors, updated in place
+    :return: list
+        Returns list of PageRequest objects of the following pages
+    """
+    # Third Party
+    import requests
+
+    try:
+        page, cached = future.result()
+    except (requests.RequestException, ValueError) as error:
+        stats["errors"].append(
+            f"{page_request.vcs_name} {page_request.scope or ''}: {error}"
+        )
+        return []
+    stats["pages"] += 1
+    stats["not_modified"] += cached
+    return handle_page(inventory, page_request, page)
+
+
+@timed_phase("repository_inventory")
+def crawl_repository_inventory(
+    vcs_instances: List[VcsInstance], verify_ssl: bool = True
+) -> tuple:
+    """
+        Crawl the repositories of all VCS instances with concurrent paginated API requests,
+        the following pages of a listing are requested as soon as they are known
+    :param vcs_instances:
+        list of VCS instances
+    :param verify_ssl:
+        verify the SSL certificates of the VCS instances
+    :return: tuple
+        Returns repository inventory per VCS instance and list of errors
+    """
+    inventory, page_requests = create_inventory(vcs_instances)
+    stats = {"pages": 0, "not_modified": 0, "errors": []}
+    with ThreadPoolExecutor(max_workers=constants.VCS_API_MAX_WORKERS) as executor:
+        pending = {
+            executor.submit(fetch_page, page_request, verify_ssl): page_request
+            for page_request in page_requests
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                page_request = pending.pop(future)
+                for next_request in process_page(
+                    future, page_request, inventory, stats
+                ):
+                    pending[executor.submit(fetch_page, next_request, verify_ssl)] = (
+                        next_request
+                    )
+
+    for vcs_inventory in inventory.values():
+        summarize_vcs_instance(vcs_inventory)
+    log_inventory_summary(inventory, stats["pages"], stats["not_modified"])
+    return inventory, stats["errors"]
+
+
+def write_repository_inventory(
+    vcs_instances: List[VcsInstance],
+    inventory_file: str = constants.INVENTORY_FILE,
+    verify_ssl: bool = True,
+) -> bool:
+    """
+        Crawl the repositories of all VCS instances and write a compact JSON inventory with
+        the repository count, size and last push per VCS instance and scope
+    :param vcs_instances:
+        list of VCS instances
+    :param inventory_file:
+        path of the JSON inventory file
+    :param verify_ssl:
+        verify the SSL certificates of the VCS instances
+    :return: bool
+        Returns true if all scopes were crawled else returns false
+    """
+    inventory, errors = crawl_repository_inventory(
+        vcs_instances=vcs_instances, verify_ssl=verify_ssl
+    )
+    report = {"generated_at": int(time.time()), "vcs_instances": inventory}
+    write_file_atomically(inventory_file, json.dumps(report, separators=(",", ":")))
+    logging.info(f"Repository inventory has been written to {inventory_file}")
+    for error in errors:
+        logging.error(f"Unable to crawl {error}")
+    return not errors
@@ -0,0 +1,150 @@
+# Standard Library
+import hashlib
+import json
+import logging
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.helm_utilities import (
+    get_release_manifest,
+    render_release_manifest,
+)
+from resc_helm_wizard.timing import timed_phase
+
+logging.basicConfig(level=logging.INFO)
+
+CHECKSUM_PREFIX = "checksum/"
+
+
+def get_values_checksum(values) -> str:
+    """
+        Compute the checksum of helm values
+    :param values:
+        helm values
+    :return: str
+        Returns SHA-256 checksum of the values
+    """
+    content = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def get_global_checksums(values_dict: dict) -> dict:
+    """
+        Compute the checksums of the configmaps and secrets used by pods of another chart,
+        from the values they are rendered from
+    :param values_dict:
+        helm values of the deployment
+    :return: dict
+        Returns checksums for the global.checksums value
+    """
+    checksums = {}
+    for key, path in constants.CHECKSUM_VALUES.items():
+        values = values_dict
+        for name in path:
+            values = values.get(name) if isinstance(values, dict) else None
+        if values is not None:
+            checksums[key] = get_values_checksum(values)
+    return checksums
+
+
+def get_pod_templates(manifest: str) -> dict:
+    """
+        Get the pod templates of the workloads in a helm manifest
+    :param manifest:
+        multi document helm manifest
+    :return: dict
+        Returns pod template by workload, e.g. Deployment resc-redis
+    """
+    # Third Party
+    import yaml
+
+    pod_templates = {}
+    for document in yaml.safe_load_all(manifest or ""):
+        if not isinstance(document, dict):
+            continue
+        if document.get("kind") in constants.RESTART_WORKLOAD_KINDS:
+            workload = f"{document['kind']} {document['metadata']['name']}"
+            pod_templates[workload] = document.get("spec", {}).get("template", {})
+    return pod_templates
+
+
+def get_restart_reason(deployed: dict, rendered: dict) -> str:
+    """
+        Explain why the pods of a workload roll
+    :param deployed:
+        deployed pod template
+    :param rendered:
+        rendered pod template
+    :return: str
+        Returns reason, None if the pods do not roll
+    """
+    if deployed == rendered:
+        return None
+    deployed_annotations = deployed.get("metadata", {}).get("annotations") or {}
+    rendered_annotations = rendered.get("metadata", {}).get("annotations") or {}
+    changed_inputs = sorted(
+        key.removeprefix(CHECKSUM_PREFIX)
+        for key in set(deployed_annotations) | set(rendered_annotations)
+        if key.startswith(CHECKSUM_PREFIX)
+        and deployed_annotations.get(key) != rendered_annotations.get(key)
+    )
+    reasons = [f"{', '.join(changed_inputs)} changed"] if changed_inputs else []
+    if deployed.get("spec") != rendered.get("spec"):
+        reasons.append("pod spec changed")
+    return "; ".join(reasons) or "pod metadata changed"
+
+
+def get_restarting_workloads(deployed_manifest: str, rendered_manifest: str) -> dict:
+    """
+        Compare the pod templates of the deployed and rendered release, the pods of a
+        workload roll when its pod template changes
+    :param deployed_manifest:
+        manifest of the deployed release
+    :param rendered_manifest:
+        manifest of the release to deploy
+    :return: dict
+        Returns reason by workload, for new and restarting workloads
+    """
+    deployed = get_pod_templates(deployed_manifest)
+    restarting = {}
+    for workload, pod_template in get_pod_templates(rendered_manifest).items():
+        if workload not in deployed:
+            restarting[workload] = "new"
+            continue
+        reason = get_restart_reason(deployed[workload], pod_template)
+        if reason:
+            restarting[workload] = reason
+    return restarting
+
+
+@timed_phase("restart_report")
+def report_restarts(
+    kube_context: str = None, values_file: str = constants.VALUES_FILE
+) -> dict:
+    """
+        Log which components restart when the release is upgraded
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :param values_file:
+        path of the helm values yaml file
+    :return: dict
+        Returns reason by restarting workload, None if the release could not be compared
+    """
+    deployed_manifest = get_release_manifest(kube_context=kube_context)
+    rendered_manifest = render_release_manifest(
+        kube_context=kube_context, values_file=values_file
+    )
+    if deployed_manifest is None or rendered_manifest is None:
+        logging.warning(
+            "Unable to compare the release with the deployed release, "
+            "restarting components are unknown"
+        )
+        return None
+    restarting = get_restarting_workloads(deployed_manifest, rendered_manifest)
+    if not restarting:
+        logging.info("No component restarts with the upgrade")
+        return restarting
+    lines = [f"  {workload}: {reason}" for workload, reason in restarting.items()]
+    summary = "\n".join(lines)
+    logging.info(f"Components restarting with the upgrade:\n{summary}")
+    return restarting
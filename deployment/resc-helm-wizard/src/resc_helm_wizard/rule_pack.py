@@ -0,0 +1,685 @@
+# Standard Library
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import TYPE_CHECKING, List
+
+# First Party
+from resc_helm_wizard import constants
+
+if TYPE_CHECKING:
+    # Third Party
+    import requests
+
+logging.basicConfig(level=logging.INFO)
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+_INDEX_LOCK = threading.Lock()
+
+
+def get_cache_dir() -> str:
+    """
+        Get the directory of the rule pack cache, can be overridden with RESC_WIZARD_CACHE_DIR
+    :return: str
+        Returns path of the cache directory
+    """
+    return os.environ.get(
+        f"{constants.ENV_PREFIX}CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "resc-helm-wizard"),
+    )
+
+
+def get_cache_ttl() -> int:
+    """
+        Get the number of seconds a cached rule pack is served without revalidation,
+        can be overridden with RESC_WIZARD_RULE_PACK_CACHE_TTL
+    :return: int
+        Returns cache ttl in seconds
+    """
+    cache_ttl = os.environ.get(
+        f"{constants.ENV_PREFIX}RULE_PACK_CACHE_TTL", constants.RULE_PACK_CACHE_TTL
+    )
+    try:
+        return int(cache_ttl)
+    except ValueError:
+        logging.error(
+            f"Aborting the program! Invalid value for "
+            f"{constants.ENV_PREFIX}RULE_PACK_CACHE_TTL: {cache_ttl} is not a whole "
+            f"number of seconds"
+        )
+        sys.exit(1)
+
+
+def is_offline() -> bool:
+    """
+        Check if offline mode is enabled with RESC_WIZARD_OFFLINE
+    :return: bool
+        Returns true if only the cached rule pack may be used
+    """
+    offline = os.environ.get(f"{constants.ENV_PREFIX}OFFLINE", "false")
+    return offline.strip().lower() in ("true", "yes", "y", "1")
+
+
+def load_cache_index(cache_dir: str) -> dict:
+    """
+        Load the cache index which maps urls to the SHA-256 of their content
+    :param cache_dir:
+        path of the cache directory
+    :return: dict
+        Returns cache index
+    """
+    index_file = os.path.join(cache_dir, "index.json")
+    if not os.path.isfile(index_file):
+        return {}
+    try:
+        with open(index_file, "r", encoding="utf-8") as file_in:
+            return json.load(file_in)
+    except (OSError, ValueError):
+        logging.warning(f"Ignoring unreadable rule pack cache index {index_file}")
+        return {}
+
+
+def save_cache_index(cache_dir: str, index: dict):
+    """
+        Atomically write the cache index
+    :param cache_dir:
+        path of the cache directory
+    :param index:
+        cache index
+    """
+    index_file = os.path.join(cache_dir, "index.json")
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(f"{index_file}.tmp", "w", encoding="utf-8") as file_out:
+        json.dump(index, file_out, indent=2)
+    os.replace(f"{index_file}.tmp", index_file)
+
+
+def get_object_path(cache_dir: str, sha256: str) -> str:
+    """
+        Get the path of a content addressed object in the cache
+    :param cache_dir:
+        path of the cache directory
+    :param sha256:
+        SHA-256 hex digest of the content
+    :return: str
+        Returns path of the cached object
+    """
+    return os.path.join(cache_dir, "objects", sha256)
+
+
+def get_file_sha256(file_path: str) -> str:
+    """
+        Calculate the SHA-256 of a file
+    :param file_path:
+        path of the file
+    :return: str
+        Returns SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_in:
+        for chunk in iter(lambda: file_in.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_cached_entry(cache_dir: str, index: dict, url: str) -> dict:
+    """
+        Get the cache entry of a url if its object is present and intact
+    :param cache_dir:
+        path of the cache directory
+    :param index:
+        cache index
+    :param url:
+        url of the rule pack
+    :return: dict
+        Returns cache entry or None
+    """
+    entry = index.get(url)
+    if not entry:
+        return None
+    object_path = get_object_path(cache_dir, entry["sha256"])
+    if (
+        not os.path.isfile(object_path)
+        or get_file_sha256(object_path) != entry["sha256"]
+    ):
+        logging.warning(f"Cached rule pack of {url} is missing or corrupt, ignoring it")
+        return None
+    return entry
+
+
+def get_expected_sha256() -> str:
+    """
+        Get the expected SHA-256 of the rule pack from RESC_WIZARD_RULE_PACK_SHA256
+    :return: str
+        Returns expected SHA-256 hex digest or None if the checksum should not be verified
+    """
+    expected_sha256 = os.environ.get(f"{constants.ENV_PREFIX}RULE_PACK_SHA256")
+    return expected_sha256.strip().lower() if expected_sha256 else None
+
+
+def store_object(cache_dir: str, file_path: str) -> str:
+    """
+        Move a downloaded file into the cache under its SHA-256
+    :param cache_dir:
+        path of the cache directory
+    :param file_path:
+        path of the downloaded file
+    :return: str
+        Returns SHA-256 hex digest of the content
+    """
+    sha256 = get_file_sha256(file_path)
+    object_path = get_object_path(cache_dir, sha256)
+    os.makedirs(os.path.dirname(object_path), exist_ok=True)
+    os.replace(file_path, object_path)
+    return sha256
+
+
+def load_partial_download_info(partial_path: str) -> dict:
+    """
+        Load the validators of an interrupted download, used to resume it safely
+    :param partial_path:
+        path of the partially downloaded file
+    :return: dict
+        Returns etag and last_modified of the partial download
+    """
+    try:
+        with open(f"{partial_path}.json", "r", encoding="utf-8") as file_in:
+            return json.load(file_in)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_partial_download_info(partial_path: str, headers: dict):
+    """
+        Save the validators of the response which is being downloaded
+    :param partial_path:
+        path of the partially downloaded file
+    :param headers:
+        response headers
+    """
+    with open(f"{partial_path}.json", "w", encoding="utf-8") as file_out:
+        json.dump(
+            {
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+            },
+            file_out,
+        )
+
+
+def remove_partial_download(partial_path: str):
+    """
+        Remove a partially downloaded file and its validators
+    :param partial_path:
+        path of the partially downloaded file
+    """
+    for path in (partial_path, f"{partial_path}.json"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def get_expected_size(response) -> int:
+    """
+        Get the total size of the rule pack from Content-Range or Content-Length
+    :param response:
+        response of the download request
+    :return: int
+        Returns expected size in bytes or None if unknown
+    """
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[1])
+    if response.status_code == 200 and response.headers.get("Content-Length"):
+        return int(response.headers["Content-Length"])
+    return None
+
+
+def get_resume_headers(partial_path: str, headers: dict) -> tuple:
+    """
+        Get the request headers to resume a partial download with an HTTP Range request.
+        The body is requested without content encoding, as the Range offset and the
+        Content-Length count the bytes sent by the server, not the decoded bytes.
+    :param partial_path:
+        path of the partially downloaded file
+    :param headers:
+        conditional request headers of the cached copy
+    :return: tuple
+        Returns request headers and the offset to resume from, offset is 0 for a new download
+    """
+    offset = os.path.getsize(partial_path) if os.path.isfile(partial_path) else 0
+    partial_info = load_partial_download_info(partial_path)
+    validator = partial_info.get("etag") or partial_info.get("last_modified")
+    request_headers = {"Accept-Encoding": "identity"}
+    if offset and validator:
+        request_headers.update({"Range": f"bytes={offset}-", "If-Range": validator})
+        return request_headers, offset
+    request_headers.update(headers)
+    return request_headers, 0
+
+
+def write_response_to_file(
+    response, partial_path: str, offset: int, cancel_event: threading.Event = None
+):
+    """
+        Stream the body of a response into the partial file in chunks
+    :param response:
+        response of the download request, with status 200 or 206
+    :param partial_path:
+        path of the partially downloaded file
+    :param offset:
+        offset the response starts at, ignored when the server sent the full body
+    :param cancel_event:
+        event which stops the download when set, optional
+    """
+    if response.status_code == 200:
+        offset = 0
+        save_partial_download_info(partial_path, response.headers)
+    with open(partial_path, "ab" if offset else "wb") as file_out:
+        for chunk in response.iter_content(chunk_size=constants.RULE_PACK_CHUNK_SIZE):
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            file_out.write(chunk)
+
+
+def is_local_file(url: str) -> bool:
+    """
+        Check if a rule pack mirror is a local file path instead of an HTTP url
+    :param url:
+        url or path of the mirror
+    :return: bool
+        Returns true if the mirror is a local file
+    """
+    return not url.startswith(("http://", "https://"))
+
+
+def get_session() -> "requests.Session":
+    """
+        Get the HTTP session shared by all rule pack downloads, so connections are pooled
+    :return: requests.Session
+        Returns HTTP session
+    """
+    # Third Party
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    global _SESSION  # pylint: disable=global-statement
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=constants.RULE_PACK_MAX_MIRRORS,
+                pool_maxsize=constants.RULE_PACK_MAX_MIRRORS,
+            )
+            _SESSION.mount("https://", adapter)
+            _SESSION.mount("http://", adapter)
+    return _SESSION
+
+
+def copy_local_rule_pack(url: str, partial_path: str) -> tuple:
+    """
+        Copy a rule pack from a local file mirror into the partial file
+    :param url:
+        path of the local rule pack file, optionally prefixed with file://
+    :param partial_path:
+        path of the partially downloaded file
+    :return: tuple
+        Returns status code 200 and empty headers, status code is None when the file
+        could not be read
+    """
+    try:
+        shutil.copyfile(url.removeprefix("file://"), partial_path)
+    except OSError as error:
+        logging.warning(f"Unable to read the rule pack from {url}: {error}")
+        return None, {}
+    return 200, {}
+
+
+def download_rule_pack(
+    url: str,
+    verify_ssl: bool,
+    partial_path: str,
+    headers: dict,
+    cancel_event: threading.Event = None,
+) -> tuple:
+    """
+        Stream the rule pack into a partial file in chunks. Interrupted downloads are
+        retried with exponential backoff and resumed with an HTTP Range request.
+    :param url:
+        url of the rule pack
+    :param verify_ssl:
+        verify SSL certificates for HTTPS requests
+    :param partial_path:
+        path of the partially downloaded file
+    :param headers:
+        conditional request headers of the cached copy
+    :param cancel_event:
+        event which stops the download when set, optional
+    :return: tuple
+        Returns status code and headers of the last response, status code is None when
+        the download failed. On status code 200 the rule pack is in the partial file.
+    """
+    # Third Party
+    import requests
+
+    cancel_event = cancel_event or threading.Event()
+    response_headers = {}
+    for attempt in range(constants.RULE_PACK_DOWNLOAD_RETRIES + 1):
+        if attempt:
+            backoff = constants.RULE_PACK_RETRY_BACKOFF * 2 ** (attempt - 1)
+            logging.info(f"Retrying rule pack download in {backoff:.1f}s...")
+            # A cancelled download stops waiting at once
+            cancel_event.wait(backoff)
+        if cancel_event.is_set():
+            return None, response_headers
+
+        request_headers, offset = get_resume_headers(partial_path, headers)
+        try:
+            response = get_session().get(
+                url,
+                timeout=constants.RULE_PACK_DOWNLOAD_TIMEOUT,
+                verify=verify_ssl,
+                headers=request_headers,
+                stream=True,
+            )
+            try:
+                response_headers = response.headers
+                if response.status_code == 304:
+                    return 304, response_headers
+                if response.status_code == 416:
+                    logging.warning(
+                        "Unable to resume the rule pack download, restarting"
+                    )
+                    remove_partial_download(partial_path)
+                    continue
+                if response.status_code >= 500 or response.status_code == 429:
+                    logging.warning(
+                        f"Rule pack download failed with {response.status_code}"
+                    )
+                    continue
+                if response.status_code not in (200, 206):
+                    logging.error(
+                        f"Rule pack download failed with {response.status_code}"
+                    )
+                    return None, response_headers
+                write_response_to_file(response, partial_path, offset, cancel_event)
+            finally:
+                response.close()
+        except requests.RequestException as error:
+            logging.warning(f"Rule pack download from {url} was interrupted: {error}")
+            continue
+
+        if cancel_event.is_set():
+            return None, response_headers
+        expected_size = get_expected_size(response)
+        if expected_size is not None and os.path.getsize(partial_path) < expected_size:
+            logging.warning("Rule pack download ended early, resuming")
+            continue
+        return 200, response_headers
+
+    logging.error(
+        f"Unable to download the rule pack from {url} "
+        f"after {constants.RULE_PACK_DOWNLOAD_RETRIES + 1} attempts"
+    )
+    return None, response_headers
+
+
+def get_cached_rule_pack(url: str, expected_sha256: str = None, max_age: float = None):
+    """
+        Get the cached rule pack of a url
+    :param url:
+        url of the rule pack
+    :param expected_sha256:
+        expected SHA-256 of the rule pack, optional
+    :param max_age:
+        maximum age of the cached copy in seconds, any age is accepted when not provided
+    :return: str
+        Returns path of the cached rule pack or None if no matching copy is cached
+    """
+    cache_dir = get_cache_dir()
+    entry = get_cached_entry(cache_dir, load_cache_index(cache_dir), url)
+    if not entry or (expected_sha256 and entry["sha256"] != expected_sha256):
+        return None
+    if max_age is not None and time.time() - entry["fetched_at"] >= max_age:
+        return None
+    return get_object_path(cache_dir, entry["sha256"])
+
+
+def update_cache_index(cache_dir: str, url: str, entry: dict):
+    """
+        Record the cache entry of a url, safe to call from concurrent downloads
+    :param cache_dir:
+        path of the cache directory
+    :param url:
+        url of the rule pack
+    :param entry:
+        cache entry
+    """
+    with _INDEX_LOCK:
+        index = load_cache_index(cache_dir)
+        index[url] = entry
+        save_cache_index(cache_dir, index)
+
+
+def fetch_rule_pack(
+    url: str,
+    verify_ssl: bool,
+    expected_sha256: str = None,
+    serve_stale: bool = True,
+    cancel_event: threading.Event = None,
+) -> str:
+    """
+        Get the rule pack of a url through the on-disk cache. A cached copy younger than the
+        ttl is served without any request, an older copy is revalidated with a conditional
+        GET and served when the server is unreachable or when running in offline mode.
+    :param url:
+        url of the rule pack, or path of a local rule pack file
+    :param verify_ssl:
+        verify SSL certificates for HTTPS requests
+    :param expected_sha256:
+        expected SHA-256 of the rule pack, defaults to RESC_WIZARD_RULE_PACK_SHA256
+    :param serve_stale:
+        serve an outdated cached copy when the rule pack could not be downloaded
+    :param cancel_event:
+        event which stops the download when set, optional
+    :return: str
+        Returns path of the cached rule pack or None if it could not be fetched
+    """
+    expected_sha256 = expected_sha256 or get_expected_sha256()
+    cache_dir = get_cache_dir()
+    entry = get_cached_entry(cache_dir, load_cache_index(cache_dir), url)
+    if entry and expected_sha256 and entry["sha256"] != expected_sha256:
+        logging.info("Cached rule pack does not match the expected checksum")
+        entry = None
+
+    if entry and (is_offline() or time.time() - entry["fetched_at"] < get_cache_ttl()):
+        logging.info(f"Using cached rule pack {entry['sha256']}, skipping download")
+        return get_object_path(cache_dir, entry["sha256"])
+    if is_offline():
+        logging.error(f"Offline mode, but no cached rule pack was found for {url}")
+        return None
+
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    partial_path = os.path.join(
+        cache_dir, "partial", hashlib.sha256(url.encode("utf-8")).hexdigest()
+    )
+    os.makedirs(os.path.dirname(partial_path), exist_ok=True)
+    if is_local_file(url):
+        status_code, response_headers = copy_local_rule_pack(url, partial_path)
+    else:
+        status_code, response_headers = download_rule_pack(
+            url=url,
+            verify_ssl=verify_ssl,
+            partial_path=partial_path,
+            headers=headers,
+            cancel_event=cancel_event,
+        )
+
+    if status_code == 304 and entry:
+        logging.info(f"Rule pack {entry['sha256']} has not changed, using cached copy")
+    elif status_code == 200:
+        sha256 = get_file_sha256(partial_path)
+        if expected_sha256 and sha256 != expected_sha256:
+            logging.error(
+                f"Checksum mismatch for rule pack from {url}: "
+                f"expected {expected_sha256}, got {sha256}"
+            )
+            remove_partial_download(partial_path)
+            return None
+        entry = {
+            "sha256": store_object(cache_dir, partial_path),
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+        }
+        remove_partial_download(partial_path)
+        logging.debug(f"Rule pack {entry['sha256']} downloaded from {url}")
+    elif entry and serve_stale:
+        logging.warning(f"Serving cached rule pack {entry['sha256']} for {url}")
+        return get_object_path(cache_dir, entry["sha256"])
+    else:
+        return None
+
+    entry["fetched_at"] = time.time()
+    update_cache_index(cache_dir, url, entry)
+    return get_object_path(cache_dir, entry["sha256"])
+
+
+def get_rule_file_urls() -> List[str]:
+    """
+        Get the ordered list of rule pack mirrors, can be overridden with a comma separated
+        list of urls and local file paths in RESC_WIZARD_RULE_FILE_URLS
+    :return: List[str]
+        Returns list of rule pack mirrors
+    """
+    urls = os.environ.get(f"{constants.ENV_PREFIX}RULE_FILE_URLS")
+    if urls:
+        return [url.strip() for url in urls.split(",") if url.strip()]
+    return list(constants.RULE_FILE_URLS)
+
+
+def submit_daemon_download(**kwargs) -> Future:
+    """
+        Fetch a rule pack in a daemon thread, a losing download stuck in a connect
+        does not keep the interpreter from exiting
+    :param kwargs:
+        keyword arguments of fetch_rule_pack
+    :return: Future
+        Returns future of the path of the cached rule pack
+    """
+    future = Future()
+
+    def run():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fetch_rule_pack(**kwargs))
+        except BaseException as error:  # pylint: disable=broad-exception-caught
+            future.set_exception(error)
+
+    threading.Thread(target=run, name="rule-pack-download", daemon=True).start()
+    return future
+
+
+def wait_for_winner(pending: set, mirrors: dict, timeout: float = None) -> tuple:
+    """
+        Wait until a mirror download finishes
+    :param pending:
+        set of running mirror downloads
+    :param mirrors:
+        dictionary mapping the download futures to their mirror
+    :param timeout:
+        maximum number of seconds to wait, waits until the first download finished when not provided
+    :return: tuple
+        Returns the winning future, or None if no download succeeded, and the still running futures
+    """
+    done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+    for future in done:
+        if future.exception() is not None:
+            logging.warning(
+                f"Rule pack download from {mirrors[future]} failed: {future.exception()}"
+            )
+        elif future.result():
+            return future, pending
+    return None, pending
+
+
+def fetch_rule_pack_from_mirrors(
+    urls: List[str], verify_ssl: bool, expected_sha256: str = None
+) -> str:
+    """
+        Race the rule pack download across an ordered list of mirrors. The next mirror is
+        started when the previous ones have not finished within the hedge delay or failed,
+        the first valid download wins and the other downloads are cancelled. At most
+        RULE_PACK_MAX_MIRRORS downloads run at once, the next mirror waits for one of
+        them to fail.
+    :param urls:
+        ordered list of rule pack urls and local file paths
+    :param verify_ssl:
+        verify SSL certificates for HTTPS requests
+    :param expected_sha256:
+        expected SHA-256 of the rule pack, defaults to RESC_WIZARD_RULE_PACK_SHA256
+    :return: str
+        Returns path of the cached rule pack or None if it could not be fetched
+    """
+    expected_sha256 = expected_sha256 or get_expected_sha256()
+    max_age = None if is_offline() else get_cache_ttl()
+    for url in urls:
+        rule_pack_path = get_cached_rule_pack(url, expected_sha256, max_age)
+        if rule_pack_path:
+            logging.info(f"Using cached rule pack of {url}, skipping download")
+            return rule_pack_path
+    if is_offline():
+        logging.error("Offline mode, but no cached rule pack was found")
+        return None
+
+    start_time = time.monotonic()
+    cancel_event = threading.Event()
+    mirrors, pending, winner = {}, set(), None
+    for url in urls:
+        while winner is None and len(pending) >= constants.RULE_PACK_MAX_MIRRORS:
+            winner, pending = wait_for_winner(pending, mirrors)
+        if winner:
+            break
+        future = submit_daemon_download(
+            url=url,
+            verify_ssl=verify_ssl,
+            expected_sha256=expected_sha256,
+            serve_stale=False,
+            cancel_event=cancel_event,
+        )
+        mirrors[future] = url
+        pending.add(future)
+        winner, pending = wait_for_winner(
+            pending, mirrors, timeout=constants.RULE_PACK_HEDGE_DELAY
+        )
+        if winner:
+            break
+    while winner is None and pending:
+        winner, pending = wait_for_winner(pending, mirrors)
+    # Losing downloads stop at their next chunk or backoff, there is no need to wait
+    # for them
+    cancel_event.set()
+
+    if winner:
+        logging.info(
+            f"Rule pack downloaded from mirror {mirrors[winner]} "
+            f"in {time.monotonic() - start_time:.1f}s"
+        )
+        return winner.result()
+
+    for url in urls:
+        rule_pack_path = get_cached_rule_pack(url, expected_sha256)
+        if rule_pack_path:
+            logging.warning(f"All mirrors failed, serving cached rule pack of {url}")
+            return rule_pack_path
+    return None
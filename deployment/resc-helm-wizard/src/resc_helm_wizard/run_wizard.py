@@ -1,46 +1,124 @@
 # Standard Library
+import argparse
 import logging
 import sys
 
 # First Party
-from resc_helm_wizard import common, questions
+from resc_helm_wizard import (
+    answers,
+    autoscaling,
+    capacity,
+    common,
+    constants,
+    credentials,
+    database_tuning,
+    fleet,
+    profiling,
+    questions,
+    repository_inventory,
+    sizing,
+    timing,
+    vcs_inventory,
+)
 from resc_helm_wizard.helm_value import HelmValue
 
 
-def prompt_questions():
+def prompt_questions(
+    vcs_inventory_file: str = None,
+    verify_credentials: bool = False,
+    scan_window_hours: float = None,
+    capacity_inventory_file: str = None,
+    scanner_autoscaling: list = None,
+    scrape_window_hours: float = None,
+    web_service_settings: dict = None,
+    expected_findings: int = None,
+    queue_depth: int = None,
+):
     """
         prompt set of questions to user in order to generate values yaml file for helm deployment of RESC
+    :param vcs_inventory_file:
+        path of a CSV, YAML or JSON VCS inventory file, replaces the VCS instance questions
+    :param verify_credentials:
+        verify the credentials of the VCS instances against their APIs
+    :param scan_window_hours:
+        size the deployment to scan all repositories within this number of hours, optional
+    :param capacity_inventory_file:
+        repository inventory used for the capacity plan, the VCS APIs are crawled when not provided
+    :param scanner_autoscaling:
+        minimum and maximum number of scanner replicas scaled on the queue depth,
+        asked when not provided
+    :param scrape_window_hours:
+        spread the projects scrapers of the VCS instances over this number of hours, optional
+    :param web_service_settings:
+        request_rate and cpu_cores to size the web service, optional
+    :param expected_findings:
+        tune the database for this number of findings, optional
+    :param queue_depth:
+        plan the RabbitMQ throughput profile for this number of queued repositories, optional
     :raises KeyboardInterrupt: if there is any keyboard interruption from user
     """
     try:
-        os_input = questions.ask_operating_system()
-        if os_input:
-            operating_system = common.get_operating_system(user_input=os_input)
+        operating_system = common.get_operating_system(
+            user_input=questions.ask_operating_system()
+        )
 
         if operating_system:
             storage_path = common.create_storage_for_db_and_rabbitmq(
                 operating_system=operating_system
             )
-            db_storage_path = storage_path["db_storage_path"]
-            rabbitmq_storage_path = storage_path["rabbitmq_storage_path"]
-
             db_password = questions.ask_password_for_database()
 
-            vcs_instances = common.get_vcs_instance_question_answers()
+            if vcs_inventory_file:
+                vcs_instances = vcs_inventory.get_vcs_instances_from_inventory(
+                    inventory_file=vcs_inventory_file
+                )
+            else:
+                vcs_instances = common.get_vcs_instance_question_answers()
+            if verify_credentials:
+                check_vcs_credentials(vcs_instances=vcs_instances, verify_ssl=True)
 
             if (
                 db_password
-                and db_storage_path
-                and rabbitmq_storage_path
+                and storage_path["db_storage_path"]
+                and storage_path["rabbitmq_storage_path"]
                 and vcs_instances
             ):
                 helm_values = HelmValue(
                     operating_system=operating_system,
                     db_password=db_password,
-                    db_storage_path=db_storage_path,
-                    rabbitmq_storage_path=rabbitmq_storage_path,
+                    db_storage_path=storage_path["db_storage_path"],
+                    rabbitmq_storage_path=storage_path["rabbitmq_storage_path"],
                     vcs_instances=vcs_instances,
                 )
+                if scan_window_hours:
+                    helm_values.capacity_plan = sizing.get_capacity_plan(
+                        vcs_instances=vcs_instances,
+                        scan_window_hours=scan_window_hours,
+                        capacity_inventory_file=capacity_inventory_file,
+                    )
+                helm_values.scanner_autoscaling = ask_scanner_autoscaling(
+                    scanner_autoscaling=scanner_autoscaling,
+                    capacity_plan=helm_values.capacity_plan,
+                )
+                if scrape_window_hours:
+                    helm_values.scrape_schedules = sizing.get_scrape_schedules(
+                        vcs_instances=vcs_instances,
+                        settings={"window_hours": scrape_window_hours},
+                        capacity_plan=helm_values.capacity_plan,
+                        capacity_inventory_file=capacity_inventory_file,
+                    )
+                if web_service_settings:
+                    helm_values.web_service = sizing.get_web_service_size(
+                        web_service_settings
+                    )
+                if expected_findings is not None:
+                    helm_values.database_tuning = (
+                        database_tuning.get_database_tuning_settings(
+                            {"expected_findings": expected_findings}
+                        )
+                    )
+                if queue_depth is not None:
+                    helm_values.rabbitmq_profile = {"queue_depth": queue_depth}
 
                 common.create_helm_values_yaml(
                     helm_values=helm_values,
@@ -52,5 +130,385 @@ def prompt_questions():
         sys.exit(-1)
 
 
+def get_autoscaling_settings(scanner_autoscaling: list) -> dict:
+    """
+        Get the autoscaling settings of the --autoscale-scanners option
+    :param scanner_autoscaling:
+        minimum and maximum number of scanner replicas, optional
+    :return: dict
+        Returns min_replicas and max_replicas, empty when not provided
+    """
+    if not scanner_autoscaling:
+        return {}
+    return {
+        "min_replicas": scanner_autoscaling[0],
+        "max_replicas": scanner_autoscaling[1],
+    }
+
+
+def ask_scanner_autoscaling(
+    scanner_autoscaling: list, capacity_plan: capacity.CapacityPlan = None
+) -> autoscaling.ScannerAutoscaling:
+    """
+        Get the scanner autoscaling of the --autoscale-scanners option, asked when not
+        provided and the user opts in
+    :param scanner_autoscaling:
+        minimum and maximum number of scanner replicas, optional
+    :param capacity_plan:
+        object of CapacityPlan, optional
+    :return: ScannerAutoscaling
+        Returns object of ScannerAutoscaling, None if autoscaling is not enabled
+    """
+    settings = get_autoscaling_settings(scanner_autoscaling)
+    if not settings:
+        # The scanners keep their fixed replica count unless the user opts in
+        if not questions.ask_user_confirmation(
+            msg="Do you want to scale the secret scanners on the RabbitMQ queue depth "
+            "instead of running a fixed number of replicas",
+            default=False,
+        ):
+            return None
+        settings = questions.ask_scanner_autoscaling()
+    return autoscaling.get_scanner_autoscaling(
+        settings=settings, capacity_plan=capacity_plan
+    )
+
+
+def get_web_service_settings(request_rate: float, cpu_cores: float) -> dict:
+    """
+        Get the web service settings of the --web-service-rate and --web-service-cpu options
+    :param request_rate:
+        expected number of requests per second, optional
+    :param cpu_cores:
+        CPU available to the web service, optional
+    :return: dict
+        Returns request_rate and cpu_cores when provided
+    """
+    settings = {"request_rate": request_rate, "cpu_cores": cpu_cores}
+    return {key: value for key, value in settings.items() if value is not None}
+
+
+def check_vcs_credentials(vcs_instances: list, verify_ssl: bool):
+    """
+        Abort the program if the credentials of a VCS instance could not be verified
+    :param vcs_instances:
+        list of VCS instances
+    :param verify_ssl:
+        verify the SSL certificates of the VCS instances
+    """
+    if not credentials.verify_vcs_credentials(
+        vcs_instances=vcs_instances, verify_ssl=verify_ssl
+    ):
+        logging.error("Aborting the program! VCS credentials could not be verified")
+        sys.exit(1)
+
+
+def run_non_interactive(
+    answers_file: str = None,
+    vcs_inventory_file: str = None,
+    verify_credentials: bool = False,
+    scan_window_hours: float = None,
+    capacity_inventory_file: str = None,
+    scanner_autoscaling: list = None,
+    scrape_window_hours: float = None,
+    web_service_settings: dict = None,
+    expected_findings: int = None,
+    queue_depth: int = None,
+):
+    """
+        Generate values yaml file and run the deployment without prompting the user,
+        all answers are read from the answers file and RESC_WIZARD_* environment variables
+    :param answers_file:
+        path of the YAML or JSON answers file, optional
+    :param vcs_inventory_file:
+        path of a CSV, YAML or JSON VCS inventory file, optional
+    :param verify_credentials:
+        verify the credentials of the VCS instances against their APIs, can also be
+        enabled with the verify_credentials answer
+    :param scan_window_hours:
+        size the deployment to scan all repositories within this number of hours,
+        overrides the scan_window_hours answer
+    :param capacity_inventory_file:
+        repository inventory used for the capacity plan, overrides the
+        capacity_inventory_file answer
+    :param scanner_autoscaling:
+        minimum and maximum number of scanner replicas scaled on the queue depth,
+        overrides the replicas of the scanner_autoscaling answer
+    :param scrape_window_hours:
+        spread the projects scrapers of the VCS instances over this number of hours,
+        overrides the window_hours of the scrape_schedule answer
+    :param web_service_settings:
+        request_rate and cpu_cores to size the web service, overrides the web_service answer
+    :param expected_findings:
+        tune the database for this number of findings, overrides the expected_findings
+        of the database_tuning answer
+    :param queue_depth:
+        plan the RabbitMQ throughput profile for this number of queued repositories,
+        overrides the queue_depth of the rabbitmq_profile answer
+    """
+    answers_dict = answers.load_answers(answers_file=answers_file)
+    if vcs_inventory_file:
+        answers_dict["vcs_inventory_file"] = vcs_inventory_file
+    if scan_window_hours:
+        answers_dict["scan_window_hours"] = scan_window_hours
+    if capacity_inventory_file:
+        answers_dict["capacity_inventory_file"] = capacity_inventory_file
+    verify_ssl = answers.get_answer(answers_dict, "verify_ssl", default=True)
+    helm_values = answers.get_helm_values_from_answers(answers_dict)
+    if verify_credentials or answers.get_answer(
+        answers_dict, "verify_credentials", default=False
+    ):
+        check_vcs_credentials(
+            vcs_instances=helm_values.vcs_instances, verify_ssl=verify_ssl
+        )
+    sizing.apply_sizing_answers(
+        answers_dict=answers_dict,
+        helm_values=helm_values,
+        option_settings={
+            "scanner_autoscaling": get_autoscaling_settings(scanner_autoscaling),
+            "scrape_schedule": {"window_hours": scrape_window_hours},
+            "web_service": web_service_settings,
+            "database_tuning": {"expected_findings": expected_findings},
+            "rabbitmq_profile": {"queue_depth": queue_depth},
+        },
+    )
+    common.create_helm_values_yaml(
+        helm_values=helm_values,
+        input_values_yaml_file="config/example-values.yaml",
+    )
+    if answers.get_answer(answers_dict, "run_deployment", default=True):
+        # A declined upgrade of an existing release is skipped, not failed
+        if (
+            common.run_deployment(
+                verify_ssl=verify_ssl,
+                upgrade_release=answers.get_answer(
+                    answers_dict, "upgrade_release", default=True
+                ),
+            )
+            == "failed"
+        ):
+            logging.error("Aborting the program! Deployment was not successful")
+            sys.exit(1)
+    else:
+        logging.info("Skipping deployment...")
+
+
+def run_repository_inventory(
+    inventory_file: str, answers_file: str = None, vcs_inventory_file: str = None
+):
+    """
+        Crawl the repositories of the VCS instances in the answers and write the
+        repository inventory, without generating values or deploying
+    :param inventory_file:
+        path of the JSON repository inventory file
+    :param answers_file:
+        path of the YAML or JSON answers file, optional
+    :param vcs_inventory_file:
+        path of a CSV, YAML or JSON VCS inventory file, optional
+    """
+    answers_dict = answers.load_answers(answers_file=answers_file)
+    if vcs_inventory_file:
+        answers_dict["vcs_inventory_file"] = vcs_inventory_file
+    if not repository_inventory.write_repository_inventory(
+        vcs_instances=answers.get_vcs_instances_from_answers(answers_dict),
+        inventory_file=inventory_file,
+        verify_ssl=answers.get_answer(answers_dict, "verify_ssl", default=True),
+    ):
+        logging.error("Aborting the program! Repository inventory is incomplete")
+        sys.exit(1)
+
+
+def parse_arguments(args: list = None) -> argparse.Namespace:
+    """
+        Parse command line arguments of the wizard
+    :param args:
+        list of command line arguments, defaults to sys.argv
+    :return: argparse.Namespace
+        Returns parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog="resc-helm-wizard",
+        description="Generate the values yaml file and run the helm deployment of RESC",
+    )
+    parser.add_argument(
+        "--answers-file",
+        help="YAML or JSON file containing all answers, runs the wizard without any prompt",
+    )
+    parser.add_argument(
+        "--non-interactive",
+        action="store_true",
+        help="run without any prompt using RESC_WIZARD_* environment variables and the answers file",
+    )
+    parser.add_argument(
+        "--fleet-file",
+        help="YAML or JSON file listing kube contexts and their values, deploys all clusters in parallel",
+    )
+    parser.add_argument(
+        "--vcs-inventory",
+        metavar="INVENTORY_FILE",
+        help="CSV, YAML or JSON file listing VCS instances to import in bulk",
+    )
+    parser.add_argument(
+        "--verify-credentials",
+        action="store_true",
+        help="verify the credentials of the VCS instances against their APIs before deploying",
+    )
+    parser.add_argument(
+        "--repository-inventory",
+        nargs="?",
+        const=constants.INVENTORY_FILE,
+        metavar="INVENTORY_FILE",
+        help=f"count the repositories of the VCS instances in the answers and write them "
+        f"to a JSON file instead of deploying, default {constants.INVENTORY_FILE}",
+    )
+    parser.add_argument(
+        "--scan-window",
+        type=float,
+        metavar="HOURS",
+        help="size the scanner replicas, resources, RabbitMQ, Redis and database "
+        "to scan all repositories within this number of hours",
+    )
+    parser.add_argument(
+        "--capacity-inventory",
+        metavar="INVENTORY_FILE",
+        help="repository inventory used by --scan-window, the VCS APIs are crawled when not provided",
+    )
+    parser.add_argument(
+        "--autoscale-scanners",
+        nargs=2,
+        type=int,
+        metavar=("MIN", "MAX"),
+        help="scale the secret scanners between MIN and MAX replicas on the RabbitMQ queue depth with KEDA",
+    )
+    parser.add_argument(
+        "--stagger-scrapes",
+        type=float,
+        metavar="HOURS",
+        help="spread the projects scrapers of the VCS instances over this number of hours",
+    )
+    parser.add_argument(
+        "--web-service-rate",
+        type=float,
+        metavar="REQUESTS_PER_SECOND",
+        help="size the workers and replicas of the web service for this request rate",
+    )
+    parser.add_argument(
+        "--web-service-cpu",
+        type=float,
+        metavar="CORES",
+        help=f"CPU available to the web service, default "
+        f"{constants.WEB_SERVICE_CPU_SHARE:.0%} of the allocatable CPU of the cluster",
+    )
+    parser.add_argument(
+        "--expected-findings",
+        type=int,
+        metavar="FINDINGS",
+        help="tune the database memory, parallelism, tempdb and volume for this number of findings",
+    )
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        metavar="MESSAGES",
+        help="plan lazy queues, memory and disk alarms and the volume of RabbitMQ "
+        "for this number of queued repositories",
+    )
+    parser.add_argument(
+        "--timing-report",
+        help="write the duration of every deployment phase to this JSON file",
+    )
+    parser.add_argument(
+        "--prometheus-textfile",
+        help="write the phase durations to this .prom file for the node exporter textfile collector",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=constants.PROFILE_FILE,
+        metavar="PSTATS_FILE",
+        help=f"profile the wizard and write the statistics to a pstats file, "
+        f"default {constants.PROFILE_FILE}",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=constants.PROFILE_TOP,
+        help="number of functions listed in the profile summary",
+    )
+    return parser.parse_args(args)
+
+
+def run_wizard(arguments: argparse.Namespace):
+    """
+        Run the fleet deployment, repository inventory, non-interactive or interactive wizard
+    :param arguments:
+        parsed command line arguments
+    """
+    if arguments.fleet_file:
+        if not fleet.run_fleet_deployment(fleet_file=arguments.fleet_file):
+            sys.exit(1)
+    elif arguments.repository_inventory:
+        run_repository_inventory(
+            inventory_file=arguments.repository_inventory,
+            answers_file=arguments.answers_file,
+            vcs_inventory_file=arguments.vcs_inventory,
+        )
+    elif arguments.answers_file or arguments.non_interactive:
+        run_non_interactive(
+            answers_file=arguments.answers_file,
+            vcs_inventory_file=arguments.vcs_inventory,
+            verify_credentials=arguments.verify_credentials,
+            scan_window_hours=arguments.scan_window,
+            capacity_inventory_file=arguments.capacity_inventory,
+            scanner_autoscaling=arguments.autoscale_scanners,
+            scrape_window_hours=arguments.stagger_scrapes,
+            web_service_settings=get_web_service_settings(
+                request_rate=arguments.web_service_rate,
+                cpu_cores=arguments.web_service_cpu,
+            ),
+            expected_findings=arguments.expected_findings,
+            queue_depth=arguments.queue_depth,
+        )
+    else:
+        prompt_questions(
+            vcs_inventory_file=arguments.vcs_inventory,
+            verify_credentials=arguments.verify_credentials,
+            scan_window_hours=arguments.scan_window,
+            capacity_inventory_file=arguments.capacity_inventory,
+            scanner_autoscaling=arguments.autoscale_scanners,
+            scrape_window_hours=arguments.stagger_scrapes,
+            web_service_settings=get_web_service_settings(
+                request_rate=arguments.web_service_rate,
+                cpu_cores=arguments.web_service_cpu,
+            ),
+            expected_findings=arguments.expected_findings,
+            queue_depth=arguments.queue_depth,
+        )
+
+
+def main(args: list = None):
+    """
+        Entry point of the resc-helm-wizard CLI
+    :param args:
+        list of command line arguments, defaults to sys.argv
+    """
+    arguments = parse_arguments(args)
+    timing.reset_phase_timings()
+    try:
+        if arguments.profile:
+            profiling.run_profiled(
+                run_wizard,
+                profile_file=arguments.profile,
+                top=arguments.profile_top,
+                arguments=arguments,
+            )
+        else:
+            run_wizard(arguments=arguments)
+    finally:
+        if arguments.timing_report:
+            timing.write_timing_report(arguments.timing_report)
+        if arguments.prometheus_textfile:
+            timing.write_prometheus_textfile(arguments.prometheus_textfile)
+
+
 if __name__ == "__main__":
-    prompt_questions()
+    main()
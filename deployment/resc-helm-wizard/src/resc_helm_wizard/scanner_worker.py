@@ -0,0 +1,220 @@
+# Standard Library
+import logging
+import math
+import re
+import sys
+
+# First Party
+from resc_helm_wizard import constants
+
+logging.basicConfig(level=logging.INFO)
+
+MEMORY_UNITS = {
+    "": 1,
+    "k": 1000,
+    "K": 1000,
+    "M": 1000**2,
+    "G": 1000**3,
+    "T": 1000**4,
+    "Ki": 1024,
+    "Mi": 1024**2,
+    "Gi": 1024**3,
+    "Ti": 1024**4,
+}
+WORKER_SETTINGS = ["concurrency", "prefetch_multiplier", "max_tasks_per_child", "pool"]
+
+
+class ScannerWorker:
+    """
+    A class to represent the Celery worker of a secret scanner pod.
+    Attributes
+    ----------
+    concurrency : int
+        Number of repositories scanned in parallel by a pod
+    prefetch_multiplier : int
+        Number of repositories reserved from the queue per worker process
+    max_tasks_per_child : int
+        Number of scans after which a worker process is replaced, 0 never replaces it
+    pool : str
+        Celery pool of the worker processes, prefork, threads or solo
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 1,
+        prefetch_multiplier: int = 1,
+        max_tasks_per_child: int = 0,
+        pool: str = "prefork",
+    ):
+        self.concurrency: int = concurrency
+        self.prefetch_multiplier: int = prefetch_multiplier
+        self.max_tasks_per_child: int = max_tasks_per_child
+        self.pool: str = pool
+
+    def get_values(self) -> dict:
+        """
+            Get the worker helm values of the resc-vcs-scanner-secrets chart
+        :return: dict
+            Returns worker values
+        """
+        return {
+            "concurrency": self.concurrency,
+            "prefetchMultiplier": self.prefetch_multiplier,
+            "maxTasksPerChild": self.max_tasks_per_child,
+            "pool": self.pool,
+        }
+
+
+def parse_cpu(quantity) -> float:
+    """
+        Parse a kubernetes CPU quantity
+    :param quantity:
+        CPU quantity, e.g. 3, 1.5 or 1500m
+    :return: float
+        Returns number of CPU cores
+    :raises ValueError: if quantity is not a valid CPU quantity
+    """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)(m?)", str(quantity).strip())
+    if not match:
+        raise ValueError(f"{quantity} is not a valid CPU quantity")
+    return float(match[1]) / (1000 if match[2] else 1)
+
+
+def parse_memory(quantity) -> float:
+    """
+        Parse a kubernetes memory quantity
+    :param quantity:
+        memory quantity, e.g. 6G, 576Mi or 1073741824
+    :return: float
+        Returns memory size in bytes
+    :raises ValueError: if quantity is not a valid memory quantity
+    """
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([kKMGT]i?|)", str(quantity).strip())
+    if not match or match[2] not in MEMORY_UNITS:
+        raise ValueError(f"{quantity} is not a valid memory quantity")
+    return float(match[1]) * MEMORY_UNITS[match[2]]
+
+
+def get_worker_concurrency(resources: dict) -> int:
+    """
+        Get the number of repositories a scanner pod can scan in parallel, one per
+        requested CPU core as long as every scan fits in the memory limit
+    :param resources:
+        resource requests and limits of a scanner pod
+    :return: int
+        Returns worker concurrency
+    """
+    requests = resources.get("requests") or {}
+    limits = resources.get("limits") or {}
+    cpu = requests.get("cpu") or limits.get("cpu")
+    memory = limits.get("memory") or requests.get("memory")
+    if cpu is None or memory is None:
+        return 1
+    by_cpu = math.floor(parse_cpu(cpu))
+    by_memory = math.floor(
+        (parse_memory(memory) - constants.SCANNER_WORKER_BASE_MEMORY)
+        / constants.SCANNER_WORKER_TASK_MEMORY
+    )
+    return max(min(by_cpu, by_memory, constants.SCANNER_WORKER_MAX_CONCURRENCY), 1)
+
+
+def get_scanner_worker_errors(settings: dict) -> list:
+    """
+        Validate the worker settings
+    :param settings:
+        concurrency, prefetch_multiplier, max_tasks_per_child and pool, all optional
+    :return: list
+        Returns list of validation errors, empty if the settings are valid
+    """
+    if not isinstance(settings, dict):
+        return [
+            "must be a mapping of concurrency, prefetch_multiplier, "
+            "max_tasks_per_child and pool"
+        ]
+    errors = [
+        f"{key} is not supported" for key in settings if key not in WORKER_SETTINGS
+    ]
+    for key in ("concurrency", "prefetch_multiplier", "max_tasks_per_child"):
+        value = settings.get(key)
+        minimum = 0 if key == "max_tasks_per_child" else 1
+        if value is not None and (
+            not re.fullmatch(r"\d{1,5}", str(value)) or int(value) < minimum
+        ):
+            errors.append(f"{key}: {value} is not a whole number of at least {minimum}")
+    pool = settings.get("pool")
+    if pool is not None and pool not in constants.SCANNER_WORKER_POOLS:
+        errors.append(
+            f"pool: {pool} is not supported, supported pools are "
+            f"{', '.join(constants.SCANNER_WORKER_POOLS)}"
+        )
+    return errors
+
+
+def get_scanner_worker_settings(settings: dict) -> dict:
+    """
+        Validate the worker settings, abort the program if the settings are invalid
+    :param settings:
+        concurrency, prefetch_multiplier, max_tasks_per_child and pool, all optional
+    :return: dict
+        Returns settings with whole numbers
+    """
+    errors = get_scanner_worker_errors(settings)
+    for error in errors[:-1]:
+        logging.error(f"Invalid value for scanner_worker: {error}")
+    if errors:
+        logging.error(
+            f"Aborting the program! Invalid value for scanner_worker: {errors[-1]}"
+        )
+        sys.exit(1)
+    return {
+        key: value if key == "pool" else int(value) for key, value in settings.items()
+    }
+
+
+def size_scanner_worker(resources: dict, settings: dict = None) -> ScannerWorker:
+    """
+        Size the Celery worker of a scanner pod from its CPU and memory, a single
+        process scans one repository at a time, so a pod runs a process per core
+    :param resources:
+        resource requests and limits of a scanner pod
+    :param settings:
+        concurrency, prefetch_multiplier, max_tasks_per_child and pool, overriding the
+        sized values, optional
+    :return: ScannerWorker
+        Returns object of ScannerWorker
+    """
+    settings = settings or {}
+    concurrency = settings.get("concurrency") or get_worker_concurrency(resources)
+    return ScannerWorker(
+        concurrency=concurrency,
+        # Scans take minutes, a reserved repository would wait for a busy process
+        prefetch_multiplier=settings.get("prefetch_multiplier", 1),
+        max_tasks_per_child=settings.get(
+            "max_tasks_per_child", constants.SCANNER_WORKER_MAX_TASKS_PER_CHILD
+        ),
+        # The solo pool blocks the ping of the liveness probe during a scan
+        pool=settings.get("pool", "prefork"),
+    )
+
+
+def set_scanner_worker_values(scanner_values: dict, settings: dict = None):
+    """
+        Size the worker of the scanner deployment from its resources
+    :param scanner_values:
+        helm values of the resc-vcs-scanner-secrets chart, updated in place
+    :param settings:
+        concurrency, prefetch_multiplier, max_tasks_per_child and pool, optional
+    """
+    try:
+        worker = size_scanner_worker(scanner_values.get("resources") or {}, settings)
+    except ValueError as error:
+        logging.error(
+            f"Aborting the program! Invalid resources of resc-vcs-scanner-secrets: "
+            f"{error}"
+        )
+        sys.exit(1)
+    scanner_values["worker"] = worker.get_values()
+    logging.info(
+        f"resc-vcs-scanner-secrets scans {worker.concurrency} repositories in parallel "
+        f"per pod with the {worker.pool} pool"
+    )
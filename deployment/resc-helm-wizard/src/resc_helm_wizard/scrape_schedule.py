@@ -0,0 +1,281 @@
+# Standard Library
+import logging
+import re
+import sys
+from typing import List
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.common import get_vcs_instance_names
+from resc_helm_wizard.vcs_instance import VcsInstance
+
+logging.basicConfig(level=logging.INFO)
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+class ScrapeSchedule:
+    """
+    A class to represent the cron schedule of the projects scraper of a VCS instance.
+    Attributes
+    ----------
+    name : str
+        Name of the cron job, used as suffix of the scraper cron job name
+    vcs_instance : str
+        Name of the VCS instance
+    schedule : str
+        Cron schedule of the scraper
+    repositories : int
+        Number of repositories of the VCS instance, None when unknown
+    """
+
+    def __init__(
+        self, name: str, vcs_instance: str, schedule: str, repositories: int = None
+    ):
+        self.name: str = name
+        self.vcs_instance: str = vcs_instance
+        self.schedule: str = schedule
+        self.repositories: int = repositories
+
+    def get_values(self) -> dict:
+        """
+            Get the helm values of the schedule for the resc-vcs-scraper-projects chart
+        :return: dict
+            Returns schedule values
+        """
+        return {
+            "name": self.name,
+            "vcsInstance": self.vcs_instance,
+            "schedule": self.schedule,
+        }
+
+
+def parse_schedule(schedule: str) -> tuple:
+    """
+        Parse a weekly or daily cron schedule with a fixed minute and hour, e.g. 0 6 * * 6
+    :param schedule:
+        cron schedule
+    :return: tuple
+        Returns minute, hour and day of the week, None for a daily schedule
+    """
+    match = re.fullmatch(r"(\d{1,2}) (\d{1,2}) \* \* (\d|\*)", schedule.strip())
+    if not match or int(match[1]) > 59 or int(match[2]) > 23:
+        logging.error(
+            f"Aborting the program! Invalid value for scrape_schedule.schedule: {schedule} "
+            f"must be a daily or weekly cron schedule like '0 6 * * 6'"
+        )
+        sys.exit(1)
+    day = None if match[3] == "*" else int(match[3]) % 7
+    return int(match[1]), int(match[2]), day
+
+
+def format_schedule(start: tuple, offset_minutes: int) -> str:
+    """
+        Format the cron schedule of a start time plus an offset
+    :param start:
+        minute, hour and day of the week of the first scrape
+    :param offset_minutes:
+        minutes after the first scrape
+    :return: str
+        Returns cron schedule
+    """
+    minute, hour, day = start
+    period = MINUTES_PER_DAY if day is None else MINUTES_PER_WEEK
+    start_minutes = (day or 0) * MINUTES_PER_DAY + hour * 60 + minute
+    minutes = (start_minutes + offset_minutes) % period
+    weekday = "*" if day is None else str(minutes // MINUTES_PER_DAY)
+    return f"{minutes % 60} {minutes % MINUTES_PER_DAY // 60} * * {weekday}"
+
+
+def get_cron_job_names(names: List[str]) -> List[str]:
+    """
+        Get unique cron job name suffixes of VCS instances, usable in kubernetes resource names
+    :param names:
+        names of the VCS instances
+    :return: List[str]
+        Returns lower case names of at most 26 characters
+    """
+    cron_job_names = []
+    for name in names:
+        cron_job_name = name.lower().replace("_", "-")[:26].rstrip("-")
+        suffix = 2
+        while cron_job_name in cron_job_names:
+            cron_job_name = (
+                f"{name.lower().replace('_', '-')[:23].rstrip('-')}-{suffix}"
+            )
+            suffix += 1
+        cron_job_names.append(cron_job_name)
+    return cron_job_names
+
+
+def get_scrape_weights(names: List[str], vcs_instance_totals: dict = None) -> tuple:
+    """
+        Get the number of repositories per VCS instance, VCS instances missing from the
+        totals weigh as much as the average known VCS instance
+    :param names:
+        names of the VCS instances
+    :param vcs_instance_totals:
+        repository totals by VCS instance name, optional
+    :return: tuple
+        Returns repositories per VCS instance, None when unknown, and weight per VCS instance
+    """
+    totals = vcs_instance_totals or {}
+    repositories = [totals[name][0] if name in totals else None for name in names]
+    known = [count for count in repositories if count is not None]
+    default_weight = max(sum(known) // len(known), 1) if known else 1
+    weights = [default_weight if count is None else count for count in repositories]
+    return repositories, weights
+
+
+def assign_slots(
+    vcs_instances: List[VcsInstance], weights: List[int], slots: int
+) -> List[int]:
+    """
+        Assign every VCS instance to the least loaded start slot, largest instances first.
+        VCS instances on the same host start in different slots while possible, so the
+        API of a host is not scraped by several cron jobs at once.
+    :param vcs_instances:
+        list of VCS instances
+    :param weights:
+        number of repositories per VCS instance
+    :param slots:
+        number of start slots
+    :return: List[int]
+        Returns slot per VCS instance
+    """
+    loads = [0] * slots
+    hosts = [set() for _ in range(slots)]
+    assignment = [0] * len(vcs_instances)
+    order = sorted(range(len(vcs_instances)), key=lambda index: -weights[index])
+    for index in order:
+        host = vcs_instances[index].host
+        candidates = [slot for slot in range(slots) if host not in hosts[slot]]
+        slot = min(candidates or range(slots), key=lambda slot: (loads[slot], slot))
+        loads[slot] += weights[index]
+        hosts[slot].add(host)
+        assignment[index] = slot
+    return assignment
+
+
+def plan_scrape_schedules(
+    vcs_instances: List[VcsInstance],
+    schedule: str = constants.SCRAPE_SCHEDULE,
+    window_hours: float = constants.SCRAPE_WINDOW_HOURS,
+    slot_minutes: int = constants.SCRAPE_SLOT_MINUTES,
+    vcs_instance_totals: dict = None,
+) -> List[ScrapeSchedule]:
+    """
+        Spread the projects scrapers of the VCS instances over a time window, so the
+        repositories of all VCS instances are not queued at the same minute
+    :param vcs_instances:
+        list of VCS instances
+    :param schedule:
+        cron schedule of the start of the window
+    :param window_hours:
+        length of the window in hours
+    :param slot_minutes:
+        minutes between two start slots
+    :param vcs_instance_totals:
+        repository totals by VCS instance name, instances are weighted equally when not provided
+    :return: List[ScrapeSchedule]
+        Returns schedule per VCS instance
+    """
+    start = parse_schedule(schedule)
+    if window_hours <= 0 or slot_minutes < 1:
+        logging.error(
+            "Aborting the program! Scrape window and slot must be a positive number "
+            "of hours and minutes"
+        )
+        sys.exit(1)
+    names = get_vcs_instance_names(vcs_instances)
+    repositories, weights = get_scrape_weights(names, vcs_instance_totals)
+
+    # Fewer instances than slots are spread evenly over the window
+    window_slots = max(int(window_hours * 60 // slot_minutes), 1)
+    slots = max(min(window_slots, len(vcs_instances)), 1)
+    spacing = window_slots // slots * slot_minutes
+    assignment = assign_slots(vcs_instances, weights, slots)
+    return [
+        ScrapeSchedule(
+            name=cron_job_name,
+            vcs_instance=name,
+            schedule=format_schedule(start, slot * spacing),
+            repositories=count,
+        )
+        for name, cron_job_name, slot, count in zip(
+            names, get_cron_job_names(names), assignment, repositories
+        )
+    ]
+
+
+def log_scrape_schedules(schedules: List[ScrapeSchedule]):
+    """
+        Log the schedule per VCS instance and the largest share of repositories queued at once
+    :param schedules:
+        list of ScrapeSchedule objects
+    """
+    lines = [f"{'VCS INSTANCE':<40}  {'SCHEDULE':<14}  {'REPOSITORIES':>12}"]
+    slot_repositories = {}
+    for schedule in schedules:
+        count = "unknown" if schedule.repositories is None else schedule.repositories
+        lines.append(
+            f"{schedule.vcs_instance:<40}  {schedule.schedule:<14}  {count:>12}"
+        )
+        slot_repositories[schedule.schedule] = slot_repositories.get(
+            schedule.schedule, 0
+        ) + (schedule.repositories or 0)
+    total = sum(slot_repositories.values())
+    if total:
+        peak = max(slot_repositories.values())
+        lines.append(
+            f"At most {peak} of {total} repositories ({peak * 100 // total}%) are queued "
+            f"at the same time"
+        )
+    summary = "\n".join(lines)
+    logging.info(f"Staggered scrape schedule:\n{summary}")
+
+
+def get_scrape_schedules(
+    vcs_instances: List[VcsInstance], settings: dict, vcs_instance_totals: dict = None
+) -> List[ScrapeSchedule]:
+    """
+        Plan and log the staggered scrape schedules, abort the program if the settings are invalid
+    :param vcs_instances:
+        list of VCS instances
+    :param settings:
+        schedule, window_hours and slot_minutes, all optional
+    :param vcs_instance_totals:
+        repository totals by VCS instance name, optional
+    :return: List[ScrapeSchedule]
+        Returns schedule per VCS instance
+    """
+    if not isinstance(settings, dict) or set(settings) - {
+        "schedule",
+        "window_hours",
+        "slot_minutes",
+    }:
+        logging.error(
+            "Aborting the program! Invalid value for scrape_schedule: "
+            "must be a mapping of schedule, window_hours and slot_minutes"
+        )
+        sys.exit(1)
+    try:
+        schedules = plan_scrape_schedules(
+            vcs_instances=vcs_instances,
+            schedule=str(settings.get("schedule", constants.SCRAPE_SCHEDULE)),
+            window_hours=float(
+                settings.get("window_hours", constants.SCRAPE_WINDOW_HOURS)
+            ),
+            slot_minutes=int(
+                settings.get("slot_minutes", constants.SCRAPE_SLOT_MINUTES)
+            ),
+            vcs_instance_totals=vcs_instance_totals,
+        )
+    except ValueError as error:
+        logging.error(
+            f"Aborting the program! Invalid value for scrape_schedule: {error}"
+        )
+        sys.exit(1)
+    log_scrape_schedules(schedules)
+    return schedules
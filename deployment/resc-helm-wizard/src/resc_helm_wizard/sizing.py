@@ -0,0 +1,206 @@
+# Standard Library
+import logging
+import sys
+
+# First Party
+from resc_helm_wizard import (
+    answers,
+    autoscaling,
+    capacity,
+    constants,
+    database_tuning,
+    kubernetes_utilities,
+    repository_inventory,
+    scanner_worker,
+    scrape_schedule,
+    web_service,
+)
+from resc_helm_wizard.helm_value import HelmValue
+
+logging.basicConfig(level=logging.INFO)
+
+
+def merge_answer_settings(answers_dict: dict, key: str, settings: dict):
+    """
+        Override the settings of a mapping answer with the settings of command line options
+    :param answers_dict:
+        answers, updated in place
+    :param key:
+        key of the mapping answer, e.g. web_service
+    :param settings:
+        settings of the command line options, optional, settings of options not
+        provided are None
+    """
+    settings = {
+        name: value for name, value in (settings or {}).items() if value is not None
+    }
+    if settings:
+        answers_dict[key] = {**(answers_dict.get(key) or {}), **settings}
+
+
+def get_web_service_size(
+    settings: dict, kube_context: str = None
+) -> web_service.WebServiceSize:
+    """
+        Size the web service, the CPU available to the web service defaults to a share
+        of the allocatable CPU of the cluster
+    :param settings:
+        request_rate, required, and cpu_cores, optional
+    :param kube_context:
+        name of the kube context, current context is used when not provided
+    :return: WebServiceSize
+        Returns object of WebServiceSize
+    """
+    if isinstance(settings, dict) and "cpu_cores" not in settings:
+        allocatable_cpu = kubernetes_utilities.get_allocatable_cpu(
+            kube_context=kube_context
+        )
+        if allocatable_cpu:
+            settings = {
+                **settings,
+                "cpu_cores": allocatable_cpu * constants.WEB_SERVICE_CPU_SHARE,
+            }
+            logging.info(
+                f"The web service may use {constants.WEB_SERVICE_CPU_SHARE:.0%} of the "
+                f"{allocatable_cpu:g} allocatable CPU of the cluster"
+            )
+    return web_service.get_web_service_size(settings)
+
+
+def get_scrape_schedules(
+    vcs_instances: list,
+    settings: dict,
+    capacity_plan: capacity.CapacityPlan = None,
+    capacity_inventory_file: str = None,
+) -> list:
+    """
+        Plan the staggered scrape schedules, weighted by the repositories of the VCS instances
+        in the capacity plan or in the repository inventory file
+    :param vcs_instances:
+        list of VCS instances
+    :param settings:
+        schedule, window_hours and slot_minutes, all optional
+    :param capacity_plan:
+        capacity plan with the repository totals per VCS instance, optional
+    :param capacity_inventory_file:
+        path of the repository inventory file, used when there is no capacity plan
+    :return: list
+        Returns list of ScrapeSchedule objects
+    """
+    vcs_instance_totals = None
+    if capacity_plan:
+        vcs_instance_totals = capacity_plan.vcs_instance_totals
+    elif capacity_inventory_file:
+        vcs_instance_totals = capacity.get_vcs_instance_totals(
+            capacity.read_repository_inventory(capacity_inventory_file)
+        )
+    return scrape_schedule.get_scrape_schedules(
+        vcs_instances=vcs_instances,
+        settings=settings,
+        vcs_instance_totals=vcs_instance_totals,
+    )
+
+
+def get_capacity_plan(
+    vcs_instances: list,
+    scan_window_hours: float,
+    capacity_inventory_file: str = None,
+    verify_ssl: bool = True,
+) -> capacity.CapacityPlan:
+    """
+        Plan the capacity of the deployment from a repository inventory file or by
+        crawling the repositories of the VCS instances
+    :param vcs_instances:
+        list of VCS instances
+    :param scan_window_hours:
+        time in which all repositories must be scanned
+    :param capacity_inventory_file:
+        path of the repository inventory file, optional
+    :param verify_ssl:
+        verify the SSL certificates of the VCS instances
+    :return: CapacityPlan
+        Returns capacity plan
+    """
+    if scan_window_hours <= 0:
+        logging.error(
+            "Aborting the program! Scan window must be a positive number of hours"
+        )
+        sys.exit(1)
+    if capacity_inventory_file:
+        inventory = capacity.read_repository_inventory(capacity_inventory_file)
+    else:
+        vcs_inventories, errors = repository_inventory.crawl_repository_inventory(
+            vcs_instances=vcs_instances, verify_ssl=verify_ssl
+        )
+        for error in errors:
+            logging.error(f"Unable to crawl {error}")
+        if errors:
+            logging.error("Aborting the program! Repository inventory is incomplete")
+            sys.exit(1)
+        inventory = {"vcs_instances": vcs_inventories}
+    totals = capacity.get_repository_totals(inventory)
+    capacity_plan = capacity.plan_capacity(
+        repositories=totals[0],
+        size_bytes=totals[1],
+        scan_window_hours=scan_window_hours,
+        unknown_size_repositories=totals[2],
+    )
+    capacity_plan.vcs_instance_totals = capacity.get_vcs_instance_totals(inventory)
+    capacity.log_capacity_plan(capacity_plan)
+    return capacity_plan
+
+
+def apply_sizing_answers(
+    answers_dict: dict,
+    helm_values: HelmValue,
+    option_settings: dict = None,
+    kube_context: str = None,
+):
+    """
+        Plan the capacity and validate the scanner autoscaling, web service, database
+        tuning, RabbitMQ profile, scanner worker and scrape schedule answers and set
+        them on the helm values
+    :param answers_dict:
+        answers, updated in place with the settings of the command line options
+    :param helm_values:
+        object of HelmValue, updated in place
+    :param option_settings:
+        settings of the command line options by answer key, overriding the answers
+    :param kube_context:
+        name of the kube context the web service is sized for, current context is used
+        when not provided
+    """
+    for key, settings in (option_settings or {}).items():
+        merge_answer_settings(answers_dict, key, settings)
+    if answers_dict.get("scan_window_hours"):
+        helm_values.capacity_plan = get_capacity_plan(
+            vcs_instances=helm_values.vcs_instances,
+            scan_window_hours=answers.get_answer(answers_dict, "scan_window_hours"),
+            capacity_inventory_file=answers_dict.get("capacity_inventory_file"),
+            verify_ssl=answers.get_answer(answers_dict, "verify_ssl", default=True),
+        )
+    if answers_dict.get("scanner_autoscaling"):
+        helm_values.scanner_autoscaling = autoscaling.get_scanner_autoscaling(
+            settings=answers_dict["scanner_autoscaling"],
+            capacity_plan=helm_values.capacity_plan,
+        )
+    if answers_dict.get("web_service"):
+        helm_values.web_service = get_web_service_size(
+            answers_dict["web_service"], kube_context=kube_context
+        )
+    if answers_dict.get("database_tuning"):
+        helm_values.database_tuning = database_tuning.get_database_tuning_settings(
+            answers_dict["database_tuning"]
+        )
+    helm_values.rabbitmq_profile = answers_dict.get("rabbitmq_profile")
+    if answers_dict.get("scanner_worker"):
+        helm_values.scanner_worker = scanner_worker.get_scanner_worker_settings(
+            answers_dict["scanner_worker"]
+        )
+    if answers_dict.get("scrape_schedule"):
+        helm_values.scrape_schedules = get_scrape_schedules(
+            vcs_instances=helm_values.vcs_instances,
+            settings=answers_dict["scrape_schedule"],
+            capacity_plan=helm_values.capacity_plan,
+            capacity_inventory_file=answers_dict.get("capacity_inventory_file"),
+        )
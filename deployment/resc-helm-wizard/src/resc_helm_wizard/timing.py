@@ -0,0 +1,263 @@
+# Standard Library
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import List
+
+logging.basicConfig(level=logging.INFO)
+
+_PHASES = []
+_PHASES_LOCK = threading.Lock()
+_START_TIME = time.monotonic()
+_START_TIMESTAMP = time.time()
+# Name of the running phase, threads started with a copy of the context inherit it
+_CURRENT_PHASE = contextvars.ContextVar("current_phase", default=None)
+
+
+class PhaseTiming:
+    """
+    A class to represent the duration of a single deployment phase.
+    Attributes
+    ----------
+    phase : str
+        Name of the phase, e.g. helm_repo_update
+    kube_context : str
+        Name of the kube context, None for the current context
+    start : float
+        Seconds from the start of the wizard until the phase started
+    duration : float
+        Duration of the phase in seconds
+    status : str
+        Outcome of the phase: ok, failed or error
+    parent : str
+        Name of the enclosing phase, None for a top level phase, the duration of the
+        enclosing phase includes the duration of this phase
+    """
+
+    def __init__(
+        self,
+        phase: str,
+        kube_context: str,
+        start: float,
+        duration: float,
+        status: str,
+        parent: str = None,
+    ):
+        self.phase: str = phase
+        self.kube_context: str = kube_context
+        self.start: float = start
+        self.duration: float = duration
+        self.status: str = status
+        self.parent: str = parent
+
+    def to_dict(self) -> dict:
+        """
+            Convert the phase timing to a dictionary for the JSON report
+        :return: dict
+            Returns phase timing as dictionary
+        """
+        return {
+            "phase": self.phase,
+            "kube_context": self.kube_context,
+            "start": round(self.start, 3),
+            "duration": round(self.duration, 3),
+            "status": self.status,
+            "parent": self.parent,
+        }
+
+
+def timed_phase(phase: str, failed_outcomes: tuple = ()):
+    """
+        Decorator which records the duration of a deployment phase with a monotonic timer,
+        a phase raising an exception is recorded as error and a phase returning one of
+        its failed outcomes as failed
+    :param phase:
+        name of the phase
+    :param failed_outcomes:
+        return values of the phase which mean it failed, e.g. (False,) or ("failed",)
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start_time = time.monotonic()
+            status = "error"
+            parent = _CURRENT_PHASE.get()
+            token = _CURRENT_PHASE.set(phase)
+            try:
+                result = function(*args, **kwargs)
+                status = (
+                    "failed" if is_failed_outcome(result, failed_outcomes) else "ok"
+                )
+                return result
+            finally:
+                _CURRENT_PHASE.reset(token)
+                record_phase(
+                    PhaseTiming(
+                        phase=phase,
+                        kube_context=kwargs.get("kube_context"),
+                        start=start_time - _START_TIME,
+                        duration=time.monotonic() - start_time,
+                        status=status,
+                        parent=parent,
+                    )
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def is_failed_outcome(result, failed_outcomes: tuple) -> bool:
+    """
+        Check if the return value of a phase is one of its failed outcomes, values of
+        another type never match, so 0 or an empty result is not taken for False
+    :param result:
+        return value of the phase
+    :param failed_outcomes:
+        return values of the phase which mean it failed
+    :return: bool
+        Returns true if the result is a failed outcome else returns false
+    """
+    return any(
+        type(result) is type(outcome) and result == outcome
+        for outcome in failed_outcomes
+    )
+
+
+def record_phase(phase_timing: PhaseTiming):
+    """
+        Record the duration of a deployment phase
+    :param phase_timing:
+        object of PhaseTiming
+    """
+    with _PHASES_LOCK:
+        _PHASES.append(phase_timing)
+
+
+def get_phase_timings() -> List[PhaseTiming]:
+    """
+        Get the recorded phase durations
+    :return: List[PhaseTiming]
+        Returns list of recorded phases in order of completion
+    """
+    with _PHASES_LOCK:
+        return list(_PHASES)
+
+
+def reset_phase_timings():
+    """
+    Remove all recorded phase durations and restart the wizard clock
+    """
+    global _START_TIME, _START_TIMESTAMP  # pylint: disable=global-statement
+    with _PHASES_LOCK:
+        _PHASES.clear()
+        _START_TIME = time.monotonic()
+        _START_TIMESTAMP = time.time()
+
+
+def get_timing_report() -> dict:
+    """
+        Get the timing report of the wizard run, the duration of a phase includes its
+        nested phases, which carry the name of the enclosing phase as parent
+    :return: dict
+        Returns the start time, total duration, every phase and the total duration per phase
+    """
+    phase_timings = get_phase_timings()
+    totals = {}
+    for phase_timing in phase_timings:
+        totals[phase_timing.phase] = round(
+            totals.get(phase_timing.phase, 0) + phase_timing.duration, 3
+        )
+    return {
+        "started_at": _START_TIMESTAMP,
+        "duration": round(time.monotonic() - _START_TIME, 3),
+        "phases": [phase_timing.to_dict() for phase_timing in phase_timings],
+        "totals": totals,
+    }
+
+
+def write_file_atomically(file_path: str, content: str):
+    """
+        Write a file through a temporary file, so readers never see a partial file
+    :param file_path:
+        path of the file
+    :param content:
+        content of the file
+    """
+    with open(f"{file_path}.tmp", "w", encoding="utf-8") as file_out:
+        file_out.write(content)
+    os.replace(f"{file_path}.tmp", file_path)
+
+
+def write_timing_report(report_file: str):
+    """
+        Write the JSON timing report of the wizard run
+    :param report_file:
+        path of the JSON report file
+    """
+    write_file_atomically(report_file, json.dumps(get_timing_report(), indent=2))
+    logging.info(f"Timing report has been written to {report_file}")
+
+
+def escape_label_value(value: str) -> str:
+    """
+        Escape a Prometheus label value
+    :param value:
+        label value
+    :return: str
+        Returns escaped label value
+    """
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_prometheus_textfile(textfile: str):
+    """
+        Write the phase durations in the Prometheus text format, to be picked up by the
+        textfile collector of the node exporter
+    :param textfile:
+        path of the .prom file
+    """
+    report = get_timing_report()
+    durations = {}
+    failures = {}
+    for phase in report["phases"]:
+        key = (phase["phase"], phase["kube_context"] or "")
+        durations[key] = durations.get(key, 0) + phase["duration"]
+        failures[key] = failures.get(key, 0) + (phase["status"] != "ok")
+
+    lines = [
+        "# HELP resc_wizard_phase_duration_seconds Duration of a deployment phase, "
+        "including its nested phases.",
+        "# TYPE resc_wizard_phase_duration_seconds gauge",
+    ]
+    for (phase, kube_context), duration in durations.items():
+        labels = (
+            f'phase="{escape_label_value(phase)}",'
+            f'kube_context="{escape_label_value(kube_context)}"'
+        )
+        lines.append(f"resc_wizard_phase_duration_seconds{{{labels}}} {duration:.3f}")
+    lines += [
+        "# HELP resc_wizard_phase_failures Number of failed runs of a deployment phase.",
+        "# TYPE resc_wizard_phase_failures gauge",
+    ]
+    for (phase, kube_context), failure_count in failures.items():
+        labels = (
+            f'phase="{escape_label_value(phase)}",'
+            f'kube_context="{escape_label_value(kube_context)}"'
+        )
+        lines.append(f"resc_wizard_phase_failures{{{labels}}} {failure_count}")
+    lines += [
+        "# HELP resc_wizard_run_duration_seconds Duration of the wizard run.",
+        "# TYPE resc_wizard_run_duration_seconds gauge",
+        f"resc_wizard_run_duration_seconds {report['duration']}",
+        "# HELP resc_wizard_last_run_timestamp_seconds Start time of the wizard run.",
+        "# TYPE resc_wizard_last_run_timestamp_seconds gauge",
+        f"resc_wizard_last_run_timestamp_seconds {report['started_at']:.3f}",
+    ]
+    write_file_atomically(textfile, "\n".join(lines) + "\n")
+    logging.info(f"Prometheus metrics have been written to {textfile}")
@@ -142,3 +142,36 @@ def vcs_url_validator(url):
     if not re.fullmatch(regex, url):
         return "Please provide a valid URL"
     return True
+
+
+def vcs_instance_name_validator(name):
+    """
+        VCS instance name validator
+    :param name:
+        name of VCS instance, also used for the names of its credential variables
+    :return: str or bool.
+        If validation fails, the output will contain a validation error message.
+        Otherwise, the output will return true if validation was successful
+    """
+    regex = re.compile(r"^[A-Za-z][A-Za-z\d_-]{0,62}$")
+
+    if not re.fullmatch(regex, name):
+        return (
+            f"{name} is not a valid VCS instance name. VCS instance name must start with a letter, "
+            f"contain alphanumeric characters, hyphens or underscores and maximum 63 characters allowed."
+        )
+    return True
+
+
+def replica_count_validator(replicas):
+    """
+        Replica count validator
+    :param replicas:
+        number of replicas, a non-negative whole number of at most 100
+    :return: str or bool.
+        If validation fails, the output will contain a validation error message.
+        Otherwise, the output will return true if validation was successful
+    """
+    if not re.fullmatch(r"\d{1,3}", str(replicas)) or int(replicas) > 100:
+        return f"{replicas} is not a valid number of replicas, provide a whole number from 0 to 100"
+    return True
@@ -0,0 +1,224 @@
+# Standard Library
+import contextlib
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.vcs_instance import VcsInstance
+
+if TYPE_CHECKING:
+    # Third Party
+    import requests
+
+logging.basicConfig(level=logging.INFO)
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+class HostRateLimiter:
+    """
+    A class to limit the requests to each VCS host, so a crawl of many scopes
+    does not trip the rate limits of a single server.
+    Attributes
+    ----------
+    max_concurrent : int
+        Maximum number of requests in flight per host
+    min_interval : float
+        Minimum number of seconds between the start of two requests to a host
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = constants.VCS_API_MAX_REQUESTS_PER_HOST,
+        min_interval: float = constants.VCS_API_MIN_REQUEST_INTERVAL,
+    ):
+        self.max_concurrent: int = max_concurrent
+        self.min_interval: float = min_interval
+        self.lock = threading.Lock()
+        self.semaphores = {}
+        self.next_start_times = {}
+
+    @contextlib.contextmanager
+    def limit(self, host: str):
+        """
+            Wait until a request to the host may start and hold a slot while it runs
+        :param host:
+            host of the VCS instance
+        """
+        with self.lock:
+            semaphore = self.semaphores.setdefault(
+                host, threading.BoundedSemaphore(self.max_concurrent)
+            )
+        with semaphore:
+            with self.lock:
+                now = time.monotonic()
+                start_time = max(now, self.next_start_times.get(host, now))
+                self.next_start_times[host] = start_time + self.min_interval
+            if start_time > now:
+                time.sleep(start_time - now)
+            yield
+
+
+_RATE_LIMITER = HostRateLimiter()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """
+        Get the rate limiter shared by all VCS API requests
+    :return: HostRateLimiter
+        Returns rate limiter
+    """
+    return _RATE_LIMITER
+
+
+def get_session() -> "requests.Session":
+    """
+        Get the HTTP session shared by all VCS API requests, so connections are pooled
+    :return: requests.Session
+        Returns HTTP session
+    """
+    # Third Party
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    global _SESSION  # pylint: disable=global-statement
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=constants.VCS_API_MAX_WORKERS,
+                pool_maxsize=constants.VCS_API_MAX_WORKERS,
+            )
+            _SESSION.mount("https://", adapter)
+            _SESSION.mount("http://", adapter)
+    return _SESSION
+
+
+def get_base_url(vcs_instance: VcsInstance) -> str:
+    """
+        Get the base url of a VCS instance, the port is left out when it is the default port
+    :param vcs_instance:
+        object of VcsInstance
+    :return: str
+        Returns base url, e.g. https://bitbucket.example.com:7999
+    """
+    base_url = f"{vcs_instance.scheme}://{vcs_instance.host}"
+    if vcs_instance.port and str(vcs_instance.port) != DEFAULT_PORTS.get(
+        vcs_instance.scheme
+    ):
+        base_url = f"{base_url}:{vcs_instance.port}"
+    return base_url
+
+
+def get_api_url(vcs_instance: VcsInstance) -> str:
+    """
+        Get the REST API root of a VCS instance
+    :param vcs_instance:
+        object of VcsInstance
+    :return: str
+        Returns api url, GitHub Enterprise and Azure DevOps Server are served from the host itself
+    """
+    if vcs_instance.provider_type == "GITHUB_PUBLIC":
+        if vcs_instance.host == "github.com":
+            return "https://api.github.com"
+        return f"{get_base_url(vcs_instance)}/api/v3"
+    if vcs_instance.provider_type == "AZURE_DEVOPS":
+        return f"{get_base_url(vcs_instance)}/{vcs_instance.organization}/_apis"
+    return f"{get_base_url(vcs_instance)}/rest/api/1.0"
+
+
+def get_auth(vcs_instance: VcsInstance) -> tuple:
+    """
+        Get the authentication of a VCS instance
+    :param vcs_instance:
+        object of VcsInstance
+    :return: tuple
+        Returns request headers and basic auth, basic auth is None for token headers
+    """
+    if vcs_instance.provider_type == "GITHUB_PUBLIC":
+        return (
+            {
+                "Authorization": f"token {vcs_instance.password}",
+                "Accept": "application/vnd.github+json",
+            },
+            None,
+        )
+    if vcs_instance.provider_type == "AZURE_DEVOPS":
+        return {"Accept": "application/json"}, ("", vcs_instance.password)
+    if vcs_instance.username and vcs_instance.username != "NA":
+        return {"Accept": "application/json"}, (
+            vcs_instance.username,
+            vcs_instance.password,
+        )
+    return {
+        "Authorization": f"Bearer {vcs_instance.password}",
+        "Accept": "application/json",
+    }, None
+
+
+def get_retry_delay(response: "requests.Response") -> float:
+    """
+        Get the number of seconds to wait before a rate limited request is retried
+    :param response:
+        HTTP response
+    :return: float
+        Returns delay in seconds or None if the request was not rate limited
+    """
+    if response.status_code == 429 or (
+        response.status_code == 403
+        and response.headers.get("X-RateLimit-Remaining") == "0"
+    ):
+        try:
+            delay = float(response.headers.get("Retry-After", 1))
+        except ValueError:
+            delay = 1.0
+        return min(max(delay, 0), constants.VCS_API_MAX_RETRY_DELAY)
+    return None
+
+
+def request_vcs_api(
+    vcs_instance: VcsInstance,
+    url: str,
+    verify_ssl: bool = True,
+    params: dict = None,
+    headers: dict = None,
+) -> "requests.Response":
+    """
+        Send a GET request to the API of a VCS instance through the pooled session and
+        the per-host rate limiter, rate limited requests are retried after Retry-After
+    :param vcs_instance:
+        object of VcsInstance
+    :param url:
+        url of the request
+    :param verify_ssl:
+        verify the SSL certificate of the VCS instance
+    :param params:
+        query parameters, optional
+    :param headers:
+        additional request headers, optional
+    :return: requests.Response
+        Returns HTTP response
+    :raises requests.RequestException: if the VCS instance could not be reached
+    """
+    auth_headers, auth = get_auth(vcs_instance)
+    for attempt in range(constants.VCS_API_RETRIES + 1):
+        with get_rate_limiter().limit(vcs_instance.host):
+            response = get_session().get(
+                url,
+                params=params,
+                headers={**auth_headers, **(headers or {})},
+                auth=auth,
+                timeout=constants.VCS_API_TIMEOUT,
+                verify=verify_ssl,
+            )
+        delay = get_retry_delay(response)
+        if delay is None or attempt == constants.VCS_API_RETRIES:
+            return response
+        logging.debug(f"Rate limited by {vcs_instance.host}, retrying in {delay:.0f}s")
+        time.sleep(delay)
+    return response
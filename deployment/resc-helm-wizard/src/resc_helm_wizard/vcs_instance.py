@@ -23,6 +23,8 @@ class VcsInstance:
         organization of vcs instance
     scope : list
         List of scope
+    name : str
+        unique name of vcs instance, derived from the provider type and host when not provided
     """
 
     def __init__(
@@ -35,6 +37,7 @@ class VcsInstance:
         password: str,
         organization: str,
         scope: List[str],
+        name: str = None,
     ):
         self.provider_type: str = provider_type
         self.scheme: str = scheme
@@ -44,3 +47,4 @@ class VcsInstance:
         self.password: str = password
         self.organization: str = organization
         self.scope: list = scope
+        self.name: str = name
@@ -0,0 +1,244 @@
+# Standard Library
+import csv
+import logging
+import os
+import sys
+from typing import List
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.common import (
+    build_vcs_instance,
+    get_credential_variable_prefix,
+    get_yaml_loader,
+)
+from resc_helm_wizard.validator import (
+    azure_devops_token_validator,
+    bitbucket_token_validator,
+    github_account_name_validator,
+    github_token_validator,
+    github_username_validator,
+    vcs_instance_name_validator,
+    vcs_url_validator,
+)
+from resc_helm_wizard.vcs_instance import VcsInstance
+
+logging.basicConfig(level=logging.INFO)
+
+TOKEN_VALIDATORS = {
+    "GitHub": github_token_validator,
+    "Azure Devops": azure_devops_token_validator,
+    "Bitbucket": bitbucket_token_validator,
+}
+DEFAULT_URLS = {
+    "GitHub": constants.DEFAULT_GITHUB_URL,
+    "Azure Devops": constants.DEFAULT_AZURE_DEVOPS_URL,
+}
+
+
+def find_vcs_type(value) -> str:
+    """
+        Find the VCS type of a VCS instance answer, accepts the wizard labels and provider types
+    :param value:
+        type of the VCS instance answer, e.g. Bitbucket or BITBUCKET
+    :return: str
+        Returns VCS type, one of GitHub, Azure Devops or Bitbucket, or None if not supported
+    """
+    vcs_type = str(value or "").strip()
+    for label, provider_type in constants.VCS_PROVIDER_TYPES.items():
+        if vcs_type.lower() in (label.lower(), provider_type.lower()):
+            return label
+    return None
+
+
+def get_vcs_instance_info(vcs_type: str, vcs_answer: dict) -> dict:
+    """
+        Get the details of a VCS instance answer, with defaults for missing details
+    :param vcs_type:
+        type of VCS instance, one of GitHub, Azure Devops or Bitbucket
+    :param vcs_answer:
+        VCS instance answer
+    :return: dict
+        Returns dictionary containing name, url, organization, username and token
+    """
+    return {
+        "name": vcs_answer.get("name") or None,
+        "url": vcs_answer.get("url") or DEFAULT_URLS.get(vcs_type),
+        "organization": vcs_answer.get("organization") or "",
+        "username": vcs_answer.get("username") or "NA",
+        "token": vcs_answer.get("token") or "",
+    }
+
+
+def get_scope(vcs_instance_info: dict, vcs_answer: dict) -> List[str]:
+    """
+        Get the GitHub accounts to scan of a VCS instance answer
+    :param vcs_instance_info:
+        details of the VCS instance
+    :param vcs_answer:
+        VCS instance answer, scope is a list or a comma or semicolon separated string
+    :return: List[str]
+        Returns list of accounts, defaults to the username
+    """
+    scope = vcs_answer.get("scope") or [vcs_instance_info["username"]]
+    if isinstance(scope, str):
+        scope = [account.strip() for account in scope.replace(";", ",").split(",")]
+    return scope
+
+
+def get_vcs_answer_errors(vcs_type: str, vcs_answer: dict, key: str) -> List[str]:
+    """
+        Validate a VCS instance answer with the rules of validator.py
+    :param vcs_type:
+        type of VCS instance, one of GitHub, Azure Devops or Bitbucket, None if not supported
+    :param vcs_answer:
+        VCS instance answer
+    :param key:
+        key of the answer used in the error messages, e.g. vcs_instances[0]
+    :return: List[str]
+        Returns list of validation errors, empty if the answer is valid
+    """
+    if vcs_type is None:
+        return [
+            f"{key}.type: Unsupported VCS instance type '{vcs_answer.get('type', '')}', "
+            f"supported types are {', '.join(constants.VCS_PROVIDER_TYPES)}"
+        ]
+    vcs_instance_info = get_vcs_instance_info(vcs_type, vcs_answer)
+    results = {"url": vcs_url_validator(str(vcs_instance_info["url"]))}
+    if vcs_instance_info["name"]:
+        results["name"] = vcs_instance_name_validator(str(vcs_instance_info["name"]))
+    results["token"] = TOKEN_VALIDATORS[vcs_type](vcs_instance_info["token"])
+    if vcs_type == "GitHub":
+        results["username"] = github_username_validator(vcs_instance_info["username"])
+        results["scope"] = github_account_name_validator(
+            ", ".join(get_scope(vcs_instance_info, vcs_answer))
+        )
+    return [
+        f"{key}.{field}: {result}"
+        for field, result in results.items()
+        if result is not True
+    ]
+
+
+def get_vcs_instances(vcs_answers: dict) -> List[VcsInstance]:
+    """
+        Validate all VCS instance answers in one pass and build the VCS instances,
+        abort the program with every validation error if any answer is invalid
+    :param vcs_answers:
+        VCS instance answers by key, e.g. vcs_instances[0] or inventory.csv line 2
+    :return: List[VcsInstance]
+        Returns list of VCS instances
+    """
+    errors = []
+    names = {}
+    vcs_instances: List[VcsInstance] = []
+    for key, vcs_answer in vcs_answers.items():
+        vcs_type = find_vcs_type(vcs_answer.get("type"))
+        answer_errors = get_vcs_answer_errors(vcs_type, vcs_answer, key)
+        errors.extend(answer_errors)
+        if answer_errors:
+            continue
+
+        vcs_instance_info = get_vcs_instance_info(vcs_type, vcs_answer)
+        if vcs_instance_info["name"]:
+            prefix = get_credential_variable_prefix(vcs_instance_info["name"])
+            if prefix in names:
+                errors.append(
+                    f"{key}.name: {vcs_instance_info['name']} is already used by {names[prefix]}"
+                )
+                continue
+            names[prefix] = key
+        scope = get_scope(vcs_instance_info, vcs_answer) if vcs_type == "GitHub" else []
+        vcs_instances.append(
+            build_vcs_instance(
+                vcs_type=vcs_type, vcs_instance_info=vcs_instance_info, scope=scope
+            )
+        )
+
+    if len(errors) == 1:
+        logging.error(f"Aborting the program! Invalid value for {errors[0]}")
+        sys.exit(1)
+    if errors:
+        for error in errors:
+            logging.error(f"Invalid value for {error}")
+        logging.error(
+            f"Aborting the program! {len(errors)} invalid values were found in the VCS instances"
+        )
+        sys.exit(1)
+    return vcs_instances
+
+
+def read_vcs_inventory(inventory_file: str) -> dict:
+    """
+        Read a VCS inventory file. A CSV file has a header row with the columns
+        type, url, organization, username, token, scope and name, the GitHub scope
+        is separated by semicolons. A YAML or JSON file contains a list of VCS instances
+        like the vcs_instances answer, or a mapping with a vcs_instances key.
+    :param inventory_file:
+        path of the CSV, YAML or JSON inventory file
+    :return: dict
+        Returns VCS instance answers by key, the key refers to the line or index in the file
+    """
+    # Third Party
+    import yaml
+
+    file_name = os.path.basename(inventory_file)
+    try:
+        with open(inventory_file, "r", encoding="utf-8", newline="") as file_in:
+            if inventory_file.lower().endswith(".csv"):
+                # Comment lines are blanked, so line numbers in errors match the file
+                rows = csv.DictReader(
+                    (
+                        "\n" if line.lstrip().startswith("#") else line
+                        for line in file_in
+                    ),
+                    skipinitialspace=True,
+                )
+                vcs_answers = {}
+                for row in rows:
+                    vcs_answers[f"{file_name} line {rows.line_num}"] = {
+                        column.strip().lower(): (value or "").strip()
+                        for column, value in row.items()
+                        if column
+                    }
+                return vcs_answers
+            inventory = yaml.load(file_in, Loader=get_yaml_loader()) or []
+    except FileNotFoundError:
+        logging.error(f"Aborting the program! {inventory_file} file was not found")
+        sys.exit(1)
+    except (csv.Error, yaml.YAMLError) as error:
+        logging.error(f"Aborting the program! {inventory_file} is not valid: {error}")
+        sys.exit(1)
+
+    if isinstance(inventory, dict):
+        inventory = inventory.get("vcs_instances", [])
+    if not isinstance(inventory, list) or not all(
+        isinstance(vcs_answer, dict) for vcs_answer in inventory
+    ):
+        logging.error(
+            f"Aborting the program! {inventory_file} must contain a list of VCS instances"
+        )
+        sys.exit(1)
+    return {
+        f"{file_name}[{index}]": vcs_answer
+        for index, vcs_answer in enumerate(inventory)
+    }
+
+
+def get_vcs_instances_from_inventory(inventory_file: str) -> List[VcsInstance]:
+    """
+        Import all VCS instances of a VCS inventory file
+    :param inventory_file:
+        path of the CSV, YAML or JSON inventory file
+    :return: List[VcsInstance]
+        Returns list of VCS instances
+    """
+    vcs_answers = read_vcs_inventory(inventory_file)
+    if not vcs_answers:
+        logging.error(
+            f"Aborting the program! No VCS instance was found in {inventory_file}"
+        )
+        sys.exit(1)
+    vcs_instances = get_vcs_instances(vcs_answers)
+    logging.info(f"Imported {len(vcs_instances)} VCS instances from {inventory_file}")
+    return vcs_instances
@@ -0,0 +1,162 @@
+# Standard Library
+import logging
+import math
+import sys
+
+# First Party
+from resc_helm_wizard import constants
+from resc_helm_wizard.capacity import format_cpu, format_memory
+
+logging.basicConfig(level=logging.INFO)
+
+
+class WebServiceSize:
+    """
+    A class to represent the replicas, workers and resources of the web service.
+    Attributes
+    ----------
+    replicas : int
+        Number of web service replicas
+    workers : int
+        Number of uvicorn worker processes per replica
+    request_rate : float
+        Expected number of requests per second
+    cpu_cores : float
+        CPU available to the web service, None when unlimited
+    """
+
+    def __init__(
+        self,
+        replicas: int,
+        workers: int,
+        request_rate: float,
+        cpu_cores: float = None,
+    ):
+        self.replicas: int = replicas
+        self.workers: int = workers
+        self.request_rate: float = request_rate
+        self.cpu_cores: float = cpu_cores
+
+    def get_values(self) -> dict:
+        """
+            Get the helm values of the resc-web-service and resc-web-service-no-auth charts
+        :return: dict
+            Returns replicas, workers, resources and pod disruption budget values
+        """
+        cpu = self.workers * constants.WEB_SERVICE_CPU_PER_WORKER
+        memory = (
+            constants.WEB_SERVICE_BASE_MEMORY
+            + self.workers * constants.WEB_SERVICE_MEMORY_PER_WORKER
+        )
+        return {
+            "replicas": self.replicas,
+            "workers": self.workers,
+            "resources": {
+                "requests": {"cpu": format_cpu(cpu), "memory": format_memory(memory)},
+                "limits": {
+                    "cpu": format_cpu(cpu * 2),
+                    "memory": format_memory(memory * 1.5),
+                },
+            },
+            "podDisruptionBudget": {
+                "enabled": self.replicas > 1,
+                "minAvailable": max(self.replicas - 1, 1),
+            },
+        }
+
+
+def plan_web_service(request_rate: float, cpu_cores: float = None) -> WebServiceSize:
+    """
+        Size the web service for a request rate, a worker process serves a fixed number
+        of requests per second. At least 2 replicas keep the web service available
+        while a pod is replaced, unless the CPU only fits a single worker.
+    :param request_rate:
+        expected number of requests per second
+    :param cpu_cores:
+        CPU available to the web service, optional
+    :return: WebServiceSize
+        Returns object of WebServiceSize
+    """
+    total_workers = max(
+        math.ceil(request_rate / constants.WEB_SERVICE_REQUESTS_PER_WORKER), 1
+    )
+    replicas = max(
+        constants.WEB_SERVICE_MIN_REPLICAS,
+        math.ceil(total_workers / constants.WEB_SERVICE_MAX_WORKERS),
+    )
+    workers = math.ceil(total_workers / replicas)
+    if cpu_cores is not None:
+        max_workers = max(
+            math.floor(cpu_cores / constants.WEB_SERVICE_CPU_PER_WORKER), 1
+        )
+        if replicas * workers > max_workers:
+            replicas = max(
+                min(constants.WEB_SERVICE_MIN_REPLICAS, max_workers),
+                math.ceil(max_workers / constants.WEB_SERVICE_MAX_WORKERS),
+            )
+            workers = max_workers // replicas
+    return WebServiceSize(
+        replicas=replicas,
+        workers=workers,
+        request_rate=request_rate,
+        cpu_cores=cpu_cores,
+    )
+
+
+def log_web_service_size(web_service: WebServiceSize):
+    """
+        Log the size of the web service and warn if it can not serve the request rate
+    :param web_service:
+        object of WebServiceSize
+    """
+    capacity = (
+        web_service.replicas
+        * web_service.workers
+        * constants.WEB_SERVICE_REQUESTS_PER_WORKER
+    )
+    cpu = f" within {web_service.cpu_cores:g} CPU" if web_service.cpu_cores else ""
+    logging.info(
+        f"Web service: {web_service.replicas} replicas with {web_service.workers} workers "
+        f"for {web_service.request_rate:g} requests per second{cpu}"
+    )
+    if capacity < web_service.request_rate:
+        logging.warning(
+            f"The web service serves about {capacity} requests per second, "
+            f"provide more CPU to serve {web_service.request_rate:g} requests per second"
+        )
+
+
+def get_web_service_size(settings: dict) -> WebServiceSize:
+    """
+        Size and log the web service, abort the program if the settings are invalid
+    :param settings:
+        request_rate, required, and cpu_cores, optional
+    :return: WebServiceSize
+        Returns object of WebServiceSize
+    """
+    if (
+        not isinstance(settings, dict)
+        or "request_rate" not in settings
+        or set(settings) - {"request_rate", "cpu_cores"}
+    ):
+        logging.error(
+            "Aborting the program! Invalid value for web_service: "
+            "must be a mapping of request_rate and optionally cpu_cores"
+        )
+        sys.exit(1)
+    try:
+        request_rate = float(settings["request_rate"])
+        cpu_cores = settings.get("cpu_cores")
+        cpu_cores = None if cpu_cores is None else float(cpu_cores)
+    except (TypeError, ValueError) as error:
+        logging.error(f"Aborting the program! Invalid value for web_service: {error}")
+        sys.exit(1)
+    if request_rate <= 0 or (cpu_cores is not None and cpu_cores <= 0):
+        logging.error(
+            "Aborting the program! Invalid value for web_service: request_rate and "
+            "cpu_cores must be positive numbers"
+        )
+        sys.exit(1)
+    web_service = plan_web_service(request_rate=request_rate, cpu_cores=cpu_cores)
+    log_web_service_size(web_service)
+    return web_service
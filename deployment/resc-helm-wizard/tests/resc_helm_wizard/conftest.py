@@ -0,0 +1,8 @@
+# Third Party
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def fixture_cache_dir(tmp_path, monkeypatch):
+    # The rule pack, template snapshots and API responses are never cached in the home directory
+    monkeypatch.setenv("RESC_WIZARD_CACHE_DIR", str(tmp_path / "cache"))
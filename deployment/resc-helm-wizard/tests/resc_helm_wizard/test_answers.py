@@ -0,0 +1,155 @@
+# Standard Library
+import json
+from unittest.mock import patch
+
+# Third Party
+import pytest
+import yaml
+
+# First Party
+from resc_helm_wizard.answers import (
+    get_helm_values_from_answers,
+    get_vcs_instances_from_answers,
+    load_answers,
+    parse_bool,
+)
+
+GITHUB_TOKEN = "ghp_" + "a1B2" * 9
+AZURE_DEVOPS_TOKEN = "a1" * 26
+BITBUCKET_TOKEN = "a1B2c3D4e5" * 4
+
+
+def get_answers(tmp_path) -> dict:
+    return {
+        "operating_system": "Linux",
+        "local_storage_path": str(tmp_path),
+        "db_password": "LizardPass@123",
+        "vcs_instances": [
+            {
+                "type": "GitHub",
+                "username": "dummy-user",
+                "token": GITHUB_TOKEN,
+                "scope": ["kubernetes", "docker"],
+            },
+            {
+                "type": "AZURE_DEVOPS",
+                "organization": "dummy_org",
+                "token": AZURE_DEVOPS_TOKEN,
+            },
+            {
+                "type": "Bitbucket",
+                "url": "https://bitbucket.dummy.com:7999",
+                "username": "dummy_user",
+                "token": BITBUCKET_TOKEN,
+            },
+        ],
+    }
+
+
+def test_parse_bool():
+    assert parse_bool(True) is True
+    assert parse_bool("yes") is True
+    assert parse_bool("0") is False
+    with pytest.raises(ValueError):
+        parse_bool("maybe")
+
+
+def test_load_answers_from_yaml_file_with_environment_override(tmp_path, monkeypatch):
+    answers_file = tmp_path / "answers.yaml"
+    answers_file.write_text(yaml.dump(get_answers(tmp_path)), encoding="utf-8")
+    monkeypatch.setenv("RESC_WIZARD_DB_PASSWORD", "OtherPass@123")
+    monkeypatch.setenv("RESC_WIZARD_VERIFY_SSL", "false")
+
+    answers = load_answers(answers_file=str(answers_file))
+    assert answers["db_password"] == "OtherPass@123"
+    assert answers["verify_ssl"] is False
+    assert len(answers["vcs_instances"]) == 3
+
+
+def test_load_answers_from_environment_only(monkeypatch):
+    vcs_instances = [{"type": "GitHub", "username": "dummy", "token": GITHUB_TOKEN}]
+    monkeypatch.setenv("RESC_WIZARD_VCS_INSTANCES", json.dumps(vcs_instances))
+    answers = load_answers()
+    assert answers["vcs_instances"] == vcs_instances
+
+
+@patch("logging.Logger.error")
+def test_load_answers_sys_exit_when_file_not_exists(mock_error_log, tmp_path):
+    answers_file = str(tmp_path / "not_exist.yaml")
+    with pytest.raises(SystemExit) as excinfo:
+        load_answers(answers_file=answers_file)
+    mock_error_log.assert_called_with(
+        f"Aborting the program! {answers_file} file was not found"
+    )
+    assert excinfo.value.code == 1
+
+
+def test_get_helm_values_from_answers(tmp_path):
+    helm_values = get_helm_values_from_answers(get_answers(tmp_path))
+    assert helm_values.operating_system == "linux"
+    assert helm_values.db_password == "LizardPass@123"
+    assert helm_values.db_storage_path == str(tmp_path / "resc-db-storage")
+    assert helm_values.rabbitmq_storage_path == str(tmp_path / "resc-rabbitmq-storage")
+    assert (tmp_path / "resc-db-storage").is_dir()
+
+    vcs_instances = helm_values.vcs_instances
+    assert vcs_instances[0].provider_type == "GITHUB_PUBLIC"
+    assert vcs_instances[0].host == "github.com"
+    assert vcs_instances[0].scope == ["kubernetes", "docker"]
+    assert vcs_instances[1].provider_type == "AZURE_DEVOPS"
+    assert vcs_instances[1].host == "dev.azure.com"
+    assert vcs_instances[1].organization == "dummy_org"
+    assert vcs_instances[2].provider_type == "BITBUCKET"
+    assert vcs_instances[2].port == "7999"
+
+
+@patch("logging.Logger.error")
+def test_get_helm_values_from_answers_sys_exit_when_password_invalid(
+    mock_error_log, tmp_path
+):
+    answers = get_answers(tmp_path)
+    answers["db_password"] = "weak"
+    with pytest.raises(SystemExit) as excinfo:
+        get_helm_values_from_answers(answers)
+    assert "Invalid value for db_password" in mock_error_log.call_args.args[0]
+    assert excinfo.value.code == 1
+
+
+@patch("logging.Logger.error")
+def test_get_helm_values_from_answers_sys_exit_when_answer_missing(
+    mock_error_log, tmp_path
+):
+    answers = get_answers(tmp_path)
+    del answers["db_password"]
+    with pytest.raises(SystemExit) as excinfo:
+        get_helm_values_from_answers(answers)
+    mock_error_log.assert_called_with(
+        "Aborting the program! db_password was missing in the answers, "
+        "provide it in the answers file or as RESC_WIZARD_DB_PASSWORD"
+    )
+    assert excinfo.value.code == 1
+
+
+@patch("logging.Logger.error")
+def test_get_vcs_instances_from_answers_sys_exit_when_token_invalid(mock_error_log):
+    answers = {
+        "vcs_instances": [{"type": "GitHub", "username": "dummy", "token": "invalid"}]
+    }
+    with pytest.raises(SystemExit) as excinfo:
+        get_vcs_instances_from_answers(answers)
+    mock_error_log.assert_called_with(
+        "Aborting the program! Invalid value for vcs_instances[0].token: "
+        "Validation failed for provided GitHub token"
+    )
+    assert excinfo.value.code == 1
+
+
+@patch("logging.Logger.error")
+def test_get_vcs_instances_from_answers_sys_exit_when_type_unsupported(
+    mock_error_log,
+):
+    answers = {"vcs_instances": [{"type": "GitLab", "token": "dummy"}]}
+    with pytest.raises(SystemExit) as excinfo:
+        get_vcs_instances_from_answers(answers)
+    assert "Unsupported VCS instance type 'GitLab'" in mock_error_log.call_args.args[0]
+    assert excinfo.value.code == 1
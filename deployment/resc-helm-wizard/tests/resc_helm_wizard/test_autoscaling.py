@@ -0,0 +1,119 @@
+# Standard Library
+import os
+from pathlib import Path
+from unittest.mock import call, patch
+
+# Third Party
+import pytest
+import yaml
+
+# First Party
+from resc_helm_wizard.autoscaling import get_scanner_autoscaling
+from resc_helm_wizard.capacity import plan_capacity
+from resc_helm_wizard.common import create_helm_values_yaml
+from resc_helm_wizard.helm_value import HelmValue
+from resc_helm_wizard.run_wizard import ask_scanner_autoscaling, main
+
+THIS_DIR = Path(__file__).parent
+
+
+def test_get_scanner_autoscaling_defaults():
+    autoscaling = get_scanner_autoscaling({})
+    assert autoscaling.get_values() == {
+        "enabled": True,
+        "provider": "keda",
+        "minReplicas": 0,
+        "maxReplicas": 10,
+        "messagesPerReplica": 1,
+    }
+
+    # The planned scanner replicas are the default maximum
+    capacity_plan = plan_capacity(5000, 100 * 1024**3, scan_window_hours=8)
+    autoscaling = get_scanner_autoscaling(
+        {"min_replicas": "1", "provider": "HPA"}, capacity_plan=capacity_plan
+    )
+    assert (autoscaling.min_replicas, autoscaling.max_replicas) == (1, 5)
+    assert autoscaling.provider == "hpa"
+
+
+@patch("logging.Logger.error")
+def test_get_scanner_autoscaling_reports_invalid_settings(mock_error_log):
+    with pytest.raises(SystemExit):
+        get_scanner_autoscaling(
+            {"min_replicas": 4, "max_replicas": 2, "provider": "knative"}
+        )
+    assert mock_error_log.call_args_list == [
+        call(
+            "Invalid value for scanner_autoscaling.provider: knative is not supported, "
+            "supported providers are keda, hpa"
+        ),
+        call(
+            "Aborting the program! Invalid value for scanner_autoscaling.max_replicas: "
+            "2 must be at least 1 and at least min_replicas"
+        ),
+    ]
+
+
+def test_create_helm_values_yaml_with_scanner_autoscaling(tmp_path):
+    helm_values = HelmValue(
+        operating_system="linux",
+        db_password="dummy_pass",
+        db_storage_path="/temp/db",
+        rabbitmq_storage_path="/temp/rabbitmq",
+        vcs_instances=[],
+        scanner_autoscaling=get_scanner_autoscaling(
+            {"min_replicas": 0, "max_replicas": 6}
+        ),
+    )
+    input_file_path = os.path.join(THIS_DIR, "fixtures", "test-values.yaml")
+    output_file_path = str(tmp_path / "custom-values.yaml")
+    assert create_helm_values_yaml(helm_values, input_file_path, output_file_path)
+
+    with open(output_file_path, "r", encoding="utf-8") as file_in:
+        values = yaml.safe_load(file_in)
+    autoscaling_values = values["resc-vcs-scanner-secrets"]["autoscaling"]
+    assert autoscaling_values["enabled"] is True
+    assert autoscaling_values["maxReplicas"] == 6
+
+
+@patch("resc_helm_wizard.answers.load_answers")
+@patch("resc_helm_wizard.answers.get_helm_values_from_answers")
+@patch("resc_helm_wizard.common.create_helm_values_yaml")
+def test_main_autoscale_scanners_overrides_answers(
+    create_helm_values_yaml, get_helm_values_from_answers, load_answers
+):
+    load_answers.return_value = {
+        "run_deployment": False,
+        "scanner_autoscaling": {"max_replicas": 20, "provider": "hpa"},
+    }
+    get_helm_values_from_answers.return_value.capacity_plan = None
+    main(["--answers-file", "answers.yaml", "--autoscale-scanners", "1", "8"])
+    helm_values = create_helm_values_yaml.call_args.kwargs["helm_values"]
+    assert helm_values.scanner_autoscaling.get_values()["provider"] == "hpa"
+    assert helm_values.scanner_autoscaling.min_replicas == 1
+    assert helm_values.scanner_autoscaling.max_replicas == 8
+
+
+@patch("resc_helm_wizard.questions.ask_scanner_autoscaling")
+@patch("resc_helm_wizard.questions.ask_user_confirmation")
+def test_ask_scanner_autoscaling_is_opt_in(
+    ask_user_confirmation, questions_ask_scanner_autoscaling
+):
+    ask_user_confirmation.return_value = False
+    assert ask_scanner_autoscaling(scanner_autoscaling=None) is None
+    assert ask_user_confirmation.call_args.kwargs["default"] is False
+    questions_ask_scanner_autoscaling.assert_not_called()
+
+    ask_user_confirmation.return_value = True
+    questions_ask_scanner_autoscaling.return_value = {
+        "min_replicas": 0,
+        "max_replicas": 4,
+    }
+    autoscaling = ask_scanner_autoscaling(scanner_autoscaling=None)
+    assert (autoscaling.min_replicas, autoscaling.max_replicas) == (0, 4)
+
+    # The replicas of the command line option are not asked
+    ask_user_confirmation.reset_mock()
+    autoscaling = ask_scanner_autoscaling(scanner_autoscaling=[1, 8])
+    assert (autoscaling.min_replicas, autoscaling.max_replicas) == (1, 8)
+    ask_user_confirmation.assert_not_called()
@@ -0,0 +1,136 @@
+# Standard Library
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+# Third Party
+import yaml
+
+# First Party
+from resc_helm_wizard.capacity import (
+    get_repository_totals,
+    get_vcs_instance_totals,
+    plan_capacity,
+    read_repository_inventory,
+)
+from resc_helm_wizard.common import create_helm_values_yaml
+from resc_helm_wizard.helm_value import HelmValue
+
+THIS_DIR = Path(__file__).parent
+
+
+def test_get_repository_totals_from_repository_inventory():
+    inventory = {
+        "vcs_instances": {
+            "GITHUB_PUBLIC": {
+                "scopes": {"team-a": {"repositories": 6, "size_bytes": 61440}}
+            },
+            "BITBUCKET": {
+                "scopes": {
+                    "PRJ1": {"repositories": 3, "size_bytes": None},
+                    "PRJ2": {"repositories": 3, "size_bytes": None},
+                }
+            },
+        }
+    }
+    assert get_repository_totals(inventory) == (12, 61440, 6)
+    assert get_vcs_instance_totals(inventory) == {
+        "GITHUB_PUBLIC": (6, 61440, 0),
+        "BITBUCKET": (6, 0, 6),
+    }
+    assert get_repository_totals({"repositories": 100}) == (100, 0, 100)
+    assert get_repository_totals({"repositories": 100, "size_bytes": 1024}) == (
+        100,
+        1024,
+        0,
+    )
+
+
+def test_read_repository_inventory(tmp_path):
+    inventory_file = tmp_path / "inventory.json"
+    inventory_file.write_text(
+        json.dumps({"repositories": 5000, "size_bytes": 10 * 1024**3}),
+        encoding="utf-8",
+    )
+    inventory = read_repository_inventory(str(inventory_file))
+    assert get_repository_totals(inventory) == (5000, 10 * 1024**3, 0)
+
+
+def test_plan_capacity_scales_scanner_replicas_with_scan_window():
+    # 5000 x 20s + 100 GiB at 5 MiB/s = 33.5 scanner hours
+    capacity_plan = plan_capacity(
+        repositories=5000, size_bytes=100 * 1024**3, scan_window_hours=8
+    )
+    assert capacity_plan.scanner_replicas == 5
+    scanner_values = capacity_plan.values["resc-vcs-scanner-secrets"]
+    assert scanner_values["replicas"] == 5
+    assert scanner_values["resources"]["requests"]["memory"] == "576Mi"
+    assert capacity_plan.values["resc-database"]["database"]["pvc_size"] == "12Gi"
+    assert "33.5 scanner hours" in capacity_plan.explanation[1]
+
+    assert (
+        plan_capacity(5000, 100 * 1024**3, scan_window_hours=24).scanner_replicas == 2
+    )
+    assert plan_capacity(10**6, 0, scan_window_hours=1).scanner_replicas == 50
+
+
+def test_plan_capacity_counts_repositories_of_unknown_size():
+    capacity_plan = plan_capacity(
+        repositories=10, size_bytes=0, scan_window_hours=1, unknown_size_repositories=10
+    )
+    assert capacity_plan.size_bytes == 10 * 50 * 1024**2
+    assert "10 repositories of unknown size" in capacity_plan.explanation[1]
+
+
+@patch("resc_helm_wizard.common.is_existing_release")
+def test_create_helm_values_yaml_with_capacity_plan(is_existing_release, tmp_path):
+    is_existing_release.return_value = False
+    helm_values = HelmValue(
+        operating_system="linux",
+        db_password="dummy_pass",
+        db_storage_path="/temp/db",
+        rabbitmq_storage_path="/temp/rabbitmq",
+        vcs_instances=[],
+        capacity_plan=plan_capacity(5000, 100 * 1024**3, scan_window_hours=8),
+    )
+    input_file_path = os.path.join(THIS_DIR, "fixtures", "test-values.yaml")
+    output_file_path = str(tmp_path / "custom-values.yaml")
+    assert create_helm_values_yaml(helm_values, input_file_path, output_file_path)
+
+    with open(output_file_path, "r", encoding="utf-8") as file_in:
+        content = file_in.read()
+    assert content.startswith("# Capacity plan for 5000 repositories")
+    values = yaml.safe_load(content)
+    assert values["resc-vcs-scanner-secrets"]["replicas"] == 5
+    assert values["resc-rabbitmq"]["rabbitMQ"]["pvc_path"] == "/temp/rabbitmq"
+    assert values["resc-rabbitmq"]["rabbitMQ"]["pvc_size"] == "10Gi"
+
+
+@patch("resc_helm_wizard.common.is_existing_release")
+def test_create_helm_values_yaml_keeps_the_volumes_of_a_release(
+    is_existing_release, tmp_path
+):
+    is_existing_release.return_value = True
+    capacity_plan = plan_capacity(5000, 100 * 1024**3, scan_window_hours=8)
+    capacity_plan.values["resc-rabbitmq"]["rabbitMQ"]["pvc_size"] = "30Gi"
+    helm_values = HelmValue(
+        operating_system="linux",
+        db_password="dummy_pass",
+        db_storage_path="/temp/db",
+        rabbitmq_storage_path="/temp/rabbitmq",
+        vcs_instances=[],
+        capacity_plan=capacity_plan,
+    )
+    input_file_path = os.path.join(THIS_DIR, "fixtures", "test-values.yaml")
+    output_file_path = str(tmp_path / "custom-values.yaml")
+    assert create_helm_values_yaml(helm_values, input_file_path, output_file_path)
+
+    with open(output_file_path, "r", encoding="utf-8") as file_in:
+        values = yaml.safe_load(file_in)
+    assert values["resc-rabbitmq"]["rabbitMQ"]["pvc_size"] == "10Gi"
+    assert values["resc-database"]["database"]["pvc_size"] == "10Gi"
+    # The resources of the capacity plan still apply
+    assert values["resc-vcs-scanner-secrets"]["replicas"] == 5
+    assert capacity_plan.values["resc-database"]["database"]["pvc_size"] == "12Gi"
+    is_existing_release.assert_called_once_with(kube_context=None)
@@ -1,5 +1,6 @@
 # Standard Library
 import os
+import time
 from pathlib import Path
 from typing import List
 from unittest.mock import patch
@@ -9,7 +10,9 @@ import pytest
 import yaml
 
 # First Party
+from resc_helm_wizard import common
 from resc_helm_wizard.common import (
+    get_vcs_instance_names,
     create_helm_values_yaml,
     create_storage_for_db_and_rabbitmq,
     download_rule_toml_file,
@@ -17,8 +20,12 @@ from resc_helm_wizard.common import (
     get_operating_system,
     get_scheme_host_port_from_url,
     get_vcs_instance_question_answers,
+    load_yaml_template,
     prepare_vcs_instances_for_helm_values,
+    read_yaml_file,
+    run_deployment,
     run_deployment_as_per_user_confirmation,
+    run_preflight_checks,
 )
 from resc_helm_wizard.helm_value import HelmValue
 from resc_helm_wizard.vcs_instance import VcsInstance
@@ -87,6 +94,59 @@ def test_prepare_vcs_instances_for_helm_values():
     assert output_vcs_instances[0]["organization"] == "dummy_org"
 
 
+def create_vcs_instance(provider_type: str, host: str, name: str = None):
+    return VcsInstance(
+        provider_type=provider_type,
+        scheme="https",
+        host=host,
+        port="443",
+        username="dummy_user",
+        password="dummy_pass",
+        organization="",
+        scope=[],
+        name=name,
+    )
+
+
+def test_get_vcs_instance_names_are_unique():
+    vcs_instances = [
+        create_vcs_instance("GITHUB_PUBLIC", "github.com"),
+        create_vcs_instance("BITBUCKET", "bitbucket-eu.example.com"),
+        create_vcs_instance("BITBUCKET", "bitbucket-us.example.com"),
+        create_vcs_instance("BITBUCKET", "bitbucket-us.example.com"),
+        create_vcs_instance("BITBUCKET", "bitbucket-ap.example.com", name="bb-asia"),
+    ]
+    assert get_vcs_instance_names(vcs_instances) == [
+        "GITHUB_PUBLIC",
+        "BITBUCKET_BITBUCKET_EU_EXAMPLE_COM",
+        "BITBUCKET_BITBUCKET_US_EXAMPLE_COM",
+        "BITBUCKET_BITBUCKET_US_EXAMPLE_COM_2",
+        "bb-asia",
+    ]
+
+
+def test_prepare_vcs_instances_for_helm_values_with_instances_of_same_type():
+    helm_values = HelmValue(
+        operating_system="linux",
+        db_password="dummy_pass",
+        db_storage_path="/temp/db",
+        rabbitmq_storage_path="/temp/rabbitmq",
+        vcs_instances=[
+            create_vcs_instance("BITBUCKET", "bitbucket1.example.com"),
+            create_vcs_instance("BITBUCKET", "bitbucket2.example.com", name="bb-2"),
+        ],
+    )
+    output_vcs_instances = prepare_vcs_instances_for_helm_values(
+        helm_values=helm_values
+    )
+    assert output_vcs_instances[0]["name"] == "BITBUCKET_BITBUCKET1_EXAMPLE_COM"
+    assert output_vcs_instances[0]["username"] == (
+        "BITBUCKET_BITBUCKET1_EXAMPLE_COM_USERNAME"
+    )
+    assert output_vcs_instances[1]["name"] == "bb-2"
+    assert output_vcs_instances[1]["token"] == "BB_2_TOKEN"
+
+
 def test_generate_pvc_path_when_create_dir_false():
     pvc_path_db_linux_with_skip_create_dir = generate_pvc_path(
         operating_system="linux", path="/tmp", tool_type="database", create_dir=False
@@ -382,56 +442,72 @@ def test_create_helm_values_sys_exit_when_key_not_exists(
     assert excinfo.value.code == 1
 
 
+def test_read_yaml_file_caches_parsed_template(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESC_WIZARD_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(common, "_TEMPLATE_SNAPSHOTS", {})
+    values_dict = read_yaml_file("config/example-values.yaml")
+    assert len(list((tmp_path / "templates").iterdir())) == 1
+
+    values_dict["resc-database"]["filemountType"] = "modified"
+    monkeypatch.setattr(common, "_TEMPLATE_SNAPSHOTS", {})
+    with patch("yaml.load") as mock_yaml_load:
+        cached_values_dict = read_yaml_file("config/example-values.yaml")
+    mock_yaml_load.assert_not_called()
+    assert cached_values_dict["resc-database"]["filemountType"] != "modified"
+
+
+def test_load_yaml_template_ignores_corrupt_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESC_WIZARD_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(common, "_TEMPLATE_SNAPSHOTS", {})
+    content = b"resc-database:\n  filemountType: linux\n"
+    load_yaml_template(content)
+    snapshot_path = list((tmp_path / "templates").iterdir())[0]
+    snapshot_path.write_bytes(b"corrupt")
+    monkeypatch.setattr(common, "_TEMPLATE_SNAPSHOTS", {})
+    assert load_yaml_template(content) == {"resc-database": {"filemountType": "linux"}}
+
+
 @patch("resc_helm_wizard.questions.ask_ssl_verification")
-@patch("requests.get")
+@patch("requests.Session.get")
 @patch("logging.Logger.debug")
 def test_download_rule_toml_file_success(
-    mock_debug_log, mock_get, mock_ask_ssl_verification_confirm
+    mock_debug_log, mock_get, mock_ask_ssl_verification_confirm, tmp_path
 ):
     url = "https://example.com/rule_file.toml"
-    file = "temp_file.toml"
+    file = str(tmp_path / "temp_file.toml")
     content = b"file content"
     expected_debug_log = f"{file} successfully downloaded"
     mock_ask_ssl_verification_confirm.return_value = True
     mock_get.return_value.status_code = 200
-    mock_get.return_value.content = content
-    downloaded = download_rule_toml_file(url=url, file=file)
+    mock_get.return_value.iter_content.return_value = [content]
+    mock_get.return_value.headers = {}
+    downloaded = download_rule_toml_file(urls=[url], file=file)
     assert downloaded is True
     mock_debug_log.assert_called_with(expected_debug_log)
     with open(file, "rb") as file_output:
         assert file_output.read() == content
-    if os.path.isfile(file):
-        os.remove(file)
 
 
 @patch("resc_helm_wizard.questions.ask_ssl_verification")
-@patch("requests.get")
-@patch("os.path.exists")
-@patch("os.path.getsize")
+@patch("requests.Session.get")
+@patch("resc_helm_wizard.constants.RULE_PACK_RETRY_BACKOFF", 0)
 @patch("logging.Logger.error")
 def test_download_rule_toml_file_failure(
     mock_error_log,
-    mock_os_path_getsize,
-    mock_os_path_exists,
     mock_get,
     mock_ask_ssl_verification_confirm,
+    tmp_path,
 ):
     url = "https://example.com/rule_file.toml"
-    file = "temp_file.toml"
-    content = b"file content"
+    file = str(tmp_path / "temp_file.toml")
     expected_error_log = "Unable to download the rule file"
     mock_ask_ssl_verification_confirm.return_value = True
-    mock_os_path_exists.return_value = False
-    mock_os_path_getsize.return_value = -1
     mock_get.return_value.status_code = 500
-    mock_get.return_value.content = content
-    downloaded = download_rule_toml_file(url=url, file=file)
+    mock_get.return_value.headers = {}
+    downloaded = download_rule_toml_file(urls=[url], file=file)
     assert downloaded is False
     mock_error_log.assert_called_with(expected_error_log)
-    with open(file, "rb") as file_output:
-        assert file_output.read() == content
-    if os.path.isfile(file):
-        os.remove(file)
+    assert not os.path.exists(file)
 
 
 @patch("resc_helm_wizard.questions.ask_user_confirmation")
@@ -460,3 +536,156 @@ def test_run_deployment_as_per_user_confirmation_no(
     assert deployment_status is None
     mock_ask_user_confirmation.assert_called_once_with(msg=run_deployment_confirm_msg)
     mock_log_info.assert_called_with(expected_info_log)
+
+
+@patch("resc_helm_wizard.common.download_rule_toml_file")
+@patch("resc_helm_wizard.common.refresh_helm_repository")
+@patch("resc_helm_wizard.common.create_namespace_if_not_exists")
+@patch("resc_helm_wizard.common.check_helm_release_exists")
+@patch("logging.Logger.info")
+def test_run_preflight_checks_runs_steps_in_parallel(
+    mock_info_log,
+    mock_check_helm_release_exists,
+    mock_create_namespace,
+    mock_refresh_helm_repository,
+    mock_download_rule_toml_file,
+):
+    def slow_step(result):
+        def step(**_):
+            time.sleep(0.2)
+            return result
+
+        return step
+
+    mock_download_rule_toml_file.side_effect = slow_step(True)
+    mock_refresh_helm_repository.side_effect = slow_step(None)
+    mock_create_namespace.side_effect = slow_step(True)
+    mock_check_helm_release_exists.side_effect = slow_step(False)
+
+    start_time = time.monotonic()
+    preflight = run_preflight_checks(verify_ssl=False)
+    assert time.monotonic() - start_time < 0.6
+    assert preflight == {
+        "rule_file_downloaded": True,
+        "helm_repository_refreshed": None,
+        "namespace_created": True,
+        "helm_release_exists": False,
+    }
+    mock_download_rule_toml_file.assert_called_once_with(
+        urls=[
+            "https://raw.githubusercontent.com/zricethezav/gitleaks/master/config/gitleaks.toml"
+        ],
+        file="RESC-RULE.toml",
+        verify_ssl=False,
+    )
+    assert "Preflight checks finished in" in mock_info_log.call_args.args[0]
+
+
+@patch("resc_helm_wizard.questions.ask_ssl_verification")
+@patch("resc_helm_wizard.common.run_preflight_checks")
+@patch("resc_helm_wizard.questions.ask_user_confirmation")
+@patch("resc_helm_wizard.common.get_deployment_fingerprint")
+@patch("resc_helm_wizard.common.is_release_up_to_date")
+@patch("resc_helm_wizard.common.deploy_with_readiness_watch")
+@patch("resc_helm_wizard.common.validate_helm_deployment_status")
+@patch("resc_helm_wizard.common.report_restarts")
+def test_run_deployment_upgrade_existing_release(
+    mock_report_restarts,
+    mock_validate_helm_deployment_status,
+    mock_deploy_with_readiness_watch,
+    mock_is_release_up_to_date,
+    mock_get_deployment_fingerprint,
+    mock_ask_user_confirmation,
+    mock_run_preflight_checks,
+    mock_ask_ssl_verification,
+):
+    mock_ask_ssl_verification.return_value = True
+    mock_get_deployment_fingerprint.return_value = "abc123"
+    mock_is_release_up_to_date.return_value = False
+    mock_run_preflight_checks.return_value = {
+        "rule_file_downloaded": True,
+        "helm_repository_refreshed": None,
+        "namespace_created": True,
+        "helm_release_exists": True,
+    }
+    mock_ask_user_confirmation.return_value = True
+    mock_deploy_with_readiness_watch.return_value = True
+
+    assert run_deployment() == "upgraded"
+    mock_run_preflight_checks.assert_called_once_with(verify_ssl=True)
+    mock_report_restarts.assert_called_once_with()
+    mock_deploy_with_readiness_watch.assert_called_once_with(
+        action="upgrade", fingerprint="abc123"
+    )
+    mock_validate_helm_deployment_status.assert_called_once_with()
+
+
+@patch("resc_helm_wizard.common.run_preflight_checks")
+@patch("resc_helm_wizard.questions.ask_user_confirmation")
+@patch("resc_helm_wizard.common.get_deployment_fingerprint")
+@patch("resc_helm_wizard.common.is_release_up_to_date")
+@patch("resc_helm_wizard.common.deploy_with_readiness_watch")
+def test_run_deployment_skips_upgrade_when_release_up_to_date(
+    mock_deploy_with_readiness_watch,
+    mock_is_release_up_to_date,
+    mock_get_deployment_fingerprint,
+    mock_ask_user_confirmation,
+    mock_run_preflight_checks,
+):
+    mock_run_preflight_checks.return_value = {
+        "rule_file_downloaded": True,
+        "helm_repository_refreshed": None,
+        "namespace_created": True,
+        "helm_release_exists": True,
+    }
+    mock_get_deployment_fingerprint.return_value = "abc123"
+    mock_is_release_up_to_date.return_value = True
+
+    assert run_deployment(verify_ssl=True, upgrade_release=True) == "unchanged"
+    mock_is_release_up_to_date.assert_called_once_with(fingerprint="abc123")
+    mock_ask_user_confirmation.assert_not_called()
+    mock_deploy_with_readiness_watch.assert_not_called()
+
+
+@patch("resc_helm_wizard.common.run_preflight_checks")
+@patch("resc_helm_wizard.common.deploy_with_readiness_watch")
+def test_run_deployment_skipped_when_rule_file_not_downloaded(
+    mock_deploy_with_readiness_watch, mock_run_preflight_checks
+):
+    mock_run_preflight_checks.return_value = {
+        "rule_file_downloaded": False,
+        "helm_repository_refreshed": None,
+        "namespace_created": True,
+        "helm_release_exists": False,
+    }
+    assert run_deployment(verify_ssl=True, upgrade_release=True) == "failed"
+    mock_deploy_with_readiness_watch.assert_not_called()
+
+
+@patch("resc_helm_wizard.common.run_preflight_checks")
+@patch("resc_helm_wizard.common.get_deployment_fingerprint")
+@patch("resc_helm_wizard.common.is_release_up_to_date")
+@patch("resc_helm_wizard.common.deploy_with_readiness_watch")
+@patch("resc_helm_wizard.common.report_restarts")
+def test_run_deployment_skips_declined_upgrade(
+    mock_report_restarts,
+    mock_deploy_with_readiness_watch,
+    mock_is_release_up_to_date,
+    mock_get_deployment_fingerprint,
+    mock_run_preflight_checks,
+):
+    mock_run_preflight_checks.return_value = {
+        "rule_file_downloaded": True,
+        "helm_repository_refreshed": None,
+        "namespace_created": True,
+        "helm_release_exists": True,
+    }
+    mock_get_deployment_fingerprint.return_value = "abc123"
+    mock_is_release_up_to_date.return_value = False
+    assert run_deployment(verify_ssl=True, upgrade_release=False) == "skipped"
+    mock_deploy_with_readiness_watch.assert_not_called()
+
+    # A failing install is not skipped when upgrades are declined
+    mock_run_preflight_checks.return_value["helm_release_exists"] = False
+    mock_deploy_with_readiness_watch.return_value = False
+    assert run_deployment(verify_ssl=True, upgrade_release=False) == "failed"
@@ -0,0 +1,125 @@
+# Standard Library
+import base64
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+# Third Party
+import pytest
+
+# First Party
+from resc_helm_wizard.credentials import verify_vcs_credentials
+from resc_helm_wizard.vcs_api import HostRateLimiter, get_api_url
+from resc_helm_wizard.vcs_instance import VcsInstance
+
+VALID_TOKEN = "valid-token"
+REQUESTS = []
+
+
+class MockVcsApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802
+        REQUESTS.append(self.path)
+        authorization = self.headers.get("Authorization", "")
+        if self.path.startswith("/api/v3/user"):
+            authorized = authorization == f"token {VALID_TOKEN}"
+        elif self.path.startswith("/missing-org/_apis/"):
+            self.send_response(404)
+            self.end_headers()
+            return
+        elif "/_apis/projects" in self.path:
+            expected = base64.b64encode(f":{VALID_TOKEN}".encode()).decode()
+            authorized = authorization == f"Basic {expected}"
+        else:
+            authorized = authorization == f"Bearer {VALID_TOKEN}"
+        self.send_response(200 if authorized else 401)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture(name="api_port")
+def fixture_api_port():
+    REQUESTS.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockVcsApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield str(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+def create_vcs_instance(
+    provider_type: str, port: str, token: str = VALID_TOKEN, organization: str = ""
+) -> VcsInstance:
+    return VcsInstance(
+        provider_type=provider_type,
+        scheme="http",
+        host="127.0.0.1",
+        port=port,
+        username="NA",
+        password=token,
+        organization=organization,
+        scope=[],
+    )
+
+
+def test_get_api_url():
+    github = create_vcs_instance("GITHUB_PUBLIC", "443")
+    github.scheme, github.host = "https", "github.com"
+    assert get_api_url(github) == "https://api.github.com"
+    assert get_api_url(create_vcs_instance("GITHUB_PUBLIC", "8443")) == (
+        "http://127.0.0.1:8443/api/v3"
+    )
+    bitbucket = create_vcs_instance("BITBUCKET", "80")
+    assert get_api_url(bitbucket) == "http://127.0.0.1/rest/api/1.0"
+
+
+@patch("logging.Logger.info")
+def test_verify_vcs_credentials_valid_and_cached(mock_info_log, api_port):
+    vcs_instances = [
+        create_vcs_instance("GITHUB_PUBLIC", api_port),
+        create_vcs_instance("AZURE_DEVOPS", api_port, organization="resc"),
+        create_vcs_instance("BITBUCKET", api_port),
+    ]
+    assert verify_vcs_credentials(vcs_instances) is True
+    assert len(REQUESTS) == 3
+    assert "127.0.0.1" in mock_info_log.call_args.args[0]
+
+    assert verify_vcs_credentials(vcs_instances) is True
+    assert len(REQUESTS) == 3
+    assert "cached" in mock_info_log.call_args.args[0]
+
+
+@patch("logging.Logger.error")
+def test_verify_vcs_credentials_reports_rejected_credentials(mock_error_log, api_port):
+    vcs_instances = [
+        create_vcs_instance("BITBUCKET", api_port, token="revoked-token"),
+        create_vcs_instance("AZURE_DEVOPS", api_port, organization="missing-org"),
+    ]
+    assert verify_vcs_credentials(vcs_instances) is False
+    errors = [call.args[0] for call in mock_error_log.call_args_list]
+    assert errors == [
+        "Credentials of VCS instance BITBUCKET could not be verified: "
+        "credentials were rejected with HTTP 401",
+        "Credentials of VCS instance AZURE_DEVOPS could not be verified: "
+        "organization missing-org was not found",
+    ]
+
+    # Failed verifications are not cached
+    assert verify_vcs_credentials(vcs_instances) is False
+    assert len(REQUESTS) == 4
+
+
+def test_host_rate_limiter_spaces_requests_per_host():
+    rate_limiter = HostRateLimiter(max_concurrent=2, min_interval=0.05)
+    start_time = time.monotonic()
+    for _ in range(3):
+        with rate_limiter.limit("bitbucket.example.com"):
+            pass
+    with rate_limiter.limit("github.com"):
+        pass
+    assert 0.1 <= time.monotonic() - start_time < 0.5
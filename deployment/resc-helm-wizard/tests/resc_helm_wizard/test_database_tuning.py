@@ -0,0 +1,140 @@
+# Standard Library
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+# Third Party
+import pytest
+import yaml
+
+# First Party
+from resc_helm_wizard.capacity import plan_capacity
+from resc_helm_wizard.common import create_helm_values_yaml
+from resc_helm_wizard.database_tuning import (
+    get_database_tuning_settings,
+    plan_database_tuning,
+)
+from resc_helm_wizard.helm_value import HelmValue
+
+THIS_DIR = Path(__file__).parent
+
+
+def test_plan_database_tuning():
+    # Chart default resources and volume
+    tuning = plan_database_tuning({})
+    assert tuning.get_values() == {
+        "tuning": {
+            "memoryLimitMb": 1525,
+            "maxDegreeOfParallelism": 2,
+            "tempdbFiles": 2,
+        },
+        "pvc_size": "10Gi",
+    }
+
+    tuning = plan_database_tuning(
+        {"requests": {"cpu": "2"}, "limits": {"cpu": "12", "memory": "16Gi"}},
+        pvc_size="10Gi",
+        expected_findings=5_000_000,
+    )
+    assert tuning.memory_limit_mb == 13107
+    assert (tuning.max_degree_of_parallelism, tuning.tempdb_files) == (8, 8)
+    assert tuning.pvc_size == "41Gi"
+
+    # Less than a core still runs a single tempdb file and a volume is never shrunk
+    tuning = plan_database_tuning(
+        {"limits": {"cpu": "500m", "memory": "1Gi"}}, pvc_size="100Gi"
+    )
+    assert (tuning.max_degree_of_parallelism, tuning.pvc_size) == (1, "100Gi")
+
+
+@patch("logging.Logger.error")
+def test_get_database_tuning_settings_sys_exit_when_settings_invalid(mock_error_log):
+    assert get_database_tuning_settings({"expected_findings": "1000"}) == {
+        "expected_findings": 1000
+    }
+    with pytest.raises(SystemExit) as excinfo:
+        get_database_tuning_settings({"expected_findings": -1})
+    mock_error_log.assert_called_once_with(
+        "Aborting the program! Invalid value for database_tuning: "
+        "expected_findings: -1 is not a whole number"
+    )
+    assert excinfo.value.code == 1
+
+
+@patch("resc_helm_wizard.common.is_existing_release")
+def test_create_helm_values_yaml_tunes_the_planned_database(
+    is_existing_release, tmp_path
+):
+    is_existing_release.return_value = False
+    helm_values = HelmValue(
+        operating_system="linux",
+        db_password="dummy_pass",
+        db_storage_path="/temp/db",
+        rabbitmq_storage_path="/temp/rabbitmq",
+        vcs_instances=[],
+        capacity_plan=plan_capacity(5000, 100 * 1024**3, scan_window_hours=8),
+        database_tuning={"expected_findings": 10_000_000},
+    )
+    input_file_path = os.path.join(THIS_DIR, "fixtures", "test-values.yaml")
+    output_file_path = str(tmp_path / "custom-values.yaml")
+    assert create_helm_values_yaml(helm_values, input_file_path, output_file_path)
+
+    with open(output_file_path, "r", encoding="utf-8") as file_in:
+        values = yaml.safe_load(file_in)
+    database = values["resc-database"]["database"]
+    # The capacity plan limits the database to 3 cores and 8832Mi memory
+    assert database["resources"]["limits"] == {"cpu": "3000m", "memory": "8832Mi"}
+    assert database["tuning"] == {
+        "memoryLimitMb": 7065,
+        "maxDegreeOfParallelism": 3,
+        "tempdbFiles": 3,
+    }
+    assert database["pvc_size"] == "79Gi"
+    is_existing_release.assert_called_once_with(kube_context=None)
+
+
+@patch("resc_helm_wizard.common.is_existing_release")
+def test_create_helm_values_yaml_keeps_the_database_volume_of_a_release(
+    is_existing_release, tmp_path
+):
+    is_existing_release.return_value = True
+    helm_values = HelmValue(
+        operating_system="linux",
+        db_password="dummy_pass",
+        db_storage_path="/temp/db",
+        rabbitmq_storage_path="/temp/rabbitmq",
+        vcs_instances=[],
+        database_tuning={"expected_findings": 10_000_000},
+    )
+    input_file_path = os.path.join(THIS_DIR, "fixtures", "test-values.yaml")
+    output_file_path = str(tmp_path / "custom-values.yaml")
+    assert create_helm_values_yaml(
+        helm_values, input_file_path, output_file_path, kube_context="cluster-1"
+    )
+
+    with open(output_file_path, "r", encoding="utf-8") as file_in:
+        values = yaml.safe_load(file_in)
+    assert values["resc-database"]["database"]["pvc_size"] == "10Gi"
+    is_existing_release.assert_called_once_with(kube_context="cluster-1")
+
+
+@patch("resc_helm_wizard.common.is_existing_release")
+def test_create_helm_values_yaml_keeps_the_engine_defaults_without_tuning(
+    is_existing_release, tmp_path
+):
+    is_existing_release.return_value = False
+    helm_values = HelmValue(
+        operating_system="linux",
+        db_password="dummy_pass",
+        db_storage_path="/temp/db",
+        rabbitmq_storage_path="/temp/rabbitmq",
+        vcs_instances=[],
+        capacity_plan=plan_capacity(5000, 100 * 1024**3, scan_window_hours=8),
+    )
+    input_file_path = os.path.join(THIS_DIR, "fixtures", "test-values.yaml")
+    output_file_path = str(tmp_path / "custom-values.yaml")
+    assert create_helm_values_yaml(helm_values, input_file_path, output_file_path)
+
+    with open(output_file_path, "r", encoding="utf-8") as file_in:
+        values = yaml.safe_load(file_in)
+    assert "tuning" not in values["resc-database"]["database"]
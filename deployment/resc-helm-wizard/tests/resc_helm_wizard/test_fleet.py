@@ -0,0 +1,240 @@
+# Standard Library
+import contextvars
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+# Third Party
+import pytest
+import yaml
+
+# First Party
+from resc_helm_wizard.fleet import (
+    ClusterResult,
+    deploy_cluster,
+    get_cluster_file_names,
+    load_fleet_file,
+    log_fleet_summary,
+    prepare_cluster_values_file,
+    run_fleet_deployment,
+)
+
+
+def write_fleet_file(tmp_path, fleet: dict) -> str:
+    fleet_file = tmp_path / "fleet.yaml"
+    fleet_file.write_text(yaml.dump(fleet), encoding="utf-8")
+    return str(fleet_file)
+
+
+@patch("logging.Logger.error")
+def test_load_fleet_file_sys_exit_when_values_missing(mock_error_log, tmp_path):
+    fleet_file = write_fleet_file(tmp_path, {"clusters": [{"kube_context": "ctx1"}]})
+    with pytest.raises(SystemExit) as excinfo:
+        load_fleet_file(fleet_file)
+    mock_error_log.assert_called_with(
+        "Aborting the program! values_file or answers_file is missing for cluster ctx1"
+    )
+    assert excinfo.value.code == 1
+
+
+def test_get_cluster_file_names():
+    assert get_cluster_file_names(["ctx:1", "ctx/1", "ctx_1", "ctx2"]) == [
+        "ctx_1",
+        "ctx_1-2",
+        "ctx_1-3",
+        "ctx2",
+    ]
+
+
+@patch("resc_helm_wizard.fleet.create_helm_values_yaml")
+@patch("resc_helm_wizard.fleet.apply_sizing_answers")
+@patch("resc_helm_wizard.fleet.answers.get_helm_values_from_answers")
+@patch("resc_helm_wizard.fleet.answers.load_answers")
+def test_prepare_cluster_values_file_applies_the_sizing_answers(
+    load_answers,
+    get_helm_values_from_answers,
+    apply_sizing_answers,
+    create_helm_values_yaml,
+):
+    load_answers.return_value = {"scan_window_hours": 8}
+    cluster = {"kube_context": "ctx:1", "answers_file": "ctx1-answers.yaml"}
+
+    values_file = prepare_cluster_values_file(cluster, file_name="ctx_1-2")
+    assert values_file == "custom-values-ctx_1-2.yaml"
+    load_answers.assert_called_once_with(answers_file="ctx1-answers.yaml")
+    apply_sizing_answers.assert_called_once_with(
+        answers_dict={"scan_window_hours": 8},
+        helm_values=get_helm_values_from_answers.return_value,
+        kube_context="ctx:1",
+    )
+    create_helm_values_yaml.assert_called_once_with(
+        helm_values=get_helm_values_from_answers.return_value,
+        input_values_yaml_file="config/example-values.yaml",
+        output_values_yaml_file="custom-values-ctx_1-2.yaml",
+        kube_context="ctx:1",
+    )
+
+
+@patch("resc_helm_wizard.fleet.create_namespace_if_not_exists")
+@patch("resc_helm_wizard.fleet.check_helm_release_exists")
+@patch("resc_helm_wizard.fleet.get_deployment_fingerprint")
+@patch("resc_helm_wizard.fleet.is_release_up_to_date")
+@patch("resc_helm_wizard.fleet.deploy_with_readiness_watch")
+@patch("resc_helm_wizard.fleet.validate_helm_deployment_status")
+@patch("resc_helm_wizard.fleet.report_restarts")
+def test_deploy_cluster_upgrade(
+    report_restarts,
+    validate_helm_deployment_status,
+    deploy_with_readiness_watch,
+    is_release_up_to_date,
+    get_deployment_fingerprint,
+    check_helm_release_exists,
+    create_namespace_if_not_exists,
+):
+    get_deployment_fingerprint.return_value = "abc123"
+    is_release_up_to_date.return_value = False
+    create_namespace_if_not_exists.return_value = True
+    check_helm_release_exists.return_value = True
+    deploy_with_readiness_watch.return_value = True
+
+    status = deploy_cluster(
+        kube_context="ctx1", values_file="ctx1.yaml", upgrade_release=True
+    )
+    assert status == "upgraded"
+    report_restarts.assert_called_once_with(
+        kube_context="ctx1", values_file="ctx1.yaml"
+    )
+    deploy_with_readiness_watch.assert_called_once_with(
+        action="upgrade",
+        kube_context="ctx1",
+        values_file="ctx1.yaml",
+        fingerprint="abc123",
+    )
+    validate_helm_deployment_status.assert_called_once_with(kube_context="ctx1")
+
+
+@patch("resc_helm_wizard.fleet.create_namespace_if_not_exists")
+@patch("resc_helm_wizard.fleet.check_helm_release_exists")
+@patch("resc_helm_wizard.fleet.get_deployment_fingerprint")
+@patch("resc_helm_wizard.fleet.is_release_up_to_date")
+@patch("resc_helm_wizard.fleet.deploy_with_readiness_watch")
+def test_deploy_cluster_unchanged(
+    deploy_with_readiness_watch,
+    is_release_up_to_date,
+    get_deployment_fingerprint,
+    check_helm_release_exists,
+    create_namespace_if_not_exists,
+):
+    create_namespace_if_not_exists.return_value = True
+    check_helm_release_exists.return_value = True
+    get_deployment_fingerprint.return_value = "abc123"
+    is_release_up_to_date.return_value = True
+
+    status = deploy_cluster(
+        kube_context="ctx1", values_file="ctx1.yaml", upgrade_release=True
+    )
+    assert status == "unchanged"
+    is_release_up_to_date.assert_called_once_with(
+        fingerprint="abc123", kube_context="ctx1"
+    )
+    deploy_with_readiness_watch.assert_not_called()
+
+
+@patch("resc_helm_wizard.fleet.create_namespace_if_not_exists")
+@patch("resc_helm_wizard.fleet.check_helm_release_exists")
+@patch("resc_helm_wizard.fleet.get_deployment_fingerprint")
+@patch("resc_helm_wizard.fleet.is_release_up_to_date")
+@patch("resc_helm_wizard.fleet.deploy_with_readiness_watch")
+def test_deploy_cluster_skips_existing_release(
+    deploy_with_readiness_watch,
+    is_release_up_to_date,
+    get_deployment_fingerprint,
+    check_helm_release_exists,
+    create_namespace_if_not_exists,
+):
+    get_deployment_fingerprint.return_value = "abc123"
+    is_release_up_to_date.return_value = False
+    create_namespace_if_not_exists.return_value = True
+    check_helm_release_exists.return_value = True
+
+    status = deploy_cluster(
+        kube_context="ctx1", values_file="ctx1.yaml", upgrade_release=False
+    )
+    assert status == "skipped"
+    deploy_with_readiness_watch.assert_not_called()
+
+
+@patch("logging.Logger.info")
+def test_log_fleet_summary(mock_info_log):
+    results = [
+        ClusterResult("ctx1", "installed", 12.34, "fleet-logs/ctx1.log"),
+        ClusterResult("ctx2", "failed", 1.0, "fleet-logs/ctx2.log"),
+    ]
+    log_fleet_summary(results=results, duration=12.5)
+    summary = mock_info_log.call_args.args[0]
+    assert "ctx1     installed      12.3s  fleet-logs/ctx1.log" in summary
+    assert "2 clusters deployed in 12.5s, 1 failed" in summary
+
+
+@patch("resc_helm_wizard.fleet.download_rule_toml_file")
+@patch("resc_helm_wizard.fleet.add_helm_repository")
+@patch("resc_helm_wizard.fleet.update_helm_repository")
+@patch("resc_helm_wizard.fleet.deploy_cluster")
+def test_run_fleet_deployment(
+    mock_deploy_cluster,
+    update_helm_repository,
+    add_helm_repository,
+    download_rule_toml_file,
+    tmp_path,
+    caplog,
+):
+    caplog.set_level(logging.INFO)
+
+    def deploy(kube_context, values_file, upgrade_release):
+        if kube_context == "ctx3":
+            raise subprocess.CalledProcessError(returncode=1, cmd="helm list")
+        if kube_context.startswith("arn:"):
+            raise RuntimeError("unexpected error")
+        # Log records of helper threads belong to the cluster
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(
+                contextvars.copy_context().run,
+                logging.info,
+                f"helm output of {kube_context}",
+            ).result()
+        return "installed"
+
+    fleet_file = write_fleet_file(
+        tmp_path,
+        {
+            "max_workers": 2,
+            "verify_ssl": "false",
+            "log_dir": str(tmp_path / "logs"),
+            "clusters": [
+                {"kube_context": f"ctx{index}", "values_file": f"ctx{index}.yaml"}
+                for index in range(1, 4)
+            ]
+            + [
+                {
+                    "kube_context": "arn:aws:eks:eu-west-1:123:cluster/prod",
+                    "values_file": "prod.yaml",
+                }
+            ],
+        },
+    )
+    download_rule_toml_file.return_value = True
+    mock_deploy_cluster.side_effect = deploy
+
+    assert run_fleet_deployment(fleet_file=fleet_file) is False
+    download_rule_toml_file.assert_called_once()
+    assert download_rule_toml_file.call_args.kwargs["verify_ssl"] is False
+    add_helm_repository.assert_called_once_with()
+    update_helm_repository.assert_called_once_with()
+    assert mock_deploy_cluster.call_count == 4
+    assert "Deployment to ctx3 failed" in (tmp_path / "logs" / "ctx3.log").read_text()
+    ctx1_log = (tmp_path / "logs" / "ctx1.log").read_text()
+    assert "helm output of ctx1" in ctx1_log
+    assert "ctx2" not in ctx1_log and "ctx3" not in ctx1_log
+    prod_log = tmp_path / "logs" / "arn_aws_eks_eu-west-1_123_cluster_prod.log"
+    assert "unexpected error" in prod_log.read_text()
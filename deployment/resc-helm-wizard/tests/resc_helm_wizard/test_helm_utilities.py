@@ -1,5 +1,6 @@
 # Standard Library
 import subprocess
+import threading
 import unittest.mock as mock
 from unittest.mock import patch
 
@@ -8,18 +9,24 @@ from resc_helm_wizard import constants
 from resc_helm_wizard.helm_utilities import (
     add_helm_repository,
     check_helm_release_exists,
+    get_deployed_fingerprint,
+    get_deployment_fingerprint,
     get_version_from_downloaded_chart,
     install_or_upgrade_helm_release,
+    is_existing_release,
+    is_release_up_to_date,
+    set_pvc_size,
     update_helm_repository,
     validate_helm_deployment_status,
 )
 
 
-@patch("subprocess.check_output")
+@patch("subprocess.Popen")
 @patch("logging.Logger.info")
-def test_install_or_upgrade_helm_release_success(mock_info_log, mock_check_output):
-    expected_output = b"installation successful"
-    mock_check_output.return_value = expected_output
+def test_install_or_upgrade_helm_release_success(mock_info_log, mock_popen):
+    process = mock_popen.return_value.__enter__.return_value
+    process.communicate.return_value = (b"installation successful", None)
+    process.returncode = 0
     expected_info_log = "installation successful"
     actual_output = install_or_upgrade_helm_release(action="install")
     assert actual_output is True
@@ -29,16 +36,32 @@ def test_install_or_upgrade_helm_release_success(mock_info_log, mock_check_outpu
 @patch("logging.Logger.error")
 def test_install_or_upgrade_helm_release_failure(mock_error_log):
     expected_error_log = f"An error occurred during {constants.CHART_NAME} deployment"
-    with mock.patch("subprocess.check_output") as mock_check_output:
-        mock_check_output.side_effect = subprocess.CalledProcessError(
-            returncode=1, cmd="my command"
-        )
+    with mock.patch("subprocess.Popen") as mock_popen:
+        process = mock_popen.return_value.__enter__.return_value
+        process.communicate.return_value = (b"", None)
+        process.returncode = 1
         actual_output = install_or_upgrade_helm_release(action="install")
-        assert mock_check_output.called
+        assert mock_popen.called
         assert actual_output is False
         mock_error_log.assert_called_with(expected_error_log)
 
 
+@patch("subprocess.Popen")
+def test_install_or_upgrade_helm_release_cancelled(mock_popen):
+    process = mock_popen.return_value.__enter__.return_value
+    process.communicate.side_effect = [
+        subprocess.TimeoutExpired(cmd="helm", timeout=1),
+        (b"", None),
+    ]
+    cancel_event = threading.Event()
+    cancel_event.set()
+    actual_output = install_or_upgrade_helm_release(
+        action="upgrade", cancel_event=cancel_event
+    )
+    assert actual_output is False
+    process.terminate.assert_called_once_with()
+
+
 @patch("subprocess.check_output")
 def test_get_version_from_downloaded_chart_success(mock_check_output):
     expected_output = (
@@ -188,3 +211,103 @@ def test_check_helm_release_exists_false(mock_check_output):
         cmd, capture_output=True, text=True, check=True
     )
     assert release_exists is False
+
+
+@patch("subprocess.run")
+def test_check_helm_release_exists_with_kube_context(mock_check_output):
+    cmd = [
+        "helm",
+        "list",
+        "-f",
+        constants.RELEASE_NAME,
+        "-n",
+        constants.NAMESPACE,
+        "--kube-context",
+        "cluster-1",
+    ]
+    mock_check_output.return_value.stdout = f"NAME: {constants.RELEASE_NAME}"
+    release_exists = check_helm_release_exists(kube_context="cluster-1")
+    mock_check_output.assert_called_once_with(
+        cmd, capture_output=True, text=True, check=True
+    )
+    assert release_exists is True
+
+
+@patch("subprocess.run")
+def test_is_existing_release_false_when_helm_fails(mock_check_output):
+    mock_check_output.side_effect = FileNotFoundError("helm")
+    assert is_existing_release(kube_context="cluster-1") is False
+    mock_check_output.side_effect = subprocess.CalledProcessError(1, "helm")
+    assert is_existing_release() is False
+
+
+@patch("logging.Logger.warning")
+def test_set_pvc_size_keeps_the_volume_of_an_existing_release(mock_warning_log):
+    release_exists = mock.Mock(return_value=False)
+    values = {}
+    set_pvc_size(values, "10Gi", "resc-database", "10Gi", release_exists)
+    assert values == {"pvc_size": "10Gi"}
+    release_exists.assert_not_called()
+
+    set_pvc_size(values, "20Gi", "resc-database", "10Gi", release_exists)
+    assert values == {"pvc_size": "20Gi"}
+
+    release_exists.return_value = True
+    set_pvc_size(values, "40Gi", "resc-database", "10Gi", release_exists)
+    assert values == {"pvc_size": "20Gi"}
+    mock_warning_log.assert_called_once_with(
+        f"resc-database: release {constants.RELEASE_NAME} already exists, keeping its "
+        "20Gi volume instead of 40Gi. Helm can not resize the statically provisioned "
+        "persistent volume, resize it by hand and set pvc_size to 40Gi"
+    )
+
+
+@patch("resc_helm_wizard.helm_utilities.get_version_from_downloaded_chart")
+def test_get_deployment_fingerprint(mock_get_version, tmp_path):
+    values_file = tmp_path / "custom-values.yaml"
+    rule_file = tmp_path / "RESC-SECRETS-RULE.TOML"
+    values_file.write_text("resc: {}\n", encoding="utf-8")
+    rule_file.write_text("title = 'rules'\n", encoding="utf-8")
+    mock_get_version.return_value = "1.1.0"
+    fingerprint = get_deployment_fingerprint(
+        values_file=str(values_file), rule_file=str(rule_file)
+    )
+    assert len(fingerprint) == 64
+
+    mock_get_version.return_value = "1.2.0"
+    assert fingerprint != get_deployment_fingerprint(
+        values_file=str(values_file), rule_file=str(rule_file)
+    )
+    mock_get_version.return_value = None
+    assert (
+        get_deployment_fingerprint(
+            values_file=str(values_file), rule_file=str(rule_file)
+        )
+        is None
+    )
+
+
+@patch("subprocess.run")
+def test_get_deployed_fingerprint(mock_run):
+    mock_run.return_value.stdout = (
+        '{"info": {"status": "deployed", '
+        '"description": "resc-wizard-fingerprint=abc123"}}'
+    )
+    assert get_deployed_fingerprint(kube_context="ctx1") == "abc123"
+    assert mock_run.call_args.args[0][-2:] == ["--kube-context", "ctx1"]
+
+    mock_run.return_value.stdout = (
+        '{"info": {"status": "failed", '
+        '"description": "resc-wizard-fingerprint=abc123"}}'
+    )
+    assert get_deployed_fingerprint() is None
+
+
+@patch("resc_helm_wizard.helm_utilities.get_deployed_fingerprint")
+def test_is_release_up_to_date(mock_get_deployed_fingerprint, monkeypatch):
+    mock_get_deployed_fingerprint.return_value = "abc123"
+    assert is_release_up_to_date(fingerprint="abc123") is True
+    assert is_release_up_to_date(fingerprint="def456") is False
+    assert is_release_up_to_date(fingerprint=None) is False
+    monkeypatch.setenv("RESC_WIZARD_FORCE_UPGRADE", "true")
+    assert is_release_up_to_date(fingerprint="abc123") is False
@@ -0,0 +1,41 @@
+# Standard Library
+import os
+import subprocess
+import sys
+
+# First Party
+import resc_helm_wizard
+
+IMPORT_TIME_BUDGET_US = 250_000
+LAZY_MODULES = ["pkg_resources", "questionary", "requests", "yaml"]
+
+
+def get_import_times(module: str) -> dict:
+    src_dir = os.path.dirname(os.path.dirname(resc_helm_wizard.__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_dir, env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+def test_cli_cold_start_does_not_import_heavy_modules():
+    import_times = get_import_times("resc_helm_wizard.run_wizard")
+    for module in LAZY_MODULES:
+        assert module not in import_times
+
+
+def test_cli_cold_start_within_budget():
+    import_times = get_import_times("resc_helm_wizard.run_wizard")
+    assert import_times["resc_helm_wizard.run_wizard"] < IMPORT_TIME_BUDGET_US
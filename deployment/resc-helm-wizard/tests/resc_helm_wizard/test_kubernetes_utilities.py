@@ -2,8 +2,14 @@
 import subprocess
 from unittest.mock import patch
 
+# Third Party
+import pytest
+
 # First Party
-from resc_helm_wizard.kubernetes_utilities import create_namespace_if_not_exists
+from resc_helm_wizard.kubernetes_utilities import (
+    create_namespace_if_not_exists,
+    get_allocatable_cpu,
+)
 
 
 @patch("subprocess.run")
@@ -104,3 +110,26 @@ def test_create_namespace_if_not_exists_when_namespace_not_present(
     assert mock_subprocess_get_namespace.called
     assert created is True
     mock_info_log.assert_called_with(expected_info_log)
+
+
+@patch("subprocess.run")
+def test_get_allocatable_cpu(mock_subprocess_run):
+    mock_subprocess_run.return_value = subprocess.CompletedProcess(
+        args=["kubectl", "get", "nodes", "-o", "json"],
+        returncode=0,
+        stdout='{"items": ['
+        '{"spec": {}, "status": {"allocatable": {"cpu": "3920m"}}},'
+        '{"spec": {}, "status": {"allocatable": {"cpu": "4"}}},'
+        '{"spec": {"unschedulable": true}, "status": {"allocatable": {"cpu": "4"}}}'
+        "]}",
+    )
+    assert get_allocatable_cpu(kube_context="ctx1") == pytest.approx(7.92)
+    mock_subprocess_run.assert_called_once_with(
+        ["kubectl", "get", "nodes", "-o", "json", "--context", "ctx1"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    mock_subprocess_run.side_effect = subprocess.CalledProcessError(1, "kubectl")
+    assert get_allocatable_cpu() is None
@@ -0,0 +1,56 @@
+# Standard Library
+import pstats
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+# First Party
+from resc_helm_wizard.profiling import ThreadProfilers, get_wait_times, run_profiled
+
+
+def busy_function():
+    return sum(index * index for index in range(10000))
+
+
+def dummy_deployment(delay: float) -> str:
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(busy_function).result()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    time.sleep(delay)
+    return "deployed"
+
+
+@patch("logging.Logger.info")
+def test_run_profiled_writes_pstats_file_and_summary(mock_info_log, tmp_path):
+    profile_file = tmp_path / "wizard.prof"
+    result = run_profiled(
+        dummy_deployment, profile_file=str(profile_file), top=5, delay=0.05
+    )
+    assert result == "deployed"
+
+    stats = pstats.Stats(str(profile_file))
+    function_names = [function_name for _, _, function_name in stats.stats]
+    assert "busy_function" in function_names
+    wait_times = get_wait_times(stats)
+    assert wait_times["sleep"] >= 0.05
+    assert wait_times["subprocesses"] > 0
+
+    summary = mock_info_log.call_args.args[0]
+    assert f"Profile has been written to {profile_file}" in summary
+    assert "waiting on sleep" in summary
+    assert "Top 5 functions by own time:" in summary
+
+
+@patch("sys.setprofile")
+@patch("cProfile.Profile.enable")
+def test_start_thread_profiler_removes_hook_when_threads_are_profiled(
+    enable, setprofile
+):
+    # Another profiler already profiles all threads on Python 3.12 and later
+    enable.side_effect = ValueError("Another profiling tool is already active")
+    thread_profilers = ThreadProfilers()
+    thread_profilers.start_thread_profiler()
+    setprofile.assert_called_once_with(None)
+    assert not thread_profilers.get_profilers()
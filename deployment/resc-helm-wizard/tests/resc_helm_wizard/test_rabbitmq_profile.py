@@ -0,0 +1,122 @@
+# Standard Library
+import os
+from pathlib import Path
+from unittest.mock import call, patch
+
+# Third Party
+import pytest
+import yaml
+
+# First Party
+from resc_helm_wizard.common import create_helm_values_yaml
+from resc_helm_wizard.helm_value import HelmValue
+from resc_helm_wizard.rabbitmq_profile import (
+    get_rabbitmq_profile_settings,
+    plan_rabbitmq_profile,
+)
+
+THIS_DIR = Path(__file__).parent
+
+
+def test_plan_rabbitmq_profile():
+    # Chart default resources and volume
+    profile = plan_rabbitmq_profile({}, queue_depth=50000)
+    assert profile.get_values() == {
+        "throughput": {
+            "queueMode": "lazy",
+            "memoryHighWatermarkMb": 514,
+            "diskFreeLimitMb": 859,
+        },
+        "pvc_size": "10Gi",
+    }
+    assert profile.prefetch == 1
+
+    # The volume holds the backlog and the disk free limit
+    profile = plan_rabbitmq_profile(
+        {"limits": {"memory": "2Gi"}}, queue_depth=200000, pvc_size="10Gi"
+    )
+    assert (profile.memory_high_watermark_mb, profile.disk_free_limit_mb) == (
+        1228,
+        2048,
+    )
+    assert profile.pvc_size == "16Gi"
+
+    # A small backlog fits in memory
+    profile = plan_rabbitmq_profile(
+        {}, queue_depth=500, settings={"prefetch": 2}, pvc_size="20Gi"
+    )
+    assert (profile.queue_mode, profile.prefetch, profile.pvc_size) == (
+        "default",
+        2,
+        "20Gi",
+    )
+
+
+@patch("logging.Logger.error")
+def test_get_rabbitmq_profile_settings_reports_invalid_settings(mock_error_log):
+    assert get_rabbitmq_profile_settings(
+        {"queue_depth": "50000", "queue_mode": "lazy"}
+    ) == {"queue_depth": 50000, "queue_mode": "lazy"}
+    with pytest.raises(SystemExit):
+        get_rabbitmq_profile_settings(
+            {"queue_depth": 50000, "prefetch": 0, "queue_mode": "quorum"}
+        )
+    assert mock_error_log.call_args_list == [
+        call(
+            "Invalid value for rabbitmq_profile: prefetch: 0 is not a whole number "
+            "of at least 1"
+        ),
+        call(
+            "Aborting the program! Invalid value for rabbitmq_profile: queue_mode: "
+            "quorum is not supported, supported queue modes are lazy, default"
+        ),
+    ]
+
+
+def test_create_helm_values_yaml_writes_the_rabbitmq_profile(tmp_path):
+    helm_values = HelmValue(
+        operating_system="linux",
+        db_password="dummy_pass",
+        db_storage_path="/temp/db",
+        rabbitmq_storage_path="/temp/rabbitmq",
+        vcs_instances=[],
+        rabbitmq_profile={"queue_depth": 50000, "prefetch": 2},
+        scanner_worker={"max_tasks_per_child": 20},
+    )
+    input_file_path = os.path.join(THIS_DIR, "fixtures", "test-values.yaml")
+    output_file_path = str(tmp_path / "custom-values.yaml")
+    assert create_helm_values_yaml(helm_values, input_file_path, output_file_path)
+
+    with open(output_file_path, "r", encoding="utf-8") as file_in:
+        values = yaml.safe_load(file_in)
+    assert values["resc-rabbitmq"]["rabbitMQ"]["throughput"]["queueMode"] == "lazy"
+    assert values["resc-rabbitmq"]["rabbitMQ"]["pvc_size"] == "10Gi"
+    # The profile sets the consumer prefetch of the scanners
+    assert values["resc-vcs-scanner-secrets"]["worker"]["prefetchMultiplier"] == 2
+    assert values["resc-vcs-scanner-secrets"]["worker"]["maxTasksPerChild"] == 20
+
+
+@patch("resc_helm_wizard.common.is_existing_release")
+def test_create_helm_values_yaml_keeps_the_rabbitmq_volume_of_a_release(
+    is_existing_release, tmp_path
+):
+    is_existing_release.return_value = True
+    helm_values = HelmValue(
+        operating_system="linux",
+        db_password="dummy_pass",
+        db_storage_path="/temp/db",
+        rabbitmq_storage_path="/temp/rabbitmq",
+        vcs_instances=[],
+        rabbitmq_profile={"queue_depth": 200000},
+    )
+    input_file_path = os.path.join(THIS_DIR, "fixtures", "test-values.yaml")
+    output_file_path = str(tmp_path / "custom-values.yaml")
+    assert create_helm_values_yaml(
+        helm_values, input_file_path, output_file_path, kube_context="cluster-1"
+    )
+
+    with open(output_file_path, "r", encoding="utf-8") as file_in:
+        values = yaml.safe_load(file_in)
+    assert values["resc-rabbitmq"]["rabbitMQ"]["throughput"]["queueMode"] == "lazy"
+    assert values["resc-rabbitmq"]["rabbitMQ"]["pvc_size"] == "10Gi"
+    is_existing_release.assert_called_once_with(kube_context="cluster-1")
@@ -0,0 +1,178 @@
+# Standard Library
+from unittest.mock import patch
+
+# First Party
+from resc_helm_wizard.readiness import (
+    deploy_with_readiness_watch,
+    find_failure,
+    get_pod_component,
+    get_pod_failure,
+    is_workload_ready,
+    watch_component_readiness,
+)
+
+
+def create_deployment(tier: str, ready_replicas: int, replicas: int = 1) -> dict:
+    return {
+        "kind": "Deployment",
+        "metadata": {"name": f"resc-{tier}"},
+        "spec": {
+            "replicas": replicas,
+            "template": {"metadata": {"labels": {"app": "resc", "tier": tier}}},
+        },
+        "status": {"readyReplicas": ready_replicas, "updatedReplicas": replicas},
+    }
+
+
+def create_pod(tier: str, waiting_reason: str = None, restart_count: int = 0) -> dict:
+    container_status = {"name": f"resc-{tier}", "restartCount": restart_count}
+    if waiting_reason:
+        container_status["state"] = {"waiting": {"reason": waiting_reason}}
+    return {
+        "metadata": {"name": f"resc-{tier}-abc12", "labels": {"tier": tier}},
+        "status": {"containerStatuses": [container_status]},
+    }
+
+
+def test_get_pod_component():
+    assert get_pod_component(create_pod("ms-database")) == "database"
+    assert get_pod_component(create_pod("api-no-auth")) == "web service"
+    job_pod = {"metadata": {"labels": {"job-name": "resc-rules-init", "tier": "db"}}}
+    assert get_pod_component(job_pod) == "rules"
+    # The database tuning hook runs while helm upgrades the release
+    tuning_pod = {
+        "metadata": {"labels": {"job-name": "resc-db-tuning", "tier": "database"}}
+    }
+    assert get_pod_component(tuning_pod) == "database"
+    assert get_pod_component(create_pod("unknown")) is None
+
+
+def test_get_pod_failure():
+    assert get_pod_failure(create_pod("redis")) is None
+    assert get_pod_failure(create_pod("redis", "CrashLoopBackOff", 1)) is None
+    assert get_pod_failure(create_pod("redis", "CrashLoopBackOff", 3)) == (
+        "container resc-redis of pod resc-redis-abc12 is in CrashLoopBackOff"
+    )
+    assert "ImagePullBackOff" in get_pod_failure(
+        create_pod("frontend", "ImagePullBackOff")
+    )
+    unschedulable_pod = create_pod("frontend")
+    unschedulable_pod["status"]["conditions"] = [
+        {
+            "type": "PodScheduled",
+            "status": "False",
+            "reason": "Unschedulable",
+            "message": "0/1 nodes are available: Insufficient cpu.",
+        }
+    ]
+    assert get_pod_failure(unschedulable_pod) == (
+        "pod resc-frontend-abc12 is unschedulable: "
+        "0/1 nodes are available: Insufficient cpu."
+    )
+
+
+def test_is_workload_ready_waits_for_the_rollout():
+    deployment = create_deployment("redis", 1)
+    deployment["metadata"].update({"uid": "uid-1", "generation": 2})
+    deployment["status"]["observedGeneration"] = 1
+    assert is_workload_ready(deployment) is False
+
+    deployment["status"].update({"observedGeneration": 2, "replicas": 2})
+    assert is_workload_ready(deployment) is False
+    deployment["status"]["replicas"] = 1
+    assert is_workload_ready(deployment) is True
+
+    # Helm may still update a workload of the previous release
+    assert is_workload_ready(deployment, {"uid-1": 2}, helm_done=False) is False
+    assert is_workload_ready(deployment, {"uid-1": 1}, helm_done=False) is True
+    assert is_workload_ready(deployment, {"uid-1": 2}, helm_done=True) is True
+
+    statefulset = create_deployment("ms-database", 1)
+    statefulset["kind"] = "StatefulSet"
+    statefulset["status"].update({"currentRevision": "db-1", "updateRevision": "db-2"})
+    assert is_workload_ready(statefulset) is False
+    statefulset["status"]["currentRevision"] = "db-2"
+    assert is_workload_ready(statefulset) is True
+
+
+def test_find_failure_ignores_objects_of_an_earlier_release():
+    failed_job = {
+        "kind": "Job",
+        "metadata": {"name": "resc-rules-init", "uid": "job-1"},
+        "status": {"conditions": [{"type": "Failed", "status": "True"}]},
+    }
+    crash_looping_pod = create_pod("redis", "CrashLoopBackOff", 5)
+    crash_looping_pod["metadata"]["uid"] = "pod-1"
+    existing_objects = {"job-1": 1, "pod-1": None}
+    assert find_failure([failed_job], [crash_looping_pod], existing_objects) == (
+        None,
+        None,
+    )
+    assert find_failure([failed_job], [crash_looping_pod]) == (
+        "rules",
+        "job resc-rules-init failed: unknown reason",
+    )
+
+
+@patch("time.sleep")
+@patch("resc_helm_wizard.readiness.get_namespace_objects")
+@patch("logging.Logger.info")
+def test_watch_component_readiness_ready(
+    mock_info_log, mock_get_namespace_objects, mock_sleep
+):
+    mock_get_namespace_objects.side_effect = [
+        [create_deployment("redis", 0), create_deployment("frontend", 1)],
+        [create_pod("redis"), create_pod("frontend")],
+        [create_deployment("redis", 1), create_deployment("frontend", 1)],
+        [create_pod("redis"), create_pod("frontend")],
+    ]
+    assert watch_component_readiness() is True
+    assert mock_sleep.call_count == 1
+    summary = mock_info_log.call_args.args[0]
+    assert "redis         ready" in summary
+    assert "frontend      ready" in summary
+
+
+@patch("time.sleep")
+@patch("resc_helm_wizard.readiness.get_namespace_objects")
+@patch("logging.Logger.error")
+def test_watch_component_readiness_fails_fast(
+    mock_error_log, mock_get_namespace_objects, mock_sleep
+):
+    mock_get_namespace_objects.side_effect = [
+        [create_deployment("api", 0)],
+        [create_pod("api", "ImagePullBackOff")],
+    ]
+    assert watch_component_readiness() is False
+    mock_sleep.assert_not_called()
+    mock_error_log.assert_called_with(
+        "Component web service failed, "
+        "container resc-api of pod resc-api-abc12 is in ImagePullBackOff"
+    )
+
+
+@patch("resc_helm_wizard.readiness.get_namespace_objects")
+@patch("resc_helm_wizard.readiness.install_or_upgrade_helm_release")
+@patch("resc_helm_wizard.readiness.watch_component_readiness")
+def test_deploy_with_readiness_watch_cancels_helm_on_failure(
+    mock_watch_component_readiness,
+    mock_install_or_upgrade_helm_release,
+    mock_get_namespace_objects,
+):
+    mock_get_namespace_objects.return_value = [
+        create_pod("redis", "CrashLoopBackOff", 5)
+    ]
+    mock_get_namespace_objects.return_value[0]["metadata"]["uid"] = "pod-1"
+    mock_watch_component_readiness.return_value = False
+    mock_install_or_upgrade_helm_release.return_value = False
+
+    assert deploy_with_readiness_watch(action="upgrade", kube_context="ctx1") is False
+    cancel_event = mock_install_or_upgrade_helm_release.call_args.kwargs["cancel_event"]
+    assert cancel_event.is_set()
+    assert mock_watch_component_readiness.call_args.kwargs["kube_context"] == "ctx1"
+    assert mock_watch_component_readiness.call_args.kwargs["existing_objects"] == {
+        "pod-1": None
+    }
+    mock_get_namespace_objects.assert_called_once_with(
+        "deployments,statefulsets,jobs,pods", "ctx1"
+    )
@@ -0,0 +1,158 @@
+# Standard Library
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+# Third Party
+import pytest
+
+# First Party
+from resc_helm_wizard.repository_inventory import (
+    get_last_page_number,
+    write_repository_inventory,
+)
+from resc_helm_wizard.vcs_instance import VcsInstance
+
+RESPONSES = []
+
+
+def get_listing(path: str, query: dict, port: int) -> tuple:
+    if path == "/api/v3/users/team-a/repos":
+        page = int(query["page"][0])
+        repositories = [
+            {"size": 10, "pushed_at": f"2024-0{page}-01T00:00:00Z"} for _ in range(2)
+        ]
+        link = (
+            f'<http://127.0.0.1:{port}{path}?per_page=100&page=3>; rel="last"'
+            if page == 1
+            else None
+        )
+        return repositories, link
+    if path == "/resc/_apis/git/repositories":
+        return {
+            "value": [
+                {"size": 2048, "project": {"lastUpdateTime": "2023-05-01T00:00:00Z"}}
+            ]
+        }, None
+    if path == "/rest/api/1.0/projects":
+        start = int(query["start"][0])
+        if start == 0:
+            return {
+                "values": [{"key": "PRJ1"}],
+                "isLastPage": False,
+                "nextPageStart": 1,
+            }, None
+        return {"values": [{"key": "PRJ2"}], "isLastPage": True}, None
+    if path.startswith("/rest/api/1.0/projects/"):
+        return {"values": [{"slug": "repo"}] * 3, "isLastPage": True}, None
+    return None, None
+
+
+class MockVcsApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802
+        url = urlparse(self.path)
+        body, link = get_listing(url.path, parse_qs(url.query), self.server.server_port)
+        if body is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        content = json.dumps(body).encode()
+        etag = f'"{hash(content)}"'
+        if self.headers.get("If-None-Match") == etag:
+            RESPONSES.append(304)
+            self.send_response(304)
+            self.end_headers()
+            return
+        RESPONSES.append(200)
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        if link:
+            self.send_header("Link", link)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture(name="api_port")
+def fixture_api_port():
+    RESPONSES.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockVcsApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield str(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+def create_vcs_instance(
+    provider_type: str, port: str, organization: str = "", scope: list = None
+) -> VcsInstance:
+    return VcsInstance(
+        provider_type=provider_type,
+        scheme="http",
+        host="127.0.0.1",
+        port=port,
+        username="NA",
+        password="token",
+        organization=organization,
+        scope=scope or [],
+    )
+
+
+def test_get_last_page_number():
+    link_header = (
+        '<https://api.github.com/user/1/repos?per_page=100&page=2>; rel="next", '
+        '<https://api.github.com/user/1/repos?per_page=100&page=14>; rel="last"'
+    )
+    assert get_last_page_number(link_header) == 14
+    assert get_last_page_number(None) == 1
+
+
+@patch("logging.Logger.info")
+def test_write_repository_inventory(mock_info_log, api_port, tmp_path):
+    vcs_instances = [
+        create_vcs_instance("GITHUB_PUBLIC", api_port, scope=["team-a"]),
+        create_vcs_instance("AZURE_DEVOPS", api_port, organization="resc"),
+        create_vcs_instance("BITBUCKET", api_port),
+    ]
+    inventory_file = tmp_path / "inventory.json"
+    assert write_repository_inventory(vcs_instances, str(inventory_file)) is True
+
+    inventory = json.loads(inventory_file.read_text(encoding="utf-8"))["vcs_instances"]
+    assert inventory["GITHUB_PUBLIC"]["repositories"] == 6
+    assert inventory["GITHUB_PUBLIC"]["size_bytes"] == 6 * 10 * 1024
+    assert inventory["GITHUB_PUBLIC"]["last_push"] == "2024-03-01T00:00:00Z"
+    assert inventory["AZURE_DEVOPS"]["scopes"]["resc"]["size_bytes"] == 2048
+    assert inventory["BITBUCKET"]["repositories"] == 6
+    assert set(inventory["BITBUCKET"]["scopes"]) == {"PRJ1", "PRJ2"}
+    assert inventory["BITBUCKET"]["size_bytes"] is None
+    assert RESPONSES.count(200) == 8
+
+    # A second crawl revalidates every page with its ETag
+    RESPONSES.clear()
+    assert write_repository_inventory(vcs_instances, str(inventory_file)) is True
+    assert RESPONSES == [304] * 8
+    assert (
+        "8 pages fetched of which 8 were not modified"
+        in (mock_info_log.call_args_list[-2].args[0])
+    )
+    inventory = json.loads(inventory_file.read_text(encoding="utf-8"))["vcs_instances"]
+    assert inventory["GITHUB_PUBLIC"]["repositories"] == 6
+
+
+@patch("logging.Logger.error")
+def test_write_repository_inventory_reports_failed_scopes(
+    mock_error_log, api_port, tmp_path
+):
+    vcs_instances = [create_vcs_instance("GITHUB_PUBLIC", api_port, scope=["unknown"])]
+    inventory_file = tmp_path / "inventory.json"
+    assert write_repository_inventory(vcs_instances, str(inventory_file)) is False
+    assert (
+        "Unable to crawl GITHUB_PUBLIC unknown: 404"
+        in (mock_error_log.call_args.args[0])
+    )
@@ -0,0 +1,125 @@
+# Standard Library
+from unittest.mock import patch
+
+# First Party
+from resc_helm_wizard.restarts import (
+    get_global_checksums,
+    get_restarting_workloads,
+    report_restarts,
+)
+
+DEPLOYED_MANIFEST = """
+---
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: resc-vcs-instances-config
+---
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: resc-vcs-scanner-secrets
+spec:
+  template:
+    metadata:
+      annotations:
+        checksum/config: aaa
+        checksum/vcs-instances: bbb
+    spec:
+      containers:
+        - name: scanner
+          image: resc-vcs-scanner:1.0.0
+---
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: resc-redis
+spec:
+  template:
+    metadata:
+      annotations:
+        checksum/config: ccc
+    spec:
+      containers:
+        - name: redis
+          image: redis:7.0.0
+"""
+
+
+def test_get_global_checksums():
+    values = {
+        "resc-vcs-instances": {"vcsInstances": []},
+        "resc-rabbitmq": {"rabbitMQ": {"config": {"vhost": "vhost"}}},
+    }
+    checksums = get_global_checksums(values)
+    assert set(checksums) == {"vcsInstances", "rabbitmq"}
+    assert checksums == get_global_checksums(values)
+
+    values["resc-rabbitmq"]["rabbitMQ"]["resources"] = {"limits": {"cpu": 2}}
+    assert get_global_checksums(values)["rabbitmq"] == checksums["rabbitmq"]
+    values["resc-vcs-instances"]["vcsInstances"].append({"name": "github"})
+    assert get_global_checksums(values)["vcsInstances"] != checksums["vcsInstances"]
+
+
+def test_get_restarting_workloads():
+    rendered_manifest = (
+        DEPLOYED_MANIFEST.replace(
+            "checksum/vcs-instances: bbb", "checksum/vcs-instances: ddd"
+        )
+        + """
+---
+apiVersion: apps/v1
+kind: StatefulSet
+metadata:
+  name: resc-mq
+spec:
+  template:
+    spec:
+      containers: []
+"""
+    )
+    assert get_restarting_workloads(DEPLOYED_MANIFEST, DEPLOYED_MANIFEST) == {}
+    assert get_restarting_workloads(DEPLOYED_MANIFEST, rendered_manifest) == {
+        "Deployment resc-vcs-scanner-secrets": "vcs-instances changed",
+        "StatefulSet resc-mq": "new",
+    }
+
+    rendered_manifest = DEPLOYED_MANIFEST.replace("redis:7.0.0", "redis:7.2.0")
+    assert get_restarting_workloads(DEPLOYED_MANIFEST, rendered_manifest) == {
+        "Deployment resc-redis": "pod spec changed"
+    }
+
+
+@patch("resc_helm_wizard.restarts.render_release_manifest")
+@patch("resc_helm_wizard.restarts.get_release_manifest")
+@patch("logging.Logger.info")
+def test_report_restarts(mock_info_log, get_release_manifest, render_release_manifest):
+    get_release_manifest.return_value = DEPLOYED_MANIFEST
+    render_release_manifest.return_value = DEPLOYED_MANIFEST.replace(
+        "checksum/config: aaa", "checksum/config: eee"
+    )
+    assert report_restarts(kube_context="ctx1") == {
+        "Deployment resc-vcs-scanner-secrets": "config changed"
+    }
+    render_release_manifest.assert_called_once_with(
+        kube_context="ctx1", values_file="custom-values.yaml"
+    )
+    mock_info_log.assert_called_once_with(
+        "Components restarting with the upgrade:\n"
+        "  Deployment resc-vcs-scanner-secrets: config changed"
+    )
+
+
+@patch("resc_helm_wizard.restarts.render_release_manifest")
+@patch("resc_helm_wizard.restarts.get_release_manifest")
+@patch("logging.Logger.warning")
+def test_report_restarts_without_deployed_manifest(
+    mock_warning_log, get_release_manifest, render_release_manifest
+):
+    get_release_manifest.return_value = None
+    render_release_manifest.return_value = DEPLOYED_MANIFEST
+    assert report_restarts() is None
+    mock_warning_log.assert_called_once_with(
+        "Unable to compare the release with the deployed release, "
+        "restarting components are unknown"
+    )
@@ -0,0 +1,342 @@
+# Standard Library
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+# Third Party
+import pytest
+import requests
+
+# First Party
+from resc_helm_wizard.rule_pack import (
+    fetch_rule_pack,
+    fetch_rule_pack_from_mirrors,
+    get_cache_ttl,
+    get_rule_file_urls,
+    write_response_to_file,
+)
+
+URL = "https://example.com/rule_file.toml"
+CONTENT = b"[[rules]]\nid = 'dummy'\n"
+
+
+@pytest.fixture(name="cache_dir")
+def fixture_cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("RESC_WIZARD_CACHE_DIR", str(cache_dir))
+    monkeypatch.setenv("RESC_WIZARD_RULE_PACK_CACHE_TTL", "0")
+    return cache_dir
+
+
+def create_cancel_event():
+    cancel_event = MagicMock()
+    cancel_event.is_set.return_value = False
+    cancel_event.wait.return_value = False
+    return cancel_event
+
+
+def create_response(status_code: int, content: bytes = b"", headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.iter_content.return_value = [content[:10], content[10:]]
+    response.headers = headers or {}
+    return response
+
+
+def mock_response(mock_get, status_code: int, content: bytes = b"", headers=None):
+    mock_get.return_value = create_response(status_code, content, headers)
+
+
+@patch("requests.Session.get")
+def test_fetch_rule_pack_stores_content_addressed_object(mock_get, cache_dir):
+    mock_response(mock_get, 200, CONTENT, {"ETag": '"v1"'})
+    rule_pack_path = fetch_rule_pack(url=URL, verify_ssl=True)
+
+    sha256 = hashlib.sha256(CONTENT).hexdigest()
+    assert rule_pack_path == str(cache_dir / "objects" / sha256)
+    index = json.loads((cache_dir / "index.json").read_text())
+    assert index[URL]["sha256"] == sha256
+    assert index[URL]["etag"] == '"v1"'
+    mock_get.assert_called_once_with(
+        URL,
+        timeout=100,
+        verify=True,
+        headers={"Accept-Encoding": "identity"},
+        stream=True,
+    )
+
+
+@patch("requests.Session.get")
+def test_fetch_rule_pack_revalidates_with_conditional_get(mock_get, cache_dir):
+    mock_response(
+        mock_get, 200, CONTENT, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024"}
+    )
+    first_path = fetch_rule_pack(url=URL, verify_ssl=True)
+
+    mock_response(mock_get, 304)
+    second_path = fetch_rule_pack(url=URL, verify_ssl=True)
+    assert second_path == first_path
+    assert mock_get.call_args.kwargs["headers"] == {
+        "Accept-Encoding": "identity",
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024",
+    }
+
+
+@patch("requests.Session.get")
+def test_fetch_rule_pack_skips_network_within_ttl(mock_get, cache_dir, monkeypatch):
+    mock_response(mock_get, 200, CONTENT)
+    first_path = fetch_rule_pack(url=URL, verify_ssl=True)
+
+    monkeypatch.setenv("RESC_WIZARD_RULE_PACK_CACHE_TTL", "3600")
+    assert fetch_rule_pack(url=URL, verify_ssl=True) == first_path
+    assert mock_get.call_count == 1
+
+
+@patch("logging.Logger.error")
+def test_get_cache_ttl_sys_exit_when_invalid(mock_error_log, monkeypatch):
+    monkeypatch.setenv("RESC_WIZARD_RULE_PACK_CACHE_TTL", "1h")
+    with pytest.raises(SystemExit) as excinfo:
+        get_cache_ttl()
+    mock_error_log.assert_called_once_with(
+        "Aborting the program! Invalid value for RESC_WIZARD_RULE_PACK_CACHE_TTL: "
+        "1h is not a whole number of seconds"
+    )
+    assert excinfo.value.code == 1
+
+
+@patch("requests.Session.get")
+def test_fetch_rule_pack_serves_cached_copy_when_server_unreachable(
+    mock_get, cache_dir
+):
+    mock_response(mock_get, 200, CONTENT)
+    first_path = fetch_rule_pack(url=URL, verify_ssl=True)
+
+    mock_get.side_effect = requests.ConnectionError("proxy error")
+    with patch("resc_helm_wizard.constants.RULE_PACK_RETRY_BACKOFF", 0):
+        assert fetch_rule_pack(url=URL, verify_ssl=True) == first_path
+
+
+@patch("requests.Session.get")
+def test_fetch_rule_pack_offline_mode(mock_get, cache_dir, monkeypatch):
+    monkeypatch.setenv("RESC_WIZARD_OFFLINE", "true")
+    assert fetch_rule_pack(url=URL, verify_ssl=True) is None
+
+    monkeypatch.setenv("RESC_WIZARD_OFFLINE", "false")
+    mock_response(mock_get, 200, CONTENT)
+    first_path = fetch_rule_pack(url=URL, verify_ssl=True)
+
+    monkeypatch.setenv("RESC_WIZARD_OFFLINE", "true")
+    assert fetch_rule_pack(url=URL, verify_ssl=True) == first_path
+    assert mock_get.call_count == 1
+
+
+@patch("requests.Session.get")
+def test_fetch_rule_pack_ignores_corrupt_object(mock_get, cache_dir):
+    mock_response(mock_get, 200, CONTENT)
+    first_path = fetch_rule_pack(url=URL, verify_ssl=True)
+    with open(first_path, "wb") as file_out:
+        file_out.write(b"tampered")
+
+    mock_response(mock_get, 200, CONTENT)
+    assert fetch_rule_pack(url=URL, verify_ssl=True) == first_path
+    assert mock_get.call_args.kwargs["headers"] == {"Accept-Encoding": "identity"}
+    with open(first_path, "rb") as file_in:
+        assert file_in.read() == CONTENT
+
+
+@patch("requests.Session.get")
+def test_fetch_rule_pack_resumes_interrupted_download(mock_get, cache_dir):
+    def interrupted_iter_content(chunk_size):
+        yield CONTENT[:10]
+        raise requests.exceptions.ChunkedEncodingError("connection reset")
+
+    first_response = create_response(
+        200, headers={"ETag": '"v1"', "Content-Length": str(len(CONTENT))}
+    )
+    first_response.iter_content.side_effect = interrupted_iter_content
+    second_response = create_response(
+        206, headers={"Content-Range": f"bytes 10-{len(CONTENT) - 1}/{len(CONTENT)}"}
+    )
+    second_response.iter_content.return_value = [CONTENT[10:]]
+    mock_get.side_effect = [first_response, second_response]
+
+    cancel_event = create_cancel_event()
+    rule_pack_path = fetch_rule_pack(
+        url=URL, verify_ssl=True, cancel_event=cancel_event
+    )
+    with open(rule_pack_path, "rb") as file_in:
+        assert file_in.read() == CONTENT
+    assert mock_get.call_args.kwargs["headers"] == {
+        "Accept-Encoding": "identity",
+        "Range": "bytes=10-",
+        "If-Range": '"v1"',
+    }
+    cancel_event.wait.assert_called_once_with(1.0)
+    assert not list((cache_dir / "partial").iterdir())
+
+
+@patch("requests.Session.get")
+def test_fetch_rule_pack_retries_with_exponential_backoff(mock_get, cache_dir):
+    mock_get.side_effect = [
+        create_response(503),
+        create_response(502),
+        create_response(200, CONTENT),
+    ]
+    cancel_event = create_cancel_event()
+    assert (
+        fetch_rule_pack(url=URL, verify_ssl=True, cancel_event=cancel_event) is not None
+    )
+    assert [call.args[0] for call in cancel_event.wait.call_args_list] == [1.0, 2.0]
+
+
+@patch("requests.Session.get")
+def test_fetch_rule_pack_stops_retrying_when_cancelled(mock_get, cache_dir):
+    mock_get.side_effect = [create_response(503), create_response(200, CONTENT)]
+    cancel_event = threading.Event()
+
+    def win_race_during_backoff(timeout):
+        cancel_event.set()
+        return True
+
+    with patch.object(cancel_event, "wait", side_effect=win_race_during_backoff):
+        assert (
+            fetch_rule_pack(url=URL, verify_ssl=True, cancel_event=cancel_event) is None
+        )
+    assert mock_get.call_count == 1
+    assert not (cache_dir / "index.json").exists()
+
+
+def test_write_response_to_file_stops_when_cancelled(tmp_path):
+    cancel_event = threading.Event()
+
+    def iter_content(chunk_size):
+        yield CONTENT[:10]
+        cancel_event.set()
+        yield CONTENT[10:]
+
+    response = create_response(206)
+    response.iter_content.side_effect = iter_content
+    partial_path = tmp_path / "partial"
+    partial_path.write_bytes(b"")
+    write_response_to_file(response, str(partial_path), 0, cancel_event)
+    assert partial_path.read_bytes() == CONTENT[:10]
+
+
+@patch("requests.Session.get")
+@patch("logging.Logger.error")
+def test_fetch_rule_pack_checksum_mismatch(mock_error_log, mock_get, cache_dir):
+    mock_response(mock_get, 200, CONTENT)
+    expected_sha256 = hashlib.sha256(b"other content").hexdigest()
+    assert (
+        fetch_rule_pack(URL, verify_ssl=True, expected_sha256=expected_sha256) is None
+    )
+    assert "Checksum mismatch for rule pack" in mock_error_log.call_args.args[0]
+    assert not (cache_dir / "index.json").exists()
+
+
+@patch("requests.Session.get")
+def test_fetch_rule_pack_checksum_match(mock_get, cache_dir):
+    mock_response(mock_get, 200, CONTENT)
+    expected_sha256 = hashlib.sha256(CONTENT).hexdigest()
+    rule_pack_path = fetch_rule_pack(
+        URL, verify_ssl=True, expected_sha256=expected_sha256
+    )
+    assert rule_pack_path.endswith(expected_sha256)
+
+
+class MirrorRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802
+        if self.path == "/slow.toml":
+            time.sleep(1)
+        if self.path == "/broken.toml":
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(CONTENT)))
+        self.end_headers()
+        self.wfile.write(CONTENT)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+@pytest.fixture(name="mirror_url")
+def fixture_mirror_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MirrorRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@patch("resc_helm_wizard.constants.RULE_PACK_HEDGE_DELAY", 0.1)
+@patch("logging.Logger.info")
+def test_fetch_rule_pack_from_mirrors_hedges_slow_mirror(
+    mock_info_log, cache_dir, mirror_url
+):
+    urls = [f"{mirror_url}/slow.toml", f"{mirror_url}/fast.toml"]
+    start_time = time.monotonic()
+    rule_pack_path = fetch_rule_pack_from_mirrors(urls=urls, verify_ssl=True)
+    assert time.monotonic() - start_time < 1
+    # The losing download does not keep the interpreter from exiting
+    assert all(
+        thread.daemon
+        for thread in threading.enumerate()
+        if thread.name == "rule-pack-download"
+    )
+    with open(rule_pack_path, "rb") as file_in:
+        assert file_in.read() == CONTENT
+    assert (
+        f"Rule pack downloaded from mirror {urls[1]}"
+        in (mock_info_log.call_args.args[0])
+    )
+
+
+def test_fetch_rule_pack_from_mirrors_falls_back_to_local_file(
+    cache_dir, mirror_url, tmp_path
+):
+    local_rule_pack = tmp_path / "gitleaks.toml"
+    local_rule_pack.write_bytes(CONTENT)
+    urls = [f"{mirror_url}/broken.toml", str(local_rule_pack)]
+    rule_pack_path = fetch_rule_pack_from_mirrors(urls=urls, verify_ssl=True)
+    assert rule_pack_path.endswith(hashlib.sha256(CONTENT).hexdigest())
+
+
+@patch("resc_helm_wizard.constants.RULE_PACK_MAX_MIRRORS", 2)
+def test_fetch_rule_pack_from_mirrors_tries_mirrors_beyond_the_limit(
+    cache_dir, mirror_url
+):
+    urls = [f"{mirror_url}/broken.toml"] * 3 + [f"{mirror_url}/fast.toml"]
+    rule_pack_path = fetch_rule_pack_from_mirrors(urls=urls, verify_ssl=True)
+    with open(rule_pack_path, "rb") as file_in:
+        assert file_in.read() == CONTENT
+
+
+def test_fetch_rule_pack_from_mirrors_skips_checksum_mismatch(
+    cache_dir, mirror_url, tmp_path
+):
+    local_rule_pack = tmp_path / "gitleaks.toml"
+    local_rule_pack.write_bytes(b"outdated rules")
+    urls = [str(local_rule_pack), f"{mirror_url}/fast.toml"]
+    rule_pack_path = fetch_rule_pack_from_mirrors(
+        urls=urls, verify_ssl=True, expected_sha256=hashlib.sha256(CONTENT).hexdigest()
+    )
+    with open(rule_pack_path, "rb") as file_in:
+        assert file_in.read() == CONTENT
+
+
+def test_get_rule_file_urls_from_environment(monkeypatch):
+    monkeypatch.setenv(
+        "RESC_WIZARD_RULE_FILE_URLS",
+        "https://artifacts.example.com/gitleaks.toml, /opt/resc/gitleaks.toml",
+    )
+    assert get_rule_file_urls() == [
+        "https://artifacts.example.com/gitleaks.toml",
+        "/opt/resc/gitleaks.toml",
+    ]
@@ -1,8 +1,11 @@
 # Standard Library
 from unittest.mock import patch
 
+# Third Party
+import pytest
+
 # First Party
-from resc_helm_wizard.run_wizard import prompt_questions
+from resc_helm_wizard.run_wizard import main, prompt_questions, run_non_interactive
 
 
 @patch("resc_helm_wizard.questions.ask_operating_system")
@@ -35,3 +38,90 @@ def test_prompt_questions(
     ask_password_for_database.assert_called_once_with()
     create_storage_for_db_and_rabbitmq.assert_called_once_with(operating_system="linux")
     ask_operating_system.assert_called_once_with()
+
+
+@patch("resc_helm_wizard.run_wizard.prompt_questions")
+def test_main_runs_interactive_wizard_by_default(prompt_questions):
+    main([])
+    prompt_questions.assert_called_once_with(
+        vcs_inventory_file=None,
+        verify_credentials=False,
+        scan_window_hours=None,
+        capacity_inventory_file=None,
+        scanner_autoscaling=None,
+        scrape_window_hours=None,
+        web_service_settings={},
+        expected_findings=None,
+        queue_depth=None,
+    )
+
+
+@patch("resc_helm_wizard.fleet.run_fleet_deployment")
+def test_main_writes_timing_report_when_deployment_fails(
+    run_fleet_deployment, tmp_path
+):
+    run_fleet_deployment.return_value = False
+    report_file = tmp_path / "timing.json"
+    textfile = tmp_path / "resc_wizard.prom"
+    with pytest.raises(SystemExit):
+        main(
+            [
+                "--fleet-file",
+                "fleet.yaml",
+                "--timing-report",
+                str(report_file),
+                "--prometheus-textfile",
+                str(textfile),
+            ]
+        )
+    assert report_file.is_file()
+    assert "resc_wizard_run_duration_seconds" in textfile.read_text(encoding="utf-8")
+
+
+@patch("resc_helm_wizard.answers.load_answers")
+@patch("resc_helm_wizard.answers.get_helm_values_from_answers")
+@patch("resc_helm_wizard.common.create_helm_values_yaml")
+@patch("resc_helm_wizard.common.run_deployment")
+@patch("resc_helm_wizard.questions.ask_operating_system")
+def test_main_with_answers_file_runs_without_prompt(
+    ask_operating_system,
+    run_deployment,
+    create_helm_values_yaml,
+    get_helm_values_from_answers,
+    load_answers,
+):
+    load_answers.return_value = {"verify_ssl": "false", "upgrade_release": True}
+    run_deployment.return_value = "installed"
+
+    main(["--answers-file", "answers.yaml"])
+    load_answers.assert_called_once_with(answers_file="answers.yaml")
+    create_helm_values_yaml.assert_called_once_with(
+        helm_values=get_helm_values_from_answers.return_value,
+        input_values_yaml_file="config/example-values.yaml",
+    )
+    run_deployment.assert_called_once_with(verify_ssl=False, upgrade_release=True)
+    ask_operating_system.assert_not_called()
+
+
+@patch("resc_helm_wizard.answers.load_answers")
+@patch("resc_helm_wizard.answers.get_helm_values_from_answers")
+@patch("resc_helm_wizard.common.create_helm_values_yaml")
+@patch("resc_helm_wizard.common.run_deployment")
+def test_run_non_interactive_sys_exit_when_deployment_fails(
+    run_deployment, create_helm_values_yaml, get_helm_values_from_answers, load_answers
+):
+    load_answers.return_value = {}
+    run_deployment.return_value = "failed"
+    with pytest.raises(SystemExit) as excinfo:
+        run_non_interactive(answers_file=None)
+    assert excinfo.value.code == 1
+
+    # A failed install is a failure also when upgrades are declined
+    load_answers.return_value = {"upgrade_release": False}
+    with pytest.raises(SystemExit) as excinfo:
+        run_non_interactive(answers_file=None)
+    assert excinfo.value.code == 1
+
+    # A declined upgrade of an existing release is not
+    run_deployment.return_value = "skipped"
+    run_non_interactive(answers_file=None)
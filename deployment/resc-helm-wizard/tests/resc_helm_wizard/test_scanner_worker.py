@@ -0,0 +1,139 @@
+# Standard Library
+import os
+from pathlib import Path
+from unittest.mock import call, patch
+
+# Third Party
+import pytest
+import yaml
+
+# First Party
+from resc_helm_wizard.capacity import plan_capacity
+from resc_helm_wizard.common import create_helm_values_yaml
+from resc_helm_wizard.helm_value import HelmValue
+from resc_helm_wizard.scanner_worker import (
+    get_scanner_worker_settings,
+    parse_cpu,
+    parse_memory,
+    set_scanner_worker_values,
+    size_scanner_worker,
+)
+
+THIS_DIR = Path(__file__).parent
+
+
+def test_parse_quantities():
+    assert parse_cpu(3) == 3
+    assert parse_cpu("1500m") == 1.5
+    assert parse_memory("6G") == 6 * 1000**3
+    assert parse_memory("576Mi") == 576 * 1024**2
+    assert parse_memory(1024) == 1024
+    with pytest.raises(ValueError):
+        parse_memory("6Gb")
+
+
+def test_size_scanner_worker():
+    # Chart default resources: one process per requested core
+    worker = size_scanner_worker(
+        {"requests": {"cpu": 3, "memory": "4G"}, "limits": {"cpu": 4, "memory": "6G"}}
+    )
+    assert worker.get_values() == {
+        "concurrency": 3,
+        "prefetchMultiplier": 1,
+        "maxTasksPerChild": 100,
+        "pool": "prefork",
+    }
+
+    # The memory limit fits two scans of 1Gi next to the worker itself
+    worker = size_scanner_worker(
+        {"requests": {"cpu": "4"}, "limits": {"memory": "2304Mi"}}
+    )
+    assert worker.concurrency == 2
+
+    # Pods smaller than a core still run one process
+    worker = size_scanner_worker(
+        {"requests": {"cpu": "300m"}, "limits": {"memory": "750M"}},
+        settings={"max_tasks_per_child": 0, "pool": "threads"},
+    )
+    assert (worker.concurrency, worker.max_tasks_per_child, worker.pool) == (
+        1,
+        0,
+        "threads",
+    )
+    assert size_scanner_worker({}, settings={"concurrency": 6}).concurrency == 6
+
+
+@patch("logging.Logger.error")
+def test_get_scanner_worker_settings_reports_invalid_settings(mock_error_log):
+    assert get_scanner_worker_settings({"concurrency": "4", "pool": "prefork"}) == {
+        "concurrency": 4,
+        "pool": "prefork",
+    }
+    with pytest.raises(SystemExit):
+        get_scanner_worker_settings(
+            {"concurrency": 0, "pool": "gevent", "autoscale": "4,1"}
+        )
+    assert mock_error_log.call_args_list == [
+        call("Invalid value for scanner_worker: autoscale is not supported"),
+        call(
+            "Invalid value for scanner_worker: concurrency: 0 is not a whole number "
+            "of at least 1"
+        ),
+        call(
+            "Aborting the program! Invalid value for scanner_worker: pool: gevent is "
+            "not supported, supported pools are prefork, threads, solo"
+        ),
+    ]
+
+
+def test_set_scanner_worker_values():
+    scanner_values = {
+        "resources": {"requests": {"cpu": 2}, "limits": {"memory": "6Gi"}},
+    }
+    set_scanner_worker_values(scanner_values)
+    assert scanner_values["worker"]["concurrency"] == 2
+
+
+def test_create_helm_values_yaml_sizes_the_planned_scanners(tmp_path):
+    helm_values = HelmValue(
+        operating_system="linux",
+        db_password="dummy_pass",
+        db_storage_path="/temp/db",
+        rabbitmq_storage_path="/temp/rabbitmq",
+        vcs_instances=[],
+        capacity_plan=plan_capacity(5000, 100 * 1024**3, scan_window_hours=8),
+        scanner_worker={"max_tasks_per_child": 20},
+    )
+    input_file_path = os.path.join(THIS_DIR, "fixtures", "test-values.yaml")
+    output_file_path = str(tmp_path / "custom-values.yaml")
+    assert create_helm_values_yaml(helm_values, input_file_path, output_file_path)
+
+    with open(output_file_path, "r", encoding="utf-8") as file_in:
+        values = yaml.safe_load(file_in)
+    # The capacity plan sizes a scanner for a single scan
+    assert values["resc-vcs-scanner-secrets"]["worker"] == {
+        "concurrency": 1,
+        "prefetchMultiplier": 1,
+        "maxTasksPerChild": 20,
+        "pool": "prefork",
+    }
+
+
+def test_create_helm_values_yaml_keeps_the_chart_worker_without_settings(tmp_path):
+    helm_values = HelmValue(
+        operating_system="linux",
+        db_password="dummy_pass",
+        db_storage_path="/temp/db",
+        rabbitmq_storage_path="/temp/rabbitmq",
+        vcs_instances=[],
+        capacity_plan=plan_capacity(5000, 100 * 1024**3, scan_window_hours=8),
+        rabbitmq_profile={"queue_depth": 50000},
+    )
+    input_file_path = os.path.join(THIS_DIR, "fixtures", "test-values.yaml")
+    output_file_path = str(tmp_path / "custom-values.yaml")
+    with patch("resc_helm_wizard.common.is_existing_release", return_value=False):
+        assert create_helm_values_yaml(helm_values, input_file_path, output_file_path)
+
+    with open(output_file_path, "r", encoding="utf-8") as file_in:
+        values = yaml.safe_load(file_in)
+    assert "worker" not in values["resc-vcs-scanner-secrets"]
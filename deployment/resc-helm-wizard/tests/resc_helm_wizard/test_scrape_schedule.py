@@ -0,0 +1,112 @@
+# Standard Library
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+# Third Party
+import pytest
+import yaml
+
+# First Party
+from resc_helm_wizard.common import create_helm_values_yaml
+from resc_helm_wizard.helm_value import HelmValue
+from resc_helm_wizard.scrape_schedule import (
+    format_schedule,
+    get_scrape_schedules,
+    plan_scrape_schedules,
+)
+from resc_helm_wizard.vcs_instance import VcsInstance
+
+THIS_DIR = Path(__file__).parent
+
+
+def create_vcs_instance(host: str, name: str) -> VcsInstance:
+    return VcsInstance(
+        provider_type="BITBUCKET",
+        scheme="https",
+        host=host,
+        port="443",
+        username="NA",
+        password="token",
+        organization="",
+        scope=[],
+        name=name,
+    )
+
+
+def test_format_schedule_wraps_around_the_week():
+    assert format_schedule((0, 6, 6), 90) == "30 7 * * 6"
+    assert format_schedule((0, 22, 6), 180) == "0 1 * * 0"
+    assert format_schedule((30, 23, None), 60) == "30 0 * * *"
+
+
+def test_plan_scrape_schedules_spreads_instances_over_window():
+    vcs_instances = [
+        create_vcs_instance("bb1.example.com", "bb_small"),
+        create_vcs_instance("bb2.example.com", "bb_large"),
+        create_vcs_instance("bb3.example.com", "bb_medium"),
+    ]
+    schedules = plan_scrape_schedules(
+        vcs_instances,
+        vcs_instance_totals={"bb_small": (10, 0, 10), "bb_large": (5000, 0, 5000)},
+    )
+    assert [schedule.schedule for schedule in schedules] == [
+        "0 14 * * 6",
+        "0 6 * * 6",
+        "0 10 * * 6",
+    ]
+    assert schedules[0].get_values() == {
+        "name": "bb-small",
+        "vcsInstance": "bb_small",
+        "schedule": "0 14 * * 6",
+    }
+    assert schedules[2].repositories is None
+
+
+def test_plan_scrape_schedules_separates_instances_of_a_host():
+    vcs_instances = [
+        create_vcs_instance("bb.example.com", f"bb_{index}") for index in range(2)
+    ] + [create_vcs_instance("github.com", f"gh_{index}") for index in range(4)]
+    totals = {"bb_0": (10, 0, 10), "bb_1": (10, 0, 10)}
+    totals.update({f"gh_{index}": (1000, 0, 1000) for index in range(4)})
+    schedules = plan_scrape_schedules(
+        vcs_instances, window_hours=1, slot_minutes=20, vcs_instance_totals=totals
+    )
+    bitbucket_schedules = {schedule.schedule for schedule in schedules[:2]}
+    assert len(bitbucket_schedules) == 2
+    assert {schedule.schedule for schedule in schedules} == {
+        "0 6 * * 6",
+        "20 6 * * 6",
+        "40 6 * * 6",
+    }
+
+
+@patch("logging.Logger.error")
+def test_get_scrape_schedules_sys_exit_when_schedule_is_invalid(mock_error_log):
+    with pytest.raises(SystemExit):
+        get_scrape_schedules(
+            [create_vcs_instance("bb.example.com", "bb")], {"schedule": "*/5 * * * *"}
+        )
+    assert "scrape_schedule.schedule" in mock_error_log.call_args.args[0]
+
+
+def test_create_helm_values_yaml_with_scrape_schedules(tmp_path):
+    vcs_instances = [create_vcs_instance("bb.example.com", "bb")]
+    helm_values = HelmValue(
+        operating_system="linux",
+        db_password="dummy_pass",
+        db_storage_path="/temp/db",
+        rabbitmq_storage_path="/temp/rabbitmq",
+        vcs_instances=vcs_instances,
+        scrape_schedules=get_scrape_schedules(vcs_instances, {"schedule": "0 2 * * *"}),
+    )
+    input_file_path = os.path.join(THIS_DIR, "fixtures", "test-values.yaml")
+    output_file_path = str(tmp_path / "custom-values.yaml")
+    assert create_helm_values_yaml(helm_values, input_file_path, output_file_path)
+
+    with open(output_file_path, "r", encoding="utf-8") as file_in:
+        values = yaml.safe_load(file_in)
+    assert values["resc-vcs-scraper-projects"]["schedules"] == [
+        {"name": "bb", "vcsInstance": "bb", "schedule": "0 2 * * *"}
+    ]
+    assert values["resc-vcs-instances"]["instanceConfigFiles"] is True
@@ -0,0 +1,94 @@
+# Standard Library
+import json
+
+# Third Party
+import pytest
+
+# First Party
+from resc_helm_wizard import timing
+from resc_helm_wizard.timing import (
+    get_phase_timings,
+    reset_phase_timings,
+    timed_phase,
+    write_prometheus_textfile,
+    write_timing_report,
+)
+
+
+@timed_phase("dummy_phase", failed_outcomes=("failed",))
+def dummy_phase(result="installed", kube_context=None):
+    if result is None:
+        raise ValueError("dummy error")
+    return result
+
+
+@timed_phase("dummy_parent_phase")
+def dummy_parent_phase():
+    return dummy_phase()
+
+
+def test_timed_phase_records_status():
+    reset_phase_timings()
+    dummy_phase()
+    dummy_phase(result="failed", kube_context="ctx1")
+    with pytest.raises(ValueError):
+        dummy_phase(result=None)
+    # Only the failed outcomes fail a phase, a false result does not
+    dummy_phase(result=False)
+
+    phase_timings = get_phase_timings()
+    assert [phase.status for phase in phase_timings] == [
+        "ok",
+        "failed",
+        "error",
+        "ok",
+    ]
+    assert phase_timings[1].kube_context == "ctx1"
+    assert all(phase.phase == "dummy_phase" for phase in phase_timings)
+
+
+def test_timed_phase_records_the_enclosing_phase():
+    reset_phase_timings()
+    dummy_parent_phase()
+    dummy_phase()
+
+    phase_timings = get_phase_timings()
+    assert [(phase.phase, phase.parent) for phase in phase_timings] == [
+        ("dummy_phase", "dummy_parent_phase"),
+        ("dummy_parent_phase", None),
+        ("dummy_phase", None),
+    ]
+
+
+def test_write_timing_report(tmp_path):
+    reset_phase_timings()
+    dummy_phase(kube_context="ctx1")
+    dummy_phase(kube_context="ctx1")
+    report_file = tmp_path / "timing.json"
+    write_timing_report(str(report_file))
+
+    report = json.loads(report_file.read_text(encoding="utf-8"))
+    assert len(report["phases"]) == 2
+    assert report["phases"][0]["kube_context"] == "ctx1"
+    assert set(report["totals"]) == {"dummy_phase"}
+
+
+def test_write_prometheus_textfile(tmp_path):
+    reset_phase_timings()
+    timing.record_phase(timing.PhaseTiming("helm_repo_update", None, 0.0, 1.5, "ok"))
+    timing.record_phase(
+        timing.PhaseTiming("helm_repo_update", None, 1.5, 0.5, "failed")
+    )
+    textfile = tmp_path / "resc_wizard.prom"
+    write_prometheus_textfile(str(textfile))
+
+    metrics = textfile.read_text(encoding="utf-8")
+    assert (
+        'resc_wizard_phase_duration_seconds{phase="helm_repo_update",kube_context=""} 2.000'
+        in metrics
+    )
+    assert (
+        'resc_wizard_phase_failures{phase="helm_repo_update",kube_context=""} 1'
+        in metrics
+    )
+    assert "resc_wizard_run_duration_seconds" in metrics
@@ -8,6 +8,8 @@ from resc_helm_wizard.validator import (
     github_token_validator,
     github_username_validator,
     password_validator,
+    replica_count_validator,
+    vcs_instance_name_validator,
     vcs_url_validator,
 )
 
@@ -94,3 +96,22 @@ def test_vcs_url_validator():
     assert validate == "Please provide a valid URL"
     validate = vcs_url_validator(url="ftp://github")
     assert validate == "Please provide a valid URL"
+
+
+def test_vcs_instance_name_validator():
+    assert vcs_instance_name_validator(name="bitbucket-eu_1") is True
+    validate = vcs_instance_name_validator(name="1bitbucket")
+    assert validate == (
+        "1bitbucket is not a valid VCS instance name. VCS instance name must start with a letter, "
+        "contain alphanumeric characters, hyphens or underscores and maximum 63 characters allowed."
+    )
+    assert vcs_instance_name_validator(name="bitbucket.example.com") is not True
+
+
+def test_replica_count_validator():
+    assert replica_count_validator(replicas=0) is True
+    assert replica_count_validator(replicas="12") is True
+    assert replica_count_validator(replicas="101") == (
+        "101 is not a valid number of replicas, provide a whole number from 0 to 100"
+    )
+    assert replica_count_validator(replicas="-1") is not True
@@ -0,0 +1,129 @@
+# Standard Library
+import json
+from unittest.mock import call, patch
+
+# Third Party
+import pytest
+
+# First Party
+from resc_helm_wizard.answers import get_vcs_instances_from_answers
+from resc_helm_wizard.vcs_inventory import (
+    get_vcs_instances_from_inventory,
+    read_vcs_inventory,
+)
+
+GITHUB_TOKEN = "ghp_" + "a1B2" * 9
+BITBUCKET_TOKEN = "a1B2c3D4e5" * 4
+
+
+def write_csv_inventory(tmp_path, rows: list) -> str:
+    inventory_file = tmp_path / "inventory.csv"
+    lines = ["type,url,organization,username,token,scope,name"] + rows
+    inventory_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(inventory_file)
+
+
+def test_read_vcs_inventory_csv(tmp_path):
+    inventory_file = write_csv_inventory(
+        tmp_path,
+        [
+            "# Bitbucket servers",
+            f"Bitbucket, https://bitbucket1.example.com:7999,, svc-resc, {BITBUCKET_TOKEN},,",
+        ],
+    )
+    assert read_vcs_inventory(inventory_file) == {
+        "inventory.csv line 3": {
+            "type": "Bitbucket",
+            "url": "https://bitbucket1.example.com:7999",
+            "organization": "",
+            "username": "svc-resc",
+            "token": BITBUCKET_TOKEN,
+            "scope": "",
+            "name": "",
+        }
+    }
+
+
+def test_get_vcs_instances_from_inventory_csv(tmp_path):
+    inventory_file = write_csv_inventory(
+        tmp_path,
+        [
+            f"Bitbucket,https://bitbucket{index}.example.com:7999,,svc-resc,{BITBUCKET_TOKEN},,"
+            for index in range(30)
+        ]
+        + [
+            f"GitHub,https://github.example.com,,svc-resc,{GITHUB_TOKEN},team-a;team-b,ghe",
+        ],
+    )
+    vcs_instances = get_vcs_instances_from_inventory(inventory_file)
+    assert len(vcs_instances) == 31
+    assert vcs_instances[0].provider_type == "BITBUCKET"
+    assert vcs_instances[0].host == "bitbucket0.example.com"
+    assert vcs_instances[0].port == "7999"
+    assert vcs_instances[30].name == "ghe"
+    assert vcs_instances[30].scope == ["team-a", "team-b"]
+
+
+@patch("logging.Logger.error")
+def test_get_vcs_instances_from_inventory_reports_all_errors(mock_error_log, tmp_path):
+    inventory_file = tmp_path / "inventory.json"
+    inventory_file.write_text(
+        json.dumps(
+            [
+                {"type": "GitLab", "url": "https://gitlab.example.com"},
+                {"type": "Bitbucket", "url": "bitbucket", "token": BITBUCKET_TOKEN},
+                {
+                    "type": "BITBUCKET",
+                    "url": "https://bb.example.com",
+                    "token": "short",
+                },
+                {"type": "Bitbucket", "token": BITBUCKET_TOKEN, "url": "https://a.com"},
+            ]
+        ),
+        encoding="utf-8",
+    )
+    with pytest.raises(SystemExit) as excinfo:
+        get_vcs_instances_from_inventory(str(inventory_file))
+    assert excinfo.value.code == 1
+    assert mock_error_log.call_args_list == [
+        call(
+            "Invalid value for inventory.json[0].type: Unsupported VCS instance type "
+            "'GitLab', supported types are GitHub, Azure Devops, Bitbucket"
+        ),
+        call("Invalid value for inventory.json[1].url: Please provide a valid URL"),
+        call(
+            "Invalid value for inventory.json[2].token: "
+            "Validation failed for provided Bitbucket token"
+        ),
+        call("Aborting the program! 3 invalid values were found in the VCS instances"),
+    ]
+
+
+@patch("logging.Logger.error")
+def test_get_vcs_instances_from_answers_sys_exit_when_names_collide(
+    mock_error_log, tmp_path
+):
+    inventory_file = tmp_path / "inventory.yaml"
+    inventory_file.write_text(
+        "vcs_instances:\n"
+        f"  - {{type: Bitbucket, url: 'https://bb.example.com', token: {BITBUCKET_TOKEN}, "
+        "name: bb_eu}\n",
+        encoding="utf-8",
+    )
+    answers = {
+        "vcs_inventory_file": str(inventory_file),
+        "vcs_instances": [
+            {
+                "type": "Bitbucket",
+                "url": "https://bb.example.com",
+                "token": BITBUCKET_TOKEN,
+                "name": "bb-eu",
+            }
+        ],
+    }
+    with pytest.raises(SystemExit):
+        get_vcs_instances_from_answers(answers)
+    mock_error_log.assert_called_with(
+        "Aborting the program! Invalid value for inventory.yaml[0].name: "
+        "bb_eu is already used by vcs_instances[0]"
+    )
@@ -0,0 +1,75 @@
+# Standard Library
+from unittest.mock import patch
+
+# Third Party
+import pytest
+
+# First Party
+from resc_helm_wizard.run_wizard import main
+from resc_helm_wizard.web_service import get_web_service_size, plan_web_service
+
+
+def test_plan_web_service():
+    web_service = plan_web_service(request_rate=10)
+    assert web_service.get_values() == {
+        "replicas": 2,
+        "workers": 1,
+        "resources": {
+            "requests": {"cpu": "500m", "memory": "512Mi"},
+            "limits": {"cpu": "1000m", "memory": "768Mi"},
+        },
+        "podDisruptionBudget": {"enabled": True, "minAvailable": 1},
+    }
+
+    web_service = plan_web_service(request_rate=400)
+    assert (web_service.replicas, web_service.workers) == (4, 4)
+    assert web_service.get_values()["podDisruptionBudget"]["minAvailable"] == 3
+
+    # The available CPU caps the number of worker processes
+    web_service = plan_web_service(request_rate=400, cpu_cores=3)
+    assert (web_service.replicas, web_service.workers) == (2, 3)
+
+
+@patch("logging.Logger.warning")
+def test_get_web_service_size_warns_when_cpu_is_too_small(mock_warning_log):
+    web_service = get_web_service_size({"request_rate": "100", "cpu_cores": 0.4})
+    assert (web_service.replicas, web_service.workers) == (1, 1)
+    assert web_service.get_values()["podDisruptionBudget"]["enabled"] is False
+    mock_warning_log.assert_called_once_with(
+        "The web service serves about 25 requests per second, "
+        "provide more CPU to serve 100 requests per second"
+    )
+
+
+@patch("logging.Logger.error")
+def test_get_web_service_size_sys_exit_when_settings_invalid(mock_error_log):
+    with pytest.raises(SystemExit) as excinfo:
+        get_web_service_size({"cpu_cores": 4})
+    mock_error_log.assert_called_once_with(
+        "Aborting the program! Invalid value for web_service: "
+        "must be a mapping of request_rate and optionally cpu_cores"
+    )
+    assert excinfo.value.code == 1
+
+
+@patch("resc_helm_wizard.answers.load_answers")
+@patch("resc_helm_wizard.answers.get_helm_values_from_answers")
+@patch("resc_helm_wizard.common.create_helm_values_yaml")
+@patch("resc_helm_wizard.kubernetes_utilities.get_allocatable_cpu")
+def test_main_sizes_web_service_with_cluster_cpu(
+    get_allocatable_cpu,
+    create_helm_values_yaml,
+    get_helm_values_from_answers,
+    load_answers,
+):
+    load_answers.return_value = {"run_deployment": False}
+    get_helm_values_from_answers.return_value.capacity_plan = None
+    get_allocatable_cpu.return_value = 8
+    main(["--answers-file", "answers.yaml", "--web-service-rate", "200"])
+    helm_values = create_helm_values_yaml.call_args.kwargs["helm_values"]
+    # A quarter of the 8 allocatable cores fits 4 workers
+    assert helm_values.web_service.cpu_cores == 2
+    assert (helm_values.web_service.replicas, helm_values.web_service.workers) == (
+        2,
+        2,
+    )